@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Absence streaks: runs of consecutive missed votes for every MEP.
+
+The ballot matrix columns are already in chronological order, so each MEP's
+row is their present/absent sequence. Run-length encoding it needs one
+np.diff over the absent mask. A run starts where the diff is +1 and ends
+where it is -1. np.nonzero returns both in row-major order, so the i-th start
+pairs with the i-th end, and every MEP is encoded at once. Rows are processed
+in blocks of BLOCK_MEPS to bound memory on multi-term matrices.
+
+Only ABSENT cells extend a streak. Any recorded ballot, or a vote outside the
+MEP's mandate (NO_DATA), ends it.
+
+    python absence_streaks.py                 # write data/absence_streaks.csv
+    python absence_streaks.py "Malika Sorel"  # one MEP's streaks
+    python absence_streaks.py --min-votes 20  # only streaks of 20+ votes
+"""
+
+import sys
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from ballot_matrix import ABSENT, BallotMatrix
+from instrumentation import profile_from_argv, span
+from sitting_days import SittingDays
+
+ABSENCE_STREAKS_FILE = 'data/absence_streaks.csv'
+BLOCK_MEPS = 256
+
+
+def absence_streaks(matrix: BallotMatrix, block_meps: int = BLOCK_MEPS) -> pd.DataFrame:
+    """One row per streak: MEP, first and last vote missed, votes and sitting days spanned."""
+    day_of_col = SittingDays.from_dates(matrix.votes['vote_date']).day_of_col()
+
+    rows, firsts, lasts = [], [], []
+    for block_start in range(0, matrix.shape[0], block_meps):
+        absent = (np.asarray(matrix.codes[block_start:block_start + block_meps]) == ABSENT).view(np.int8)
+        edges = np.diff(absent, axis=1, prepend=0, append=0)
+        block_rows, first = np.nonzero(edges == 1)
+        _, end = np.nonzero(edges == -1)
+        rows.append(block_rows + block_start)
+        firsts.append(first)
+        lasts.append(end - 1)
+
+    rows, first, last = np.concatenate(rows), np.concatenate(firsts), np.concatenate(lasts)
+    vote_ids = matrix.votes['vote_id'].to_numpy()
+    vote_dates = matrix.votes['vote_date'].to_numpy()
+    return pd.DataFrame({
+        'mep_id': matrix.meps['mep_id'].take(rows).reset_index(drop=True),
+        'name': matrix.meps['name'].take(rows).reset_index(drop=True),
+        'start_vote_id': vote_ids[first],
+        'start_date': vote_dates[first],
+        'end_vote_id': vote_ids[last],
+        'end_date': vote_dates[last],
+        'votes': last - first + 1,
+        'sitting_days': day_of_col[last] - day_of_col[first] + 1,
+    })
+
+
+def print_streaks(streaks: pd.DataFrame, limit: int = 20):
+    """One line per streak, first `limit` streaks only."""
+    for _, streak in streaks.head(limit).iterrows():
+        when = streak['start_date'] if streak['votes'] == 1 else f"{streak['start_date']} → {streak['end_date']}"
+        print(f"  {streak['votes']} votes over {streak['sitting_days']} sitting day(s): {when} "
+              f"(votes {streak['start_vote_id']}-{streak['end_vote_id']})")
+    if len(streaks) > limit:
+        print(f"  ... and {len(streaks) - limit} more")
+
+
+def main(argv: List[str]):
+    min_votes = 1
+    if '--min-votes' in argv:
+        at = argv.index('--min-votes')
+        min_votes = int(argv[at + 1])
+        argv = argv[:at] + argv[at + 2:]
+    mep = argv[0] if argv else None
+
+    matrix = BallotMatrix.load()
+    with span('absence_streaks') as stage:
+        streaks = absence_streaks(matrix)
+        stage.rows = len(streaks)
+    streaks = streaks[streaks['votes'] >= min_votes]
+
+    if mep is not None:
+        from mep_matcher import get_matcher
+
+        match = get_matcher().lookup(mep)
+        if match is None:
+            print(f"❌ No MEP matches {mep!r}")
+            return
+        mep_streaks = streaks[streaks['mep_id'] == match.mep_id]
+        print(f"{match.name} (MEP ID: {match.mep_id}): {len(mep_streaks)} absence streaks, "
+              f"{int(mep_streaks['votes'].sum())} votes missed")
+        print_streaks(mep_streaks)
+        return
+
+    with span('write_absence_streaks', rows=len(streaks)):
+        streaks.to_csv(ABSENCE_STREAKS_FILE, index=False)
+    print(f"✅ {len(streaks)} absence streaks across {streaks['mep_id'].nunique()} MEPs")
+    print("📊 Longest streaks:")
+    longest = streaks.sort_values(['votes', 'sitting_days'], ascending=False, kind='stable')
+    for _, streak in longest.head(10).iterrows():
+        print(f"  {streak['name']}: {streak['votes']} votes over {streak['sitting_days']} sitting day(s) "
+              f"from {streak['start_date']}")
+    print(f"💾 Saved {ABSENCE_STREAKS_FILE}")
+
+
+if __name__ == "__main__":
+    main(profile_from_argv(sys.argv[1:]))
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Sliding-window attendance engine over the ballot matrix.
+
+meps_attendance.csv holds votes_cast / votes_total_period / attendance_pct
+over the last WINDOW_DAYS days. Here they are recomputed from per-vote
+ballots. The engine keeps, for every MEP, prefix sums of ballots cast and
+ballots recorded at each sitting-day boundary. Any window is then the
+difference of two prefix vectors. Adding a sitting day appends one prefix
+vector, built from that day's ballots only, and expiring old days just moves
+the window start. Both cost O(MEPs). The state is saved next to the ballot
+matrix, so after a harvest only the new days (and the last saved day, which
+may have gained votes) are read.
+
+    python attendance_window.py [--as-of 2025-10-09] [--days 180] [--dry-run] [--rebuild]
+
+The rewrite keeps every other column and the CRLF line endings as they are.
+Rows whose mep_id is not in the ballot matrix, or is shared by two MEPs, are
+left untouched. --dry-run writes neither the CSV nor the window state.
+"""
+
+import os
+import sys
+from bisect import bisect_right
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ballot_matrix import BALLOTS_DIR, MATRIX_FILE, BallotMatrix, replace_atomic, write_csv_atomic
+from datasets import DATA_DIR, SCHEMAS
+from instrumentation import profile_from_argv, span
+from repair_pipeline import line_terminator, read_raw
+from sitting_days import SittingDays, day_counts
+
+WINDOW_DAYS = 180
+STATE_FILE = 'attendance_window.npz'
+
+
+def format_pct(votes_cast: np.ndarray, votes_total: np.ndarray) -> List[str]:
+    """attendance_pct as written in meps_attendance.csv: one decimal, no trailing .0, 0 if no votes."""
+    pct = np.divide(100 * votes_cast, votes_total, out=np.zeros(len(votes_cast)), where=votes_total > 0)
+    return [f"{value:g}" for value in np.round(pct, 1)]
+
+
+class AttendanceWindow:
+    """Per-MEP prefix sums of cast/recorded ballots at each sitting-day boundary."""
+
+    def __init__(self, mep_ids):
+        self.mep_ids = pd.array(mep_ids, dtype='Int64')
+        self.days: List[np.datetime64] = []
+        zero = np.zeros(len(self.mep_ids), dtype=np.int32)
+        # cast[i] / recorded[i]: totals over days[:i]
+        self.cast: List[np.ndarray] = [zero]
+        self.recorded: List[np.ndarray] = [zero]
+        self.start = 0
+
+    def add_day(self, day, cast: np.ndarray, recorded: np.ndarray):
+        """Append one sitting day's per-MEP counts; O(MEPs)."""
+        day = np.datetime64(pd.Timestamp(day).normalize(), 'ns')
+        if self.days and day <= self.days[-1]:
+            raise ValueError(f"Sitting day {day} is not after {self.days[-1]}")
+        self.days.append(day)
+        self.cast.append(self.cast[-1] + cast)
+        self.recorded.append(self.recorded[-1] + recorded)
+
+    def add_days(self, days: np.ndarray, cast: np.ndarray, recorded: np.ndarray):
+        for day, day_cast, day_recorded in zip(days, cast, recorded):
+            self.add_day(day, day_cast, day_recorded)
+
+    def expire(self, as_of=None, window_days: int = WINDOW_DAYS):
+        """Move the window start so it covers (as_of - window_days, as_of]."""
+        if as_of is None and not self.days:
+            return
+        as_of = pd.Timestamp(as_of) if as_of is not None else pd.Timestamp(self.days[-1])
+        cutoff = np.datetime64((as_of.normalize() - pd.Timedelta(days=window_days)), 'ns')
+        self.start = bisect_right(self.days, cutoff)
+
+    def window_end(self, as_of=None) -> int:
+        if as_of is None:
+            return len(self.days)
+        return bisect_right(self.days, np.datetime64(pd.Timestamp(as_of).normalize(), 'ns'))
+
+    def totals(self, as_of=None) -> pd.DataFrame:
+        """votes_cast, votes_total_period and attendance_pct per MEP over the window."""
+        end = self.window_end(as_of)
+        start = min(self.start, end)
+        cast = self.cast[end] - self.cast[start]
+        recorded = self.recorded[end] - self.recorded[start]
+        return pd.DataFrame({
+            'mep_id': self.mep_ids,
+            'votes_cast': cast,
+            'votes_total_period': recorded,
+            'attendance_pct': format_pct(cast, recorded),
+        })
+
+    def drop_last_day(self):
+        """Forget the last sitting day's counts so it can be re-read."""
+        self.days.pop()
+        self.cast.pop()
+        self.recorded.pop()
+        self.start = min(self.start, len(self.days))
+
+    def update(self, matrix: BallotMatrix) -> int:
+        """Re-read the last saved day and add every later one; returns days (re)counted."""
+        if self.days:
+            # A harvest can add votes to the day last seen, so its counts are redone
+            self.drop_last_day()
+        days = SittingDays.from_dates(matrix.votes['vote_date'])
+        new = days.days > self.days[-1] if self.days else np.ones(len(days), dtype=bool)
+        if not new.any():
+            return 0
+        first = int(np.argmax(new))
+        cast, absent = day_counts(matrix.codes, days.starts[first:], matrix.shape[1])
+        self.add_days(days.days[first:], cast.T, (cast + absent).T)
+        return len(days) - first
+
+    @classmethod
+    def from_matrix(cls, matrix: BallotMatrix) -> 'AttendanceWindow':
+        window = cls(matrix.meps['mep_id'].to_numpy())
+        window.update(matrix)
+        return window
+
+    def save(self, directory: str = BALLOTS_DIR):
+        def write(tmp):
+            with open(tmp, 'wb') as f:
+                np.savez(f, mep_ids=self.mep_ids.to_numpy(dtype='float64', na_value=np.nan),
+                         days=np.array(self.days, dtype='datetime64[ns]'),
+                         cast=np.stack(self.cast), recorded=np.stack(self.recorded))
+        replace_atomic(os.path.join(directory, STATE_FILE), write)
+
+    @classmethod
+    def load(cls, directory: str = BALLOTS_DIR) -> Optional['AttendanceWindow']:
+        path = os.path.join(directory, STATE_FILE)
+        if not os.path.exists(path):
+            return None
+        state = np.load(path)
+        window = cls(pd.array(state['mep_ids'], dtype='Float64').astype('Int64'))
+        window.days = list(state['days'])
+        window.cast = list(state['cast'])
+        window.recorded = list(state['recorded'])
+        return window
+
+
+def load_window(matrix: BallotMatrix, rebuild: bool = False) -> AttendanceWindow:
+    """Saved window state brought up to date with the matrix, or a fresh build.
+
+    Only days after the saved state are read, so use rebuild=True when ballots
+    of days already seen were corrected.
+    """
+    window = None if rebuild else AttendanceWindow.load()
+    mep_ids = pd.array(matrix.meps['mep_id'], dtype='Int64')
+    same_meps = window is not None and len(window.mep_ids) == len(mep_ids) and \
+        bool(pd.Series(window.mep_ids).equals(pd.Series(mep_ids)))
+    sitting_days = SittingDays.from_dates(matrix.votes['vote_date']).days
+    known_days = window is not None and bool(window.days) and \
+        np.isin(np.array(window.days, dtype='datetime64[ns]'), sitting_days).all()
+    if same_meps and known_days:
+        added = window.update(matrix)
+        print(f"🔧 Window state updated from {added} sitting days (including the last one saved)")
+    else:
+        window = AttendanceWindow.from_matrix(matrix)
+        print(f"🔧 Window state built from {len(window.days)} sitting days")
+    return window
+
+
+def regenerate_attendance(totals: pd.DataFrame, path: Optional[str] = None,
+                          dry_run: bool = False) -> int:
+    """Rewrite the window columns of meps_attendance.csv; returns rows changed."""
+    path = path or os.path.join(DATA_DIR, SCHEMAS['meps_attendance']['file'])
+    df = read_raw(path)
+    ids = df['mep_id']
+    window_ids = totals['mep_id'].astype('string').fillna('').reset_index(drop=True)
+    if len(window_ids) == len(df) and window_ids.eq(ids).all():
+        # meps_attendance.csv rows are in ballot matrix row order
+        rows = pd.Series(np.arange(len(df)))
+    else:
+        unique = window_ids[window_ids.ne('') & ~window_ids.duplicated(keep=False)]
+        rows = ids.map(pd.Series(unique.index, index=unique.to_numpy()))
+    # The matrix gives a shared id's ballots to one row only, so neither row is trusted
+    shared = ids.ne('') & ids.duplicated(keep=False)
+    matched = rows.notna() & ids.ne('') & ~shared
+    if shared.any():
+        print(f"⚠️  Left {int(shared.sum())} rows with a shared mep_id untouched: "
+              f"{', '.join(df.loc[shared, 'name'])}")
+
+    updated = df.copy()
+    source = totals.reset_index(drop=True).take(rows[matched].astype(int))
+    for column in ('votes_cast', 'votes_total_period', 'attendance_pct'):
+        updated.loc[matched, column] = source[column].astype(str).to_numpy()
+
+    changed = int(updated.ne(df).any(axis=1).sum())
+    if changed and not dry_run:
+        write_csv_atomic(updated, path, line_terminator(path))
+    return changed
+
+
+def main(argv: List[str]):
+    def option(name: str, default):
+        return argv[argv.index(name) + 1] if name in argv else default
+
+    if not os.path.exists(os.path.join(BALLOTS_DIR, MATRIX_FILE)):
+        print("❌ No ballot matrix yet; build it with: python ballot_matrix.py build <ballots.csv>")
+        return
+
+    with span('load_window'):
+        matrix = BallotMatrix.load()
+        window = load_window(matrix, rebuild='--rebuild' in argv)
+        if '--dry-run' not in argv:
+            window.save()
+
+    as_of = option('--as-of', None)
+    window.expire(as_of, int(option('--days', WINDOW_DAYS)))
+    with span('regenerate_attendance', rows=len(window.mep_ids)):
+        totals = window.totals(as_of)
+        changed = regenerate_attendance(totals, dry_run='--dry-run' in argv)
+
+    first = window.days[window.start] if window.start < len(window.days) else None
+    print(f"📊 Window: {window.window_end(as_of) - window.start} sitting days from {str(first)[:10]}")
+    print(f"{'🔍 Would update' if '--dry-run' in argv else '💾 Updated'} {changed} rows of meps_attendance.csv")
+
+
+if __name__ == "__main__":
+    main(profile_from_argv(sys.argv[1:]))
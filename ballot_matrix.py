@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Packed MEP x vote ballot matrix for the full roll-call record.
+
+Rows are MEPs (in data/meps.csv order), columns are votes from
+data/votes_catalog.csv in chronological order. Each cell holds one int8
+ballot code. The matrix is stored as a .npy file so it can be memory-mapped,
+next to two small CSV index files mapping mep_id -> row and vote_id -> column.
+
+Build it from any long-form ballot export with mep_id, vote_id and
+vote_position columns (the same columns as mep_vote_positions.csv):
+
+    python ballot_matrix.py build data/ballots.csv
+
+The export is read in chunks of BALLOT_CHUNKSIZE rows and scattered into the
+matrix chunk by chunk, so memory stays at the size of the int8 matrix plus
+one chunk even for multi-term exports with tens of millions of ballots.
+"""
+
+import json
+import os
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from datasets import load_meps, load_votes
+from instrumentation import profile_from_argv, span
+
+BALLOTS_DIR = 'data/ballots'
+MATRIX_FILE = 'ballots.npy'
+MEP_INDEX_FILE = 'mep_index.csv'
+VOTE_INDEX_FILE = 'vote_index.csv'
+BALLOT_CHUNKSIZE = 1_000_000
+META_FILE = 'meta.json'
+# Everything save() writes, in write order (meta last)
+MATRIX_FILES = (MATRIX_FILE, MEP_INDEX_FILE, VOTE_INDEX_FILE, META_FILE)
+
+# Ballot codes stored in the matrix
+NO_DATA = -1   # No ballot record for this MEP/vote
+ABSENT = 0     # Did not vote
+FOR = 1
+AGAINST = 2
+ABSTAIN = 3
+
+CODE_LABELS = {
+    NO_DATA: None,
+    ABSENT: 'Absent',
+    FOR: 'For',
+    AGAINST: 'Against',
+    ABSTAIN: 'Abstain',
+}
+
+# Position strings seen in EP / HowTheyVote exports
+POSITION_CODES = {
+    'for': FOR,
+    'against': AGAINST,
+    'abstain': ABSTAIN,
+    'abstention': ABSTAIN,
+    'not voting': ABSENT,
+    'did_not_vote': ABSENT,
+    'did not vote': ABSENT,
+    'absent': ABSENT,
+}
+
+
+def replace_atomic(path: str, write: Callable[[str], None]):
+    """Call write(tmp_path), then rename it over path.
+
+    Readers, including ones holding the old file memory-mapped, never see a
+    partial file. The temp file is removed if write fails.
+    """
+    tmp = f"{path}.tmp"
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def write_csv_atomic(df: pd.DataFrame, path: str, lineterminator: str = '\n'):
+    replace_atomic(path, lambda tmp: df.to_csv(tmp, index=False, lineterminator=lineterminator))
+
+
+def save_npy_atomic(array: np.ndarray, path: str):
+    def write(tmp):
+        # Through a handle: np.save would append .npy to the temp name
+        with open(tmp, 'wb') as f:
+            np.save(f, array)
+    replace_atomic(path, write)
+
+
+def row_lookup(mep_ids: Iterable) -> Dict[int, int]:
+    """mep_id -> row for a row-ordered id column.
+
+    meps.csv has a few duplicated ids; the first row wins. Missing ids are skipped.
+    """
+    rows: Dict[int, int] = {}
+    for row, mep_id in enumerate(mep_ids):
+        if pd.notna(mep_id):
+            rows.setdefault(int(mep_id), row)
+    return rows
+
+
+def encode_positions(positions: pd.Series) -> np.ndarray:
+    """Map vote_position strings to int8 ballot codes (unknown -> NO_DATA)."""
+    codes = positions.astype(str).str.strip().str.lower().map(POSITION_CODES)
+    return codes.fillna(NO_DATA).to_numpy(dtype=np.int8)
+
+
+def read_ballots(path: str, chunksize: int = BALLOT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """Long-form ballots from a CSV export, chunksize rows at a time."""
+    return pd.read_csv(path, usecols=['mep_id', 'vote_id', 'vote_position'], chunksize=chunksize)
+
+
+class BallotMatrix:
+    """MEP x vote ballot codes plus the id -> row/column indexes."""
+
+    def __init__(self, codes: np.ndarray, meps: pd.DataFrame, votes: pd.DataFrame):
+        # meps: row-ordered frame with mep_id and name
+        # votes: column-ordered frame with vote_id and vote_date
+        self.codes = codes
+        self.meps = meps.reset_index(drop=True)
+        self.votes = votes.reset_index(drop=True)
+        self.mep_rows = row_lookup(self.meps['mep_id'])
+        self.vote_cols: Dict[int, int] = {
+            int(vote_id): col for col, vote_id in enumerate(self.votes['vote_id'])
+        }
+
+    @property
+    def shape(self):
+        return self.codes.shape
+
+    @property
+    def vote_ids(self) -> np.ndarray:
+        return self.votes['vote_id'].to_numpy()
+
+    def row(self, mep_id: int) -> np.ndarray:
+        """All ballots cast by one MEP, in chronological vote order."""
+        return self.codes[self.mep_rows[int(mep_id)]]
+
+    def column(self, vote_id: int) -> np.ndarray:
+        """All MEP ballots for one vote, in meps.csv order."""
+        return self.codes[:, self.vote_cols[int(vote_id)]]
+
+    def missed_votes(self, mep_id: int) -> List[int]:
+        """Vote ids (chronological) the MEP was recorded as absent for."""
+        return self.vote_ids[self.row(mep_id) == ABSENT].tolist()
+
+    def position(self, mep_id: int, vote_id: int) -> Optional[str]:
+        """Ballot label for one MEP on one vote, or None when unknown."""
+        code = int(self.codes[self.mep_rows[int(mep_id)], self.vote_cols[int(vote_id)]])
+        return CODE_LABELS[code]
+
+    def save(self, directory: str = BALLOTS_DIR):
+        """Write the matrix and its index files to a directory.
+
+        Every file is replaced atomically: readers may hold the old matrix
+        memory-mapped, and overwriting it in place would truncate it under them.
+        """
+        os.makedirs(directory, exist_ok=True)
+        save_npy_atomic(np.ascontiguousarray(self.codes), os.path.join(directory, MATRIX_FILE))
+
+        meps = self.meps[['mep_id', 'name']].copy()
+        meps.insert(0, 'row', range(len(meps)))
+        meps['mep_id'] = meps['mep_id'].astype('Int64')
+        write_csv_atomic(meps, os.path.join(directory, MEP_INDEX_FILE))
+
+        votes = self.votes[['vote_id', 'vote_date']].copy()
+        votes.insert(0, 'col', range(len(votes)))
+        write_csv_atomic(votes, os.path.join(directory, VOTE_INDEX_FILE))
+
+        recorded = self.codes != NO_DATA
+        meta = {
+            'meps': int(self.shape[0]),
+            'votes': int(self.shape[1]),
+            'ballots_recorded': int(recorded.sum()),
+            'ballots_absent': int((self.codes == ABSENT).sum()),
+        }
+        def write_meta(tmp):
+            with open(tmp, 'w') as f:
+                json.dump(meta, f, indent=2)
+        replace_atomic(os.path.join(directory, META_FILE), write_meta)
+
+    @classmethod
+    def load(cls, directory: str = BALLOTS_DIR, mmap: bool = True) -> 'BallotMatrix':
+        """Load a saved matrix, memory-mapped read-only by default.
+
+        Raises ValueError if the matrix and its index files disagree in size.
+        """
+        codes = np.load(os.path.join(directory, MATRIX_FILE), mmap_mode='r' if mmap else None)
+        meps = pd.read_csv(os.path.join(directory, MEP_INDEX_FILE), dtype={'mep_id': 'Int64'})
+        votes = pd.read_csv(os.path.join(directory, VOTE_INDEX_FILE), parse_dates=['vote_date'])
+        if codes.shape != (len(meps), len(votes)):
+            # Caught between the writes of a concurrent save()
+            raise ValueError(f"Ballot matrix {codes.shape} does not match its indexes "
+                             f"({len(meps)} MEPs, {len(votes)} votes)")
+        return cls(codes, meps, votes)
+
+
+@span('build_matrix')
+def build_matrix(ballots: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+                 meps_df: pd.DataFrame,
+                 votes_df: pd.DataFrame) -> BallotMatrix:
+    """Scatter long-form ballots (a DataFrame or chunks of one) into a MEP x vote matrix in one pass."""
+    meps = meps_df[['mep_id', 'name']].copy()
+    meps['mep_id'] = meps['mep_id'].astype('Int64')
+
+    votes = votes_df[['vote_id', 'vote_date']].copy()
+    votes = votes.sort_values(['vote_date', 'vote_id'], kind='stable').reset_index(drop=True)
+
+    codes = np.full((len(meps), len(votes)), NO_DATA, dtype=np.int8)
+
+    shared = meps[meps['mep_id'].notna() & meps['mep_id'].duplicated(keep=False)]
+    for mep_id, names in shared.groupby('mep_id')['name']:
+        print(f"⚠️  mep_id {mep_id} is shared by {', '.join(names)}; "
+              f"all its ballots go to {names.iloc[0]}'s row")
+
+    row_of = pd.Series(np.arange(len(meps)), index=meps['mep_id'])
+    row_of = row_of[row_of.index.notna() & ~row_of.index.duplicated()]
+    col_of = pd.Series(np.arange(len(votes)), index=votes['vote_id'])
+
+    skipped = 0
+    for chunk in [ballots] if isinstance(ballots, pd.DataFrame) else ballots:
+        rows = chunk['mep_id'].map(row_of)
+        cols = chunk['vote_id'].map(col_of)
+        known = rows.notna() & cols.notna()
+        skipped += int((~known).sum())
+        codes[rows[known].astype(int).to_numpy(), cols[known].astype(int).to_numpy()] = \
+            encode_positions(chunk.loc[known, 'vote_position'])
+    if skipped:
+        print(f"⚠️  Skipped {skipped} ballots for MEPs or votes not in the catalog")
+
+    return BallotMatrix(codes, meps, votes)
+
+
+def main(argv: List[str]):
+    """Build or inspect the ballot matrix from the command line."""
+    if len(argv) >= 2 and argv[0] == 'build':
+        meps_df = load_meps()
+        votes_df = load_votes()
+
+        matrix = build_matrix(read_ballots(argv[1]), meps_df, votes_df)
+        with span('save_matrix'):
+            matrix.save()
+        print(f"✅ Ballot matrix {matrix.shape[0]} MEPs x {matrix.shape[1]} votes saved to {BALLOTS_DIR}/")
+    elif len(argv) >= 2 and argv[0] == 'missed':
+        matrix = BallotMatrix.load()
+        missed = matrix.missed_votes(int(argv[1]))
+        print(f"MEP {argv[1]} missed {len(missed)} votes:")
+        for vote_id in missed:
+            print(f"  Vote {vote_id}")
+    else:
+        print("Usage: python ballot_matrix.py build <ballots.csv>")
+        print("       python ballot_matrix.py missed <mep_id>")
+
+
+if __name__ == "__main__":
+    main(profile_from_argv(sys.argv[1:]))
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the data scripts on synthetic data of growing size.
+
+For each scale (see synthetic_data.SCALES) a dataset is generated once under
+.cache/benchmark/<scale>/data. Each repeat then runs the tasks in order on a
+fresh copy of it:
+
+    ballot_matrix    build the MEP x vote matrix from ballots.csv
+    missed_votes     batch missed-vote analysis over the matrix
+    vote_urls        URL fixer (repair_pipeline vote_urls stage)
+    countries        country fixer (repair_pipeline countries stage)
+    campaign_render  select and render every email of the attendance campaign
+
+Every task runs in its own Python process, so its peak RSS is its own.
+Imports happen before the clock starts. Results keep the fastest wall and
+CPU time over the repeats and the highest peak RSS. They are compared with
+benchmark_baseline.json, and --save records them as the new baseline. A task
+is flagged when it is both REGRESSION_RATIO times and REGRESSION_SECONDS
+slower than the baseline, so timer noise on tiny tasks is not reported.
+
+The multi_term scale (100k votes, 2000 MEPs, about 53M ballots and a 1 GB
+ballots.csv) takes a few minutes to generate the first time; pass
+--scales current,term for a quick run.
+
+    python benchmark.py [--scales current,term] [--tasks vote_urls,countries]
+                        [--repeat 3] [--seed 0] [--save]
+"""
+
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from instrumentation import peak_rss_mb
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCH_DIR = os.path.join(REPO_DIR, '.cache', 'benchmark')
+BASELINE_FILE = os.path.join(REPO_DIR, 'benchmark_baseline.json')
+DEFAULT_SCALES = ['current', 'term', 'multi_term']
+REGRESSION_RATIO = 1.25
+REGRESSION_SECONDS = 0.05
+
+
+def task_ballot_matrix() -> Callable[[], int]:
+    from ballot_matrix import build_matrix, read_ballots
+    from datasets import load_meps, load_votes
+
+    def run():
+        rows = 0
+
+        def chunks():
+            nonlocal rows
+            for chunk in read_ballots('data/ballots.csv'):
+                rows += len(chunk)
+                yield chunk
+        build_matrix(chunks(), load_meps(), load_votes()).save()
+        return rows
+    return run
+
+
+def task_missed_votes() -> Callable[[], int]:
+    from ballot_matrix import BallotMatrix
+    from missed_votes import run_missed_votes
+
+    def run():
+        missed, _ = run_missed_votes(BallotMatrix.load())
+        return len(missed)
+    return run
+
+
+def task_vote_urls() -> Callable[[], int]:
+    from repair_pipeline import run_pipeline
+
+    return lambda: run_pipeline(['vote_urls'], verbose=False)['votes_catalog']['vote_urls']
+
+
+def task_countries() -> Callable[[], int]:
+    from repair_pipeline import run_pipeline
+
+    return lambda: run_pipeline(['countries'], verbose=False)['meps']['countries']
+
+
+def task_campaign_render() -> Callable[[], int]:
+    from campaign_engine import load_campaign, load_mep_data
+    from mail_dispatcher import load_email_config
+
+    filters = load_email_config(os.path.join(REPO_DIR, 'email_config.json')).get('filters', {})
+
+    def run():
+        campaign = load_campaign('attendance')
+        return sum(1 for _ in campaign.emails(campaign.select(load_mep_data(), filters)))
+    return run
+
+
+# name -> setup returning the timed callable (which returns the rows it processed)
+TASKS: Dict[str, Callable[[], Callable[[], int]]] = {
+    'ballot_matrix': task_ballot_matrix,
+    'missed_votes': task_missed_votes,
+    'vote_urls': task_vote_urls,
+    'countries': task_countries,
+    'campaign_render': task_campaign_render,
+}
+REQUIRES = {'missed_votes': 'ballot_matrix'}
+
+
+def measure(name: str) -> Dict:
+    """Run one task in this process (cwd = a synthetic tree) and measure it."""
+    run = TASKS[name]()
+    wall, cpu = time.perf_counter(), time.process_time()
+    rows = run()
+    return {
+        'seconds': round(time.perf_counter() - wall, 4),
+        'cpu_seconds': round(time.process_time() - cpu, 4),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'rows': int(rows),
+    }
+
+
+def run_task(name: str, cwd: str) -> Dict:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(p for p in (REPO_DIR, env.get('PYTHONPATH')) if p)
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), '--task', name],
+                            cwd=cwd, env=env, capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(f"Task {name} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def prepare(scale: str, seed: int) -> str:
+    """Generated data for a scale, reused while its parameters are unchanged."""
+    from synthetic_data import SCALES, generate, generated_params
+
+    data_dir = os.path.join(BENCH_DIR, scale, 'data')
+    n_votes, n_meps = SCALES[scale]
+    params = generated_params(data_dir)
+    if not params or (params['seed'], params['votes'], params['meps']) != (seed, n_votes, n_meps):
+        print(f"🔧 Generating {scale} dataset ({n_votes} votes, {n_meps} MEPs)...")
+        shutil.rmtree(data_dir, ignore_errors=True)
+        generate(data_dir, n_votes, n_meps, seed)
+    return data_dir
+
+
+def fresh_tree(data_dir: str) -> str:
+    run_dir = os.path.join(os.path.dirname(data_dir), 'run')
+    shutil.rmtree(run_dir, ignore_errors=True)
+    shutil.copytree(data_dir, os.path.join(run_dir, 'data'))
+    os.symlink(os.path.join(REPO_DIR, 'campaigns'), os.path.join(run_dir, 'campaigns'))
+    return run_dir
+
+
+def benchmark_scale(scale: str, tasks: List[str], repeat: int, seed: int) -> Dict:
+    data_dir = prepare(scale, seed)
+    best: Dict[str, Dict] = {}
+    for _ in range(repeat):
+        run_dir = fresh_tree(data_dir)
+        done = set()
+        for name in tasks:
+            if REQUIRES.get(name) and REQUIRES[name] not in done:
+                run_task(REQUIRES[name], run_dir)
+            result = run_task(name, run_dir)
+            done.add(name)
+            if name not in best:
+                best[name] = result
+            else:
+                for key in ('seconds', 'cpu_seconds'):
+                    best[name][key] = min(best[name][key], result[key])
+                best[name]['peak_rss_mb'] = max(best[name]['peak_rss_mb'], result['peak_rss_mb'])
+
+    with open(os.path.join(data_dir, 'synthetic.json')) as f:
+        params = json.load(f)
+    return {'dataset': params, 'tasks': best}
+
+
+def environment() -> Dict:
+    import numpy as np
+    import pandas as pd
+
+    return {
+        'date': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def load_baseline() -> Dict:
+    if not os.path.exists(BASELINE_FILE):
+        return {}
+    with open(BASELINE_FILE) as f:
+        return json.load(f)
+
+
+def report(scale: str, results: Dict, baseline: Dict):
+    print(f"\n📊 {scale}: {results['dataset']['votes']} votes, {results['dataset']['meps']} MEPs, "
+          f"{results['dataset']['ballots']} ballots")
+    base_tasks = baseline.get('scales', {}).get(scale, {}).get('tasks', {})
+    for name, result in results['tasks'].items():
+        line = f"- {name:16} {result['seconds']:8.3f} s  {result['peak_rss_mb']:7.1f} MB peak"
+        base = base_tasks.get(name)
+        if base:
+            ratio = result['seconds'] / base['seconds'] if base['seconds'] else 1.0
+            slower = result['seconds'] - base['seconds']
+            flag = '⚠️ ' if ratio > REGRESSION_RATIO and slower > REGRESSION_SECONDS else ''
+            line += f"  ({flag}{ratio:.2f}x time, {result['peak_rss_mb'] - base['peak_rss_mb']:+.1f} MB vs baseline)"
+        print(line)
+
+
+def main(argv: List[str]):
+    def option(name: str, default: str) -> str:
+        return argv[argv.index(name) + 1] if name in argv else default
+
+    if '--task' in argv:
+        print(json.dumps(measure(option('--task', ''))))
+        return
+
+    scales = option('--scales', ','.join(DEFAULT_SCALES)).split(',')
+    tasks = option('--tasks', ','.join(TASKS)).split(',')
+    unknown = [t for t in tasks if t not in TASKS]
+    if unknown:
+        print(f"❌ Unknown tasks {unknown}; choose from {', '.join(TASKS)}")
+        return
+    repeat, seed = int(option('--repeat', '1')), int(option('--seed', '0'))
+
+    baseline = load_baseline()
+    results = {'environment': environment(), 'scales': {}}
+    for scale in scales:
+        results['scales'][scale] = benchmark_scale(scale, tasks, repeat, seed)
+        report(scale, results['scales'][scale], baseline)
+
+    if '--save' in argv:
+        baseline['environment'] = results['environment']
+        baseline.setdefault('scales', {}).update(results['scales'])
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump(baseline, f, indent=2)
+            f.write('\n')
+        print(f"\n💾 Saved baseline to {os.path.basename(BASELINE_FILE)}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Campaign engine shared by the email_meps*.py scripts.
+
+A campaign is data: campaigns/<name>.json holds its recipient filter, its
+attendance tiers with their special messages, the subject/body templates
+per language, and the wording of its logs and test-mode previews.
+campaigns/languages.json maps each country to its language.
+
+Each (campaign, language) template is compiled once into literal and field
+segments. All recipients are then rendered in one pass per language by
+concatenating whole columns, instead of calling str.format row by row.
+
+    python campaign_engine.py <campaign>    # e.g. attendance, positive, professional
+"""
+
+import json
+import logging
+import os
+import string
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from datasets import load_attendance
+from instrumentation import profile_from_argv, span
+from mail_dispatcher import Email, dispatch_emails, load_email_config
+from recipients import combine_filters, select_recipients
+
+CAMPAIGNS_DIR = 'campaigns'
+DEFAULT_LANGUAGE = 'en'
+
+logger = logging.getLogger(__name__)
+
+
+def load_language_mappings(path: str = os.path.join(CAMPAIGNS_DIR, 'languages.json')) -> Dict[str, str]:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class CompiledTemplate:
+    """A str.format template split once into (literal, field) segments."""
+
+    def __init__(self, text: str):
+        self.segments: List[Tuple[str, Optional[str]]] = []
+        for literal, field, spec, conversion in string.Formatter().parse(text):
+            if spec or conversion:
+                raise ValueError(f"Unsupported format spec in template field {{{field}}}")
+            self.segments.append((literal, field))
+        self.fields = {field for _, field in self.segments if field is not None}
+
+    def render(self, values: Dict[str, pd.Series], index: pd.Index) -> pd.Series:
+        """Render every row at once from string columns keyed by field name."""
+        rendered = pd.Series('', index=index, dtype=object)
+        for literal, field in self.segments:
+            if literal:
+                rendered = rendered + literal
+            if field is not None:
+                rendered = rendered + values[field]
+        return rendered
+
+
+class Campaign:
+    """One email campaign loaded from campaigns/<name>.json."""
+
+    def __init__(self, spec: Dict, language_mappings: Dict[str, str]):
+        self.name = spec['name']
+        self.spec = spec
+        self.filters = spec.get('filters', {})
+        self.tiers = spec['tiers']
+        self.log = spec['log']
+        self.language_mappings = language_mappings
+        self.exclusions: Dict[str, int] = {}
+        self.templates = {
+            language: (CompiledTemplate(template['subject']), CompiledTemplate(template['body']))
+            for language, template in spec['templates'].items()
+        }
+
+    def select(self, df: pd.DataFrame, filters: Optional[Dict] = None) -> pd.DataFrame:
+        """Recipients under the config filters, tightened (never loosened) by the campaign's own."""
+        recipients, self.exclusions = select_recipients(df, combine_filters(filters or {}, self.filters))
+        return recipients
+
+    def languages(self, df: pd.DataFrame) -> pd.Series:
+        return df['country'].astype(object).map(self.language_mappings).fillna(DEFAULT_LANGUAGE)
+
+    def special_messages(self, attendance: pd.Series, languages: pd.Series) -> pd.Series:
+        """Tier message for each row: the first tier whose minimum it reaches."""
+        conditions = [
+            (attendance >= tier['min_attendance']).to_numpy() if tier['min_attendance'] is not None
+            else np.ones(len(attendance), dtype=bool)
+            for tier in self.tiers
+        ]
+        tier_index = pd.Series(np.select(conditions, np.arange(len(self.tiers)), default=len(self.tiers) - 1),
+                               index=attendance.index)
+
+        messages = pd.Series('', index=attendance.index, dtype=object)
+        for i, tier in enumerate(self.tiers):
+            in_tier = tier_index == i
+            fallback = tier['messages'][DEFAULT_LANGUAGE]
+            messages[in_tier] = languages[in_tier].map(tier['messages']).fillna(fallback)
+        return messages
+
+    @span('render_templates')
+    def render(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Render subject and body for every row; returns language, subject, body."""
+        languages = self.languages(df)
+        values = {
+            'name': df['name'].astype(object).astype(str),
+            'total_votes': df['votes_total_period'].astype(str),
+            'votes_cast': df['votes_cast'].astype(str),
+            'attendance_pct': df['attendance_pct'].astype(str),
+            'special_message': self.special_messages(df['attendance_pct'], languages),
+        }
+
+        template_language = languages.where(languages.isin(list(self.templates)), DEFAULT_LANGUAGE)
+        subjects = pd.Series('', index=df.index, dtype=object)
+        bodies = pd.Series('', index=df.index, dtype=object)
+        for language, rows in template_language.groupby(template_language).groups.items():
+            subject, body = self.templates[language]
+            group = {field: column.loc[rows] for field, column in values.items()}
+            subjects.loc[rows] = subject.render(group, rows)
+            bodies.loc[rows] = body.render(group, rows)
+
+        return pd.DataFrame({'language': languages, 'subject': subjects, 'body': bodies})
+
+    def emails(self, df: pd.DataFrame) -> Iterator[Email]:
+        """Render selected recipients and yield one Email per row, in row order."""
+        rendered = self.render(df)
+        columns = zip(df['email'], rendered['subject'], rendered['body'], rendered['language'], df['mep_id'],
+                      df['name'], df['attendance_pct'], df['votes_total_period'], df['votes_cast'])
+        for to_email, subject, body, language, mep_id, name, attendance_pct, total, cast in columns:
+            yield Email(to_email, subject, body, {
+                'mep_id': int(mep_id),
+                'name': name,
+                'attendance_pct': attendance_pct,
+                'votes_total_period': total,
+                'votes_cast': cast,
+                'language': language,
+            })
+
+    def preview(self, email: Email):
+        """Print email content (test mode)."""
+        preview = self.spec['preview']
+        rule = '=' * preview['width']
+        print(f"\n{rule}")
+        if preview.get('banner'):
+            print(preview['banner'])
+            print(rule)
+        print(f"TO: {email.to_email}")
+        print(f"SUBJECT: {email.subject}")
+        print(f"LANGUAGE: {email.context['language']}")
+        print(f"ATTENDANCE: {email.context['attendance_pct']}%{preview.get('attendance_suffix', '')}")
+        print(rule)
+        print(email.body)
+        print(f"{rule}\n")
+
+
+def load_campaign(name: str) -> Campaign:
+    with open(os.path.join(CAMPAIGNS_DIR, f'{name}.json'), encoding='utf-8') as f:
+        spec = json.load(f)
+    return Campaign(spec, load_language_mappings())
+
+
+def load_mep_data() -> pd.DataFrame:
+    """Load MEP attendance data with (placeholder) email addresses."""
+    try:
+        df = load_attendance()
+        # Create placeholder emails (you'll need real email addresses)
+        df['email'] = 'mep-' + df['mep_id'].astype(str) + '@europarl.europa.eu'
+        df.loc[df['mep_id'].isna(), 'email'] = None
+        return df
+    except Exception as e:
+        logger.error(f"Failed to load MEP data: {str(e)}")
+        return pd.DataFrame()
+
+
+@span('campaign')
+def run_campaign(name: str, config: Optional[Dict] = None):
+    """Select, render and dispatch one campaign."""
+    campaign = load_campaign(name)
+    log = campaign.log
+    logger.info(log['start'])
+
+    # SMTP settings, rate/batch limits, test_mode and filters come from email_config.json
+    config = config or load_email_config()
+
+    meps_df = load_mep_data()
+    if meps_df.empty:
+        logger.error("No MEP data loaded. Exiting.")
+        return
+    recipients = campaign.select(meps_df, config.get('filters', {}))
+    for filter_name, count in campaign.exclusions.items():
+        if count:
+            logger.info(f"⏭️  Excluded by {filter_name}: {count}")
+    logger.info(log['loaded'].format(count=len(recipients)))
+
+    test_mode = config['email_settings'].get('test_mode', True)
+    if test_mode and campaign.spec['preview'].get('limit') is not None:
+        # A test run previews a sample, not the whole campaign
+        recipients = recipients.head(campaign.spec['preview']['limit'])
+    with span('dispatch', rows=len(recipients)):
+        stats = dispatch_emails(campaign.emails(recipients), config,
+                                preview=campaign.preview, campaign=campaign.name)
+
+    logger.info(log['summary'])
+    if test_mode:
+        logger.info(f"✅ {log['would_send']}: {stats['previewed']}")
+    else:
+        logger.info(f"✅ {log['sent']}: {stats['sent']}")
+        if stats['skipped']:
+            logger.info(f"⏭️  Already sent in an earlier run: {stats['skipped']}")
+    logger.info(f"❌ Emails failed: {stats['failed']}")
+    if log.get('total'):
+        logger.info(log['total'].format(count=len(recipients)))
+    return stats
+
+
+def main(argv: List[str]):
+    if not argv:
+        names = sorted(f[:-5] for f in os.listdir(CAMPAIGNS_DIR) if f.endswith('.json') and f != 'languages.json')
+        print(f"Usage: python campaign_engine.py <campaign>   ({', '.join(names)})")
+        return
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    run_campaign(argv[0])
+
+
+if __name__ == "__main__":
+    main(profile_from_argv(sys.argv[1:]))
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Typed loaders for the data/*.csv datasets with a binary columnar cache.
+
+Each dataset has an explicit schema: integer ids, parsed vote dates and
+categorical country/party/result/position columns. The first load parses the
+CSV and writes a Parquet file next to it (a pickle if pyarrow is not
+installed), plus a small .cache.json recording the CSV's mtime, size and
+SHA-256. Later loads read the binary file directly. If the mtime or size
+changes, the hash is checked before the cache is rebuilt, so a touched but
+unchanged CSV does not force a re-parse.
+
+    python datasets.py    # warm the cache for every dataset
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional
+
+import pandas as pd
+
+from instrumentation import span
+
+try:
+    import pyarrow  # noqa: F401
+    CACHE_FORMAT = 'parquet'
+except ImportError:
+    CACHE_FORMAT = 'pkl'
+
+DATA_DIR = 'data'
+
+MEP_COLUMNS = {
+    'name': 'str',
+    'country': 'category',
+    'party': 'category',
+    'national_party': 'category',
+    'mep_id': 'Int64',
+}
+
+SCHEMAS: Dict[str, dict] = {
+    'meps': {
+        'file': 'meps.csv',
+        'dtypes': {**MEP_COLUMNS, 'profile_url': 'str'},
+    },
+    'meps_attendance': {
+        'file': 'meps_attendance.csv',
+        'dtypes': {
+            **MEP_COLUMNS,
+            'attendance_pct': 'float64',
+            'votes_cast': 'int64',
+            'votes_total_period': 'int64',
+            'special_role': 'str',
+            'sick_leave': 'bool',
+            'partial_term': 'bool',
+        },
+    },
+    'votes_catalog': {
+        'file': 'votes_catalog.csv',
+        'dtypes': {
+            'vote_id': 'int64',
+            'title': 'str',
+            'result': 'category',
+            'olp_stage': 'category',
+            'total_for': 'int64',
+            'total_against': 'int64',
+            'total_abstain': 'int64',
+            'source_url': 'category',
+        },
+        'dates': ['vote_date'],
+    },
+    'mep_notable_votes': {
+        'file': 'mep_notable_votes.csv',
+        'dtypes': {
+            'mep_id': 'Int64',
+            'vote_id': 'int64',
+            'title': 'category',
+            'result': 'category',
+            'vote_position': 'category',
+            'total_for': 'int64',
+            'total_against': 'int64',
+            'total_abstain': 'int64',
+            'source_url': 'category',
+        },
+        'dates': ['vote_date'],
+    },
+    'mandates': {
+        'file': 'mandates.csv',
+        'dtypes': {'mep_id': 'Int64'},
+        'dates': ['mandate_start', 'mandate_end'],
+    },
+    'mep_vote_positions': {
+        'file': 'mep_vote_positions.csv',
+        'dtypes': {
+            'mep_id': 'Int64',
+            'vote_id': 'int64',
+            'vote_position': 'category',
+        },
+    },
+}
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: str, write):
+    # ballot_matrix imports this module, so its helper is imported on use
+    from ballot_matrix import replace_atomic
+    replace_atomic(path, write)
+
+
+def _write_meta(meta_path: str, meta: Dict):
+    def write(tmp):
+        with open(tmp, 'w') as f:
+            json.dump(meta, f, indent=2)
+    _write_atomic(meta_path, write)
+
+
+def _cache_paths(csv_path: str):
+    base = os.path.splitext(csv_path)[0]
+    return f"{base}.{CACHE_FORMAT}", f"{base}.cache.json"
+
+
+def parse_csv(name: str, path: Optional[str] = None) -> pd.DataFrame:
+    """Parse a dataset CSV with its explicit schema (no cache)."""
+    schema = SCHEMAS[name]
+    path = path or os.path.join(DATA_DIR, schema['file'])
+    dtypes = {
+        column: ('object' if dtype in ('str', 'bool') else dtype)
+        for column, dtype in schema['dtypes'].items()
+    }
+    with span('read_csv') as stage:
+        df = pd.read_csv(path, dtype=dtypes)
+        stage.rows = len(df)
+    with span('parse_dates'):
+        for column in schema.get('dates', []):
+            df[column] = pd.to_datetime(df[column])
+    for column, dtype in schema['dtypes'].items():
+        if dtype == 'bool' and column in df:
+            df[column] = df[column].astype(str).str.lower().eq('true')
+    return df
+
+
+def load_dataset(name: str, path: Optional[str] = None) -> pd.DataFrame:
+    """Load a dataset from its binary cache, rebuilding it if the CSV changed."""
+    with span(f'load:{name}') as stage:
+        df = _load_dataset(name, path)
+        stage.rows = len(df)
+    return df
+
+
+def _load_dataset(name: str, path: Optional[str] = None) -> pd.DataFrame:
+    path = path or os.path.join(DATA_DIR, SCHEMAS[name]['file'])
+    cache_path, meta_path = _cache_paths(path)
+    stat = os.stat(path)
+
+    meta = None
+    if os.path.exists(cache_path) and os.path.exists(meta_path):
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except ValueError:
+            meta = None
+
+    if meta is not None:
+        unchanged = meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size
+        if not unchanged and meta['size'] == stat.st_size and meta['sha256'] == _file_hash(path):
+            # Touched but identical: remember the new mtime and keep the cache
+            meta['mtime_ns'] = stat.st_mtime_ns
+            _write_meta(meta_path, meta)
+            unchanged = True
+        if unchanged:
+            with span('read_cache'):
+                if CACHE_FORMAT == 'parquet':
+                    return pd.read_parquet(cache_path)
+                return pd.read_pickle(cache_path)
+
+    df = parse_csv(name, path)
+    if CACHE_FORMAT == 'parquet':
+        _write_atomic(cache_path, lambda tmp: df.to_parquet(tmp, index=False))
+    else:
+        _write_atomic(cache_path, lambda tmp: df.to_pickle(tmp))
+    _write_meta(meta_path, {
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': _file_hash(path),
+        'format': CACHE_FORMAT,
+    })
+    return df
+
+
+def load_meps() -> pd.DataFrame:
+    return load_dataset('meps')
+
+
+def load_attendance() -> pd.DataFrame:
+    return load_dataset('meps_attendance')
+
+
+def load_votes() -> pd.DataFrame:
+    return load_dataset('votes_catalog')
+
+
+def load_notable_votes() -> pd.DataFrame:
+    """The wide notable-votes view, joined from the fact table and the catalog."""
+    from notable_votes_store import notable_votes_wide
+
+    with span('join_notable_votes'):
+        return notable_votes_wide(load_vote_positions(), load_votes())
+
+
+def load_vote_positions() -> pd.DataFrame:
+    return load_dataset('mep_vote_positions')
+
+
+def main():
+    """Warm the binary cache for every dataset and report load times."""
+    for name in SCHEMAS:
+        if not os.path.exists(os.path.join(DATA_DIR, SCHEMAS[name]['file'])):
+            print(f"⏭️  {name}: no {SCHEMAS[name]['file']}")
+            continue
+        start = time.perf_counter()
+        df = load_dataset(name)
+        elapsed = (time.perf_counter() - start) * 1000
+        memory = df.memory_usage(deep=True).sum() / 1024
+        print(f"✅ {name}: {len(df)} rows, {memory:.0f} KiB in memory, loaded in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
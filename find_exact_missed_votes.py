@@ -3,17 +3,24 @@
 Find the exact 2 votes that Malika Sorel missed
 """
 
-import pandas as pd
-import requests
-import time
-import re
+import sys
+from datasets import load_attendance, load_votes
+from mandates import eligible_votes
+from mep_matcher import find_mep
+from vote_fetcher import find_missed_vote_pages
+from instrumentation import profile_from_argv, span
 
+# Fetch settings for the EP / HowTheyVote vote pages
+CONCURRENCY = 8
+REQUESTS_PER_SECOND = 4.0
+
+@span('find_exact_missed_votes')
 def find_exact_missed_votes():
     """Find the exact votes that Malika Sorel missed by checking recent votes"""
     
     # Load MEP data
-    meps_df = pd.read_csv('data/meps_attendance.csv')
-    malika = meps_df[meps_df['name'] == 'Malika Sorel'].iloc[0]
+    meps_df = load_attendance()
+    malika = find_mep(meps_df, 'Malika Sorel')
     
     print(f"Malika Sorel (MEP ID: {malika['mep_id']})")
     print(f"Total votes: {malika['votes_total_period']}")
@@ -23,42 +30,24 @@ def find_exact_missed_votes():
     print()
     
     # Load votes catalog
-    votes_df = pd.read_csv('data/votes_catalog.csv')
+    votes_df = load_votes()
     
-    # Check recent votes to see which ones she missed
-    print("Checking recent votes to find the 2 she missed...")
-    print("(This will take a few minutes as we check each vote)")
+    # Check votes in reverse chronological order (most recent first)
+    expected_missed = int(malika['votes_total_period'] - malika['votes_cast'])
+    print(f"Checking recent votes to find the {expected_missed} she missed...")
+    print(f"({CONCURRENCY} concurrent requests, at most {REQUESTS_PER_SECOND} per second)")
     print()
     
-    missed_votes = []
-    checked = 0
-    
-    # Check votes in reverse chronological order (most recent first)
-    for _, vote in votes_df.sort_values('vote_date', ascending=False).iterrows():
-        checked += 1
-        
-        if checked % 50 == 0:
-            print(f"Checked {checked} votes, found {len(missed_votes)} missed votes so far...")
-        
-        if len(missed_votes) >= 2:
-            break
-            
-        try:
-            # Fetch the vote details
-            response = requests.get(vote['source_url'], timeout=10)
-            if response.status_code == 200:
-                # Look for Malika Sorel in the response
-                if 'Malika Sorel' not in response.text:
-                    missed_votes.append(vote)
-                    print(f"❌ MISSED: Vote {vote['vote_id']} - {vote['title']} ({vote['vote_date']})")
-                    print(f"   URL: {vote['source_url']}")
-                    print()
-            else:
-                print(f"⚠️  Could not fetch vote {vote['vote_id']} (status: {response.status_code})")
-        except Exception as e:
-            print(f"⚠️  Error fetching vote {vote['vote_id']}: {e}")
-        
-        time.sleep(0.5)  # Rate limiting
+    # Only votes held during her mandate can be missed
+    recent_first = eligible_votes(votes_df, malika['mep_id']).sort_values('vote_date', ascending=False)
+    missed_ids, checked = find_missed_vote_pages(
+        recent_first['vote_id'],
+        malika['mep_id'],
+        expected_missed=expected_missed,
+        concurrency=CONCURRENCY,
+        requests_per_second=REQUESTS_PER_SECOND,
+    )
+    missed_votes = [vote for _, vote in votes_df.set_index('vote_id', drop=False).loc[missed_ids].iterrows()]
     
     print(f"\nSummary:")
     print(f"Checked {checked} votes")
@@ -71,4 +60,5 @@ def find_exact_missed_votes():
         print()
 
 if __name__ == "__main__":
+    profile_from_argv(sys.argv[1:])
     find_exact_missed_votes()
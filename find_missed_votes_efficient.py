@@ -3,14 +3,20 @@
 Find the 2 votes that Malika Sorel missed - Efficient approach
 """
 
-import pandas as pd
+import sys
+from datasets import load_attendance, load_notable_votes, load_votes
+from mandates import eligible_votes
+from mep_matcher import find_mep
+from missed_votes import mep_missed_votes
+from instrumentation import profile_from_argv, span
 
+@span('find_missed_votes_efficient')
 def find_missed_votes_efficient():
     """Find the votes that Malika Sorel missed using available data"""
     
     # Load MEP data
-    meps_df = pd.read_csv('data/meps_attendance.csv')
-    malika = meps_df[meps_df['name'] == 'Malika Sorel'].iloc[0]
+    meps_df = load_attendance()
+    malika = find_mep(meps_df, 'Malika Sorel')
     
     print(f"Malika Sorel (MEP ID: {malika['mep_id']})")
     print(f"Total votes: {malika['votes_total_period']}")
@@ -20,11 +26,11 @@ def find_missed_votes_efficient():
     print()
     
     # Load votes catalog
-    votes_df = pd.read_csv('data/votes_catalog.csv')
+    votes_df = load_votes()
     print(f"Total votes in catalog: {len(votes_df)}")
     
     # Load Malika's notable votes
-    notable_df = pd.read_csv('data/mep_notable_votes.csv')
+    notable_df = load_notable_votes()
     malika_votes = notable_df[notable_df['mep_id'] == malika['mep_id']]
     print(f"Malika's notable votes: {len(malika_votes)}")
     
@@ -47,16 +53,17 @@ def find_missed_votes_efficient():
     # Let's check if there are any votes from early in the period that she might have missed
     print(f"\nChecking for potential missed votes...")
     
-    # Get date range
-    all_dates = pd.to_datetime(votes_df['vote_date'])
-    malika_dates = pd.to_datetime(malika_votes['vote_date'])
+    # Get date range, limited to the votes held during her mandate
+    mandate_votes = eligible_votes(votes_df, malika['mep_id'])
+    all_dates = mandate_votes['vote_date']
+    malika_dates = malika_votes['vote_date']
     
     print(f"Vote period: {all_dates.min()} to {all_dates.max()}")
     print(f"Malika's notable votes: {malika_dates.min()} to {malika_dates.max()}")
     
     # Check if there are votes at the very beginning or end that she might have missed
-    early_votes = votes_df[pd.to_datetime(votes_df['vote_date']) <= malika_dates.min()]
-    late_votes = votes_df[pd.to_datetime(votes_df['vote_date']) >= malika_dates.max()]
+    early_votes = mandate_votes[all_dates <= malika_dates.min()]
+    late_votes = mandate_votes[all_dates >= malika_dates.max()]
     
     print(f"\nVotes before Malika's first notable vote: {len(early_votes)}")
     if len(early_votes) > 0:
@@ -69,6 +76,13 @@ def find_missed_votes_efficient():
         print("Late votes (potential misses):")
         for _, vote in late_votes.head(5).iterrows():
             print(f"  {vote['vote_date']}: Vote {vote['vote_id']} - {vote['title'][:60]}...")
+    
+    # The missed votes themselves, from the ballot matrix when one is built
+    missed = mep_missed_votes(votes_df, malika['mep_id'], notable_df)
+    print(f"\nVotes missed: {len(missed)}")
+    for _, vote in missed.head(10).iterrows():
+        print(f"  {vote['vote_date']}: Vote {vote['vote_id']} - {vote['title'][:60]}...")
 
 if __name__ == "__main__":
+    profile_from_argv(sys.argv[1:])
     find_missed_votes_efficient()
@@ -1,72 +1,63 @@
 #!/usr/bin/env python3
 """
-Find the specific votes that Malika Sorel missed - Simple version
+Find the specific votes an MEP missed - Simple version
 """
 
-import pandas as pd
+import sys
+from datasets import load_attendance, load_notable_votes, load_votes
+from mep_matcher import find_mep
+from missed_votes import mep_missed_votes
+from instrumentation import profile_from_argv, span
 
-def find_missed_votes():
-    """Find the votes that Malika Sorel missed"""
+@span('find_missed_votes')
+def find_missed_votes(name_or_id='Malika Sorel'):
+    """Find the votes an MEP (name or id) missed"""
     
     # Load MEP data
-    meps_df = pd.read_csv('data/meps_attendance.csv')
-    malika = meps_df[meps_df['name'] == 'Malika Sorel'].iloc[0]
-    
-    print(f"Malika Sorel (MEP ID: {malika['mep_id']})")
-    print(f"Total votes: {malika['votes_total_period']}")
-    print(f"Votes cast: {malika['votes_cast']}")
-    print(f"Attendance: {malika['attendance_pct']}%")
-    print(f"Missed votes: {malika['votes_total_period'] - malika['votes_cast']}")
+    meps_df = load_attendance()
+    mep = find_mep(meps_df, name_or_id)
+    name = mep['name']
+    
+    print(f"{name} (MEP ID: {mep['mep_id']})")
+    print(f"Total votes: {mep['votes_total_period']}")
+    print(f"Votes cast: {mep['votes_cast']}")
+    print(f"Attendance: {mep['attendance_pct']}%")
+    print(f"Missed votes: {mep['votes_total_period'] - mep['votes_cast']}")
     print()
     
     # Load votes catalog to get all votes
-    votes_df = pd.read_csv('data/votes_catalog.csv')
+    votes_df = load_votes()
     print(f"Total votes in catalog: {len(votes_df)}")
     
-    # Get Malika's notable votes (votes she participated in)
-    notable_df = pd.read_csv('data/mep_notable_votes.csv')
-    malika_votes = notable_df[notable_df['mep_id'] == malika['mep_id']]
-    
-    print(f"Malika's notable votes: {len(malika_votes)}")
+    # Get the MEP's notable votes (votes they participated in)
+    notable_df = load_notable_votes()
+    mep_votes = notable_df[notable_df['mep_id'] == mep['mep_id']]
     
-    # Find votes she missed by comparing all votes with her notable votes
-    all_vote_ids = set(votes_df['vote_id'].astype(str))
-    malika_vote_ids = set(malika_votes['vote_id'].astype(str))
+    print(f"{name}'s notable votes: {len(mep_votes)}")
     
-    missed_vote_ids = all_vote_ids - malika_vote_ids
+    # Read off the ballot matrix, or estimated from the notable votes without one
+    mep_missed = mep_missed_votes(votes_df, mep['mep_id'], notable_df)
     
-    print(f"Votes she missed: {len(missed_vote_ids)}")
+    print(f"Votes missed: {len(mep_missed)}")
     
-    if len(missed_vote_ids) <= 20:  # If reasonable number, show details
-        print("\nMissed votes:")
-        for vote_id in sorted(missed_vote_ids):
-            vote_info = votes_df[votes_df['vote_id'].astype(str) == vote_id]
-            if not vote_info.empty:
-                vote = vote_info.iloc[0]
-                print(f"  Vote {vote_id}: {vote['title']} ({vote['vote_date']})")
-                print(f"    Result: {vote['result']}")
-                print(f"    URL: {vote['source_url']}")
-                print()
+    if len(mep_missed) > 20:
+        print(f"\nToo many missed votes to display ({len(mep_missed)}). Showing first 10:")
     else:
-        print(f"\nToo many missed votes to display ({len(missed_vote_ids)}). Showing first 10:")
-        for i, vote_id in enumerate(sorted(missed_vote_ids)):
-            if i >= 10:
-                break
-            vote_info = votes_df[votes_df['vote_id'].astype(str) == vote_id]
-            if not vote_info.empty:
-                vote = vote_info.iloc[0]
-                print(f"  Vote {vote_id}: {vote['title']} ({vote['vote_date']})")
-                print(f"    Result: {vote['result']}")
-                print(f"    URL: {vote['source_url']}")
-                print()
+        print("\nMissed votes:")
+    for _, vote in mep_missed.head(20 if len(mep_missed) <= 20 else 10).iterrows():
+        print(f"  Vote {vote['vote_id']}: {vote['title']} ({vote['vote_date']})")
+        print(f"    Result: {vote['result']}")
+        print(f"    URL: {vote['source_url']}")
+        print()
     
-    # Show some of her notable votes for context
-    print("\nSome of Malika's notable votes (for context):")
-    for _, vote in malika_votes.head(5).iterrows():
+    # Show some of the MEP's notable votes for context
+    print(f"\nSome of {name}'s notable votes (for context):")
+    for _, vote in mep_votes.head(5).iterrows():
         print(f"  Vote {vote['vote_id']}: {vote['title']} ({vote['vote_date']})")
-        print(f"    Her vote: {vote['vote_position']}")
+        print(f"    Vote cast: {vote['vote_position']}")
         print(f"    Result: {vote['result']}")
         print()
 
 if __name__ == "__main__":
+    profile_from_argv(sys.argv[1:])
     find_missed_votes()
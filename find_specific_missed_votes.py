@@ -3,18 +3,38 @@
 Find the specific 2 votes that Malika Sorel missed
 """
 
+import sys
+import os
 import pandas as pd
+from absence_streaks import absence_streaks, print_streaks
+from ballot_matrix import BALLOTS_DIR, MATRIX_FILE, BallotMatrix
+from datasets import load_notable_votes, load_votes
+from mandates import eligible_votes
+from instrumentation import profile_from_argv, span
 
+@span('find_specific_missed_votes')
 def find_specific_missed_votes():
     """Find the specific votes that Malika Sorel missed"""
     
     # Load data
-    votes_df = pd.read_csv('data/votes_catalog.csv')
-    notable_df = pd.read_csv('data/mep_notable_votes.csv')
+    votes_df = load_votes()
+    notable_df = load_notable_votes()
     
     # Malika's MEP ID
     malika_id = 256871
     malika_votes = notable_df[notable_df['mep_id'] == malika_id]
+    # Only votes held during her mandate can be missed
+    votes_df = eligible_votes(votes_df, malika_id)
+    
+    # With the full ballot matrix the runs of missed votes can be read off directly
+    if os.path.exists(os.path.join(BALLOTS_DIR, MATRIX_FILE)):
+        with span('absence_streaks'):
+            streaks = absence_streaks(BallotMatrix.load())
+        malika_streaks = streaks[streaks['mep_id'] == malika_id]
+        print(f"Ballot matrix found - Malika Sorel missed {malika_streaks['votes'].sum()} votes "
+              f"in {len(malika_streaks)} streaks:")
+        print_streaks(malika_streaks)
+        return
     
     print("Malika Sorel's notable votes (all from July 10, 2025):")
     for _, vote in malika_votes.sort_values('vote_date').iterrows():
@@ -24,7 +44,7 @@ def find_specific_missed_votes():
     
     # Find votes after her last notable vote
     last_vote_time = "2025-07-10 12:17:02"
-    late_votes = votes_df[pd.to_datetime(votes_df['vote_date']) > pd.to_datetime(last_vote_time)]
+    late_votes = votes_df[votes_df['vote_date'] > pd.Timestamp(last_vote_time)]
     
     print(f"Found {len(late_votes)} votes after her last participation:")
     for _, vote in late_votes.iterrows():
@@ -35,7 +55,7 @@ def find_specific_missed_votes():
     
     # Also check if there are votes from early in the period (March) that she missed
     print("Checking for votes from early in the period (March 13, 2025):")
-    early_votes = votes_df[pd.to_datetime(votes_df['vote_date']).dt.date == pd.to_datetime('2025-03-13').date()]
+    early_votes = votes_df[votes_df['vote_date'].dt.date == pd.Timestamp('2025-03-13').date()]
     print(f"Found {len(early_votes)} votes from March 13, 2025")
     
     # Show a few early votes
@@ -60,4 +80,5 @@ def find_specific_missed_votes():
     print("- Votes from March 13, 2025 (early in the period)")
 
 if __name__ == "__main__":
+    profile_from_argv(sys.argv[1:])
     find_specific_missed_votes()
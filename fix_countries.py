@@ -4,8 +4,9 @@ Script to fix country mappings in MEP data.
 Maps birth countries to representation countries based on research.
 """
 
+import sys
 import pandas as pd
-import re
+from instrumentation import profile_from_argv, span
 
 # Country mapping based on research
 COUNTRY_MAPPINGS = {
@@ -41,54 +42,23 @@ COUNTRY_MAPPINGS = {
     }
 }
 
+@span('fix_countries')
 def fix_countries():
     """Fix country mappings in the MEP data."""
+    from repair_pipeline import run_pipeline
     
-    # Read the CSV file
-    df = pd.read_csv('data/meps.csv')
-    
-    print(f"Original data: {len(df)} MEPs")
-    
-    # Apply country mappings
-    changes_made = 0
-    
-    for index, row in df.iterrows():
-        original_country = row['country']
-        name = row['name']
-        
-        # Check for direct country mapping
-        if original_country in COUNTRY_MAPPINGS:
-            if isinstance(COUNTRY_MAPPINGS[original_country], dict):
-                # Historical country with name-specific mappings
-                if name in COUNTRY_MAPPINGS[original_country]:
-                    new_country = COUNTRY_MAPPINGS[original_country][name]
-                    df.at[index, 'country'] = new_country
-                    print(f"✅ {name}: {original_country} → {new_country}")
-                    changes_made += 1
-                else:
-                    print(f"⚠️  {name}: No mapping found for {original_country}")
-            else:
-                # Direct country mapping
-                new_country = COUNTRY_MAPPINGS[original_country]
-                df.at[index, 'country'] = new_country
-                print(f"✅ {name}: {original_country} → {new_country}")
-                changes_made += 1
+    report = run_pipeline(['countries'])
     
     print(f"\n📊 Summary:")
-    print(f"- Total MEPs: {len(df)}")
-    print(f"- Changes made: {changes_made}")
-    
-    # Save the corrected data
-    df.to_csv('data/meps.csv', index=False)
-    print(f"✅ Updated data saved to data/meps.csv")
+    print(f"- Changes made: {report['meps']['countries']}")
     
     # Show country distribution after fixes
+    df = pd.read_csv('data/meps.csv')
     print(f"\n🌍 Country distribution after fixes:")
     country_counts = df['country'].value_counts()
     for country, count in country_counts.head(10).items():
         print(f"  {country}: {count}")
 
 if __name__ == "__main__":
+    profile_from_argv(sys.argv[1:])
     fix_countries()
-
-
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP fetch layer with an on-disk response cache.
+
+- Identical URLs requested concurrently are coalesced into one request
+  (single-flight); the other callers wait for and share its response.
+- 200 responses are stored under .cache/http/ keyed by URL. Within `ttl`
+  they are served without touching the network; after that they are
+  revalidated with If-None-Match / If-Modified-Since, and a 304 keeps the
+  stored body. Entries older than `max_age` are evicted.
+- Hit/miss counters are kept for reporting.
+
+    python http_cache.py stats    # show cache size
+    python http_cache.py evict    # drop expired entries
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, NamedTuple, Optional
+
+import requests
+
+from instrumentation import count, observe
+
+CACHE_DIR = '.cache/http'
+DEFAULT_TTL = 6 * 3600             # serve without revalidating for 6 hours
+DEFAULT_MAX_AGE = 30 * 24 * 3600   # evict entries not refreshed for 30 days
+USER_AGENT = "Where's My MEP Data Harvester (+https://wheresmymep.eu)"
+
+
+class CachedResponse(NamedTuple):
+    status_code: int
+    text: str
+    from_cache: bool
+
+
+class CachedFetcher:
+    """Thread-safe GET with single-flight coalescing and a revalidating disk cache."""
+
+    def __init__(self,
+                 cache_dir: str = CACHE_DIR,
+                 ttl: float = DEFAULT_TTL,
+                 max_age: float = DEFAULT_MAX_AGE,
+                 session: Optional[requests.Session] = None,
+                 timeout: float = 10):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_age = max_age
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            session.headers['User-Agent'] = USER_AGENT
+        self.session = session
+
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self.counters = {'hits': 0, 'revalidated': 0, 'misses': 0, 'coalesced': 0}
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.meta.json', base + '.body'
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _read_entry(self, url: str):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, encoding='utf-8') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None, None
+        if meta.get('url') != url:
+            return None, None
+        return meta, body
+
+    def _write_entry(self, url: str, meta: dict, body: Optional[str] = None):
+        meta_path, body_path = self._paths(url)
+        if body is not None:
+            tmp = body_path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(body)
+            os.replace(tmp, body_path)
+        tmp = meta_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, meta_path)
+
+    def cached(self, url: str) -> Optional[CachedResponse]:
+        """The stored response if it is still within ttl (no network), else None."""
+        meta, body = self._read_entry(url)
+        if meta is None or time.time() - meta['fetched_at'] >= self.ttl:
+            return None
+        self._count('hits')
+        return CachedResponse(200, body, True)
+
+    def _fetch(self, url: str) -> CachedResponse:
+        meta, body = self._read_entry(url)
+        now = time.time()
+
+        if meta is not None and now - meta['fetched_at'] < self.ttl:
+            self._count('hits')
+            return CachedResponse(200, body, True)
+
+        headers = {}
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        started = time.perf_counter()
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        observe('http', time.perf_counter() - started)
+        count(f'http_{response.status_code}')
+
+        if response.status_code == 304 and meta is not None:
+            self._count('revalidated')
+            meta['fetched_at'] = now
+            self._write_entry(url, meta)
+            return CachedResponse(200, body, True)
+
+        self._count('misses')
+        if response.status_code == 200:
+            self._write_entry(url, {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fetched_at': now,
+            }, response.text)
+        return CachedResponse(response.status_code, response.text, False)
+
+    def get(self, url: str) -> CachedResponse:
+        """GET a URL through the cache, sharing any identical request in flight."""
+        with self._lock:
+            future = self._inflight.get(url)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[url] = future
+            else:
+                self.counters['coalesced'] += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._fetch(url)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[url]
+
+    def evict(self) -> int:
+        """Remove entries that have not been refreshed within max_age."""
+        removed = 0
+        cutoff = time.time() - self.max_age
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.meta.json'):
+                continue
+            meta_path = os.path.join(self.cache_dir, name)
+            try:
+                with open(meta_path) as f:
+                    fetched_at = json.load(f)['fetched_at']
+            except (OSError, ValueError, KeyError):
+                fetched_at = 0
+            if fetched_at < cutoff:
+                for path in (meta_path, meta_path[:-len('.meta.json')] + '.body'):
+                    if os.path.exists(path):
+                        os.remove(path)
+                removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+
+def main(argv):
+    """Inspect or prune the on-disk HTTP cache."""
+    fetcher = CachedFetcher()
+    if argv and argv[0] == 'evict':
+        print(f"🧹 Evicted {fetcher.evict()} expired entries from {CACHE_DIR}")
+    else:
+        entries = [n for n in os.listdir(CACHE_DIR) if n.endswith('.meta.json')]
+        print(f"📦 {len(entries)} cached responses in {CACHE_DIR}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
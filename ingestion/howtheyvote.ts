@@ -130,6 +130,15 @@ export function processNotableVotesData(csvData: any[]): NotableVote[] {
     .filter((vote): vote is NotableVote => vote !== null);
 }
 
+// Notable votes are stored as (mep_id, vote_id, vote_position) rows; the vote
+// columns come from the catalog
+export function joinVotePositions(positionsCSV: any[], votesCSV: any[]): any[] {
+  const votesById = new Map(votesCSV.map(row => [String(row.vote_id), row]));
+  return positionsCSV
+    .filter(row => votesById.has(String(row.vote_id)))
+    .map(row => ({ ...votesById.get(String(row.vote_id)), ...row }));
+}
+
 export function loadHowTheyVoteData(dataDir: string): HowTheyVoteData {
   console.log('🔄 Loading HowTheyVote data from:', dataDir);
   
@@ -149,8 +158,8 @@ export function loadHowTheyVoteData(dataDir: string): HowTheyVoteData {
   console.log(`📊 Loaded ${votes.length} votes`);
   
   // Load notable votes
-  const notableVotesCSV = loadCSVData(path.join(dataDir, 'mep_notable_votes.csv'));
-  const notableVotes = processNotableVotesData(notableVotesCSV);
+  const positionsCSV = loadCSVData(path.join(dataDir, 'mep_vote_positions.csv'));
+  const notableVotes = processNotableVotesData(joinVotePositions(positionsCSV, votesCSV));
   console.log(`📊 Loaded ${notableVotes.length} notable votes`);
   
   return {
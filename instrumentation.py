@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Lightweight stage instrumentation: spans, counters and latency histograms.
+
+    from instrumentation import count, observe, span
+
+    with span('load_csv') as s:
+        df = pd.read_csv(path)
+        s.rows = len(df)
+
+    @span('repair')
+    def run_pipeline(...): ...
+
+A span records wall time, process CPU time, rows processed and the process
+peak RSS when it ends. Spans nest per thread. observe() adds a latency
+(seconds) to a histogram keyed by (innermost open span, metric), e.g. the
+'http' and 'smtp' latencies of each stage. count() bumps a named counter.
+Recording is always on and costs microseconds per span.
+
+Scripts accept --profile through profile_from_argv(). It starts tracemalloc,
+so spans also report peak Python/numpy allocation above their start, and
+cProfile. At exit it writes to profile/:
+
+    <script>-<time>.trace.json   Chrome trace events (chrome://tracing, Perfetto)
+                                 plus counters, histograms and a stage summary
+    <script>-<time>.prof         cProfile stats (snakeviz, flameprof, pstats)
+    <script>-<time>.folded       span stacks in flamegraph.pl folded format
+
+    python instrumentation.py profile/<file>.trace.json    # print the summary
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left
+from contextlib import ContextDecorator
+from typing import Dict, List, Optional
+
+PROFILE_DIR = 'profile'
+# Histogram bucket upper bounds in milliseconds (the last bucket is unbounded)
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+MB = 1024 * 1024
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process in MB."""
+    # ru_maxrss survives exec, so it can include the parent process; VmHWM
+    # belongs to this process image alone
+    if os.path.exists('/proc/self/status'):
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / MB if sys.platform == 'darwin' else peak / 1024
+
+
+class Span:
+    def __init__(self, name: str, parent: Optional['Span'], rows: Optional[int] = None):
+        self.name = name
+        self.parent = parent
+        self.path = f"{parent.path};{name}" if parent else name
+        self.rows = rows
+        self.thread = threading.get_ident()
+        self.start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self.alloc_start = 0
+        self.alloc_peak = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.child_wall = 0.0
+        self.peak_rss = 0.0
+
+    def record(self, origin: float) -> Dict:
+        record = {
+            'name': self.name,
+            'path': self.path,
+            'start_ms': round((self.start - origin) * 1000, 3),
+            'wall_ms': round(self.wall * 1000, 3),
+            'cpu_ms': round(self.cpu * 1000, 3),
+            'peak_rss_mb': round(self.peak_rss, 1),
+            'thread': self.thread,
+        }
+        if self.rows is not None:
+            record['rows'] = int(self.rows)
+        if tracemalloc.is_tracing():
+            record['peak_alloc_mb'] = round((self.alloc_peak - self.alloc_start) / MB, 2)
+        return record
+
+
+class Histogram:
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms: float):
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None if unbounded)."""
+        seen = 0
+        for bound, n in zip(LATENCY_BUCKETS_MS + [None], self.buckets):
+            seen += n
+            if seen >= q * self.count:
+                return bound
+        return None
+
+    def as_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count, 3) if self.count else 0,
+            'max_ms': round(self.max, 3),
+            'p50_le_ms': self.quantile(0.5),
+            'p95_le_ms': self.quantile(0.95),
+            'buckets_le_ms': dict(zip([str(b) for b in LATENCY_BUCKETS_MS] + ['inf'], self.buckets)),
+        }
+
+
+class Recorder:
+    """Process-wide store of finished spans, counters and histograms."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.open: List[Span] = []
+        self.spans: List[Dict] = []
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[tuple, Histogram] = {}
+
+    def _stack(self) -> List[Span]:
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+    def current(self) -> Optional[Span]:
+        """Innermost open span of this thread, else of the main thread.
+
+        Worker threads (SMTP executor, HTTP fetch pool) thus attribute their
+        latencies to the stage that started them.
+        """
+        stack = self._stack()
+        if stack:
+            return stack[-1]
+        main = threading.main_thread().ident
+        with self.lock:
+            return next((s for s in reversed(self.open) if s.thread == main), None)
+
+    def _fold_alloc_peak(self):
+        # tracemalloc has one peak; fold it into every open span before a reset
+        _, peak = tracemalloc.get_traced_memory()
+        with self.lock:
+            for open_span in self.open:
+                open_span.alloc_peak = max(open_span.alloc_peak, peak)
+
+    def enter(self, name: str, rows: Optional[int] = None) -> Span:
+        stack = self._stack()
+        span_ = Span(name, stack[-1] if stack else None, rows)
+        if tracemalloc.is_tracing():
+            self._fold_alloc_peak()
+            tracemalloc.reset_peak()
+            span_.alloc_start = span_.alloc_peak = tracemalloc.get_traced_memory()[0]
+        stack.append(span_)
+        with self.lock:
+            self.open.append(span_)
+        return span_
+
+    def exit(self, span_: Span):
+        span_.wall = time.perf_counter() - span_.start
+        span_.cpu = time.process_time() - span_.cpu_start
+        span_.peak_rss = peak_rss_mb()
+        if tracemalloc.is_tracing():
+            self._fold_alloc_peak()
+        stack = self._stack()
+        if stack and stack[-1] is span_:
+            stack.pop()
+        if span_.parent is not None:
+            span_.parent.child_wall += span_.wall
+        with self.lock:
+            self.open.remove(span_)
+            record = span_.record(self.origin)
+            record['self_ms'] = round((span_.wall - span_.child_wall) * 1000, 3)
+            self.spans.append(record)
+
+    def count(self, name: str, n: int = 1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, metric: str, seconds: float):
+        stage = self.current()
+        key = (stage.path if stage else '-', metric)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.add(seconds * 1000)
+
+    def summary(self) -> List[Dict]:
+        """Per span path: calls, wall, self, CPU, rows and the highest peaks."""
+        stages: Dict[str, Dict] = {}
+        with self.lock:
+            spans = list(self.spans)
+        for record in spans:
+            stage = stages.setdefault(record['path'], {
+                'stage': record['path'], 'calls': 0, 'wall_ms': 0.0, 'self_ms': 0.0, 'cpu_ms': 0.0,
+                'rows': 0, 'peak_rss_mb': 0.0,
+            })
+            stage['calls'] += 1
+            for key in ('wall_ms', 'self_ms', 'cpu_ms'):
+                stage[key] = round(stage[key] + record[key], 3)
+            stage['rows'] += record.get('rows', 0)
+            stage['peak_rss_mb'] = max(stage['peak_rss_mb'], record['peak_rss_mb'])
+            if 'peak_alloc_mb' in record:
+                stage['peak_alloc_mb'] = max(stage.get('peak_alloc_mb', 0.0), record['peak_alloc_mb'])
+        return sorted(stages.values(), key=lambda s: s['stage'])
+
+    def trace(self) -> Dict:
+        """Chrome trace event JSON plus counters, histograms and the stage summary."""
+        pid = os.getpid()
+        with self.lock:
+            events = [{
+                'name': record['name'],
+                'ph': 'X',
+                'ts': int(record['start_ms'] * 1000),
+                'dur': int(record['wall_ms'] * 1000),
+                'pid': pid,
+                'tid': record['thread'],
+                'args': {k: v for k, v in record.items() if k not in ('name', 'start_ms', 'wall_ms', 'thread')},
+            } for record in self.spans]
+            counters = dict(self.counters)
+            histograms = {f"{stage}:{metric}": h.as_dict() for (stage, metric), h in self.histograms.items()}
+        return {
+            'traceEvents': sorted(events, key=lambda e: e['ts']),
+            'displayTimeUnit': 'ms',
+            'counters': counters,
+            'histograms': histograms,
+            'summary': self.summary(),
+        }
+
+    def folded(self) -> List[str]:
+        """Span self time (µs) per stack, in flamegraph.pl folded format."""
+        totals: Dict[str, float] = {}
+        with self.lock:
+            for record in self.spans:
+                totals[record['path']] = totals.get(record['path'], 0.0) + record['self_ms']
+        return [f"{path} {int(ms * 1000)}" for path, ms in sorted(totals.items()) if ms > 0]
+
+
+RECORDER = Recorder()
+
+
+class span(ContextDecorator):
+    """Context manager (or decorator) timing one stage; set .rows on the yielded span."""
+
+    def __init__(self, name: str, rows: Optional[int] = None):
+        self.name = name
+        self.rows = rows
+
+    def _recreate_cm(self):
+        # A fresh instance per decorated call, so recursion and threads are safe
+        return span(self.name, self.rows)
+
+    def __enter__(self) -> Span:
+        self.span = RECORDER.enter(self.name, self.rows)
+        return self.span
+
+    def __exit__(self, *exc):
+        RECORDER.exit(self.span)
+
+
+def count(name: str, n: int = 1):
+    RECORDER.count(name, n)
+
+
+def observe(metric: str, seconds: float):
+    """Add one latency sample (seconds) to the current stage's histogram."""
+    RECORDER.observe(metric, seconds)
+
+
+def print_summary(summary: List[Dict], counters: Dict[str, int], histograms: Dict[str, Dict]):
+    print("\n📊 Stage timings:")
+    for stage in summary:
+        rows = f", {stage['rows']} rows" if stage['rows'] else ''
+        alloc = f", {stage['peak_alloc_mb']:.1f} MB allocated" if 'peak_alloc_mb' in stage else ''
+        print(f"- {stage['stage']}: {stage['wall_ms']:.1f} ms wall (self {stage['self_ms']:.1f}), "
+              f"{stage['cpu_ms']:.1f} ms CPU{rows}{alloc}, {stage['peak_rss_mb']:.0f} MB peak RSS")
+    for name, value in sorted(counters.items()):
+        print(f"- {name}: {value}")
+    for name, histogram in sorted(histograms.items()):
+        print(f"- {name}: {histogram['count']} calls, mean {histogram['mean_ms']:.1f} ms, "
+              f"p95 ≤ {histogram['p95_le_ms']} ms, max {histogram['max_ms']:.1f} ms")
+
+
+def write_profile(profiler=None, prefix: Optional[str] = None) -> str:
+    """Write the trace, folded stacks and (if given) cProfile stats; returns the path prefix."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    script = os.path.splitext(os.path.basename(sys.argv[0]))[0] or 'python'
+    prefix = prefix or os.path.join(PROFILE_DIR, f"{script}-{time.strftime('%Y%m%d-%H%M%S')}")
+
+    trace = RECORDER.trace()
+    with open(f"{prefix}.trace.json", 'w') as f:
+        json.dump(trace, f, indent=1)
+    with open(f"{prefix}.folded", 'w') as f:
+        f.writelines(line + '\n' for line in RECORDER.folded())
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(f"{prefix}.prof")
+
+    print_summary(trace['summary'], trace['counters'], trace['histograms'])
+    print(f"💾 Profile written to {prefix}.trace.json, .folded{', .prof' if profiler else ''}")
+    return prefix
+
+
+def start_profiling():
+    """Trace allocations and run cProfile until exit, then write the profile."""
+    import cProfile
+
+    tracemalloc.start()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    atexit.register(write_profile, profiler)
+
+
+def profile_from_argv(argv: List[str]) -> List[str]:
+    """Handle a --profile flag; returns argv without it for the script's main()."""
+    if '--profile' not in argv:
+        return argv
+    start_profiling()
+    return [arg for arg in argv if arg != '--profile']
+
+
+def main(argv: List[str]):
+    if not argv:
+        print("Usage: python instrumentation.py profile/<file>.trace.json")
+        return
+    with open(argv[0]) as f:
+        trace = json.load(f)
+    print_summary(trace['summary'], trace['counters'], trace['histograms'])
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Config-driven asyncio mail dispatcher for the email campaign scripts.
+
+Reads email_config.json and sends rendered messages through a token bucket
+refilled at one token per `rate_limit_seconds`, so the provider limit holds
+exactly however long each send takes. Messages are rendered on a worker
+thread into a queue of at most `max_emails_per_batch`, overlapping rendering
+with network I/O. Sends are grouped in batches of that size on pooled SMTP
+connections, which are reset between batches. With `test_mode` on, each
+message is printed instead of sent and nothing is throttled.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import CancelledError
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Callable, Dict, Iterable, NamedTuple, Optional
+
+from instrumentation import count, span
+from rate_limit import TokenBucket
+from send_journal import SendJournal, journal_key
+from smtp_pool import SMTPPool, smtp_settings
+
+CONFIG_FILE = 'email_config.json'
+
+logger = logging.getLogger(__name__)
+
+
+class Email(NamedTuple):
+    to_email: str
+    subject: str
+    body: str
+    # Per-recipient values (name, country, language, ...) for previews and logs
+    context: Optional[Dict] = None
+    # Pre-rendered MIME text (e.g. read from the outbox spool)
+    raw: Optional[str] = None
+
+    def as_string(self, from_email: str) -> str:
+        if self.raw is not None:
+            return self.raw
+        return build_mime(from_email, self.to_email, self.subject, self.body)
+
+
+def build_mime(from_email: str, to_email: str, subject: str, body: str) -> str:
+    """The plain-text MIME message the campaign scripts have always sent."""
+    msg = MIMEMultipart()
+    msg['From'] = from_email
+    msg['To'] = to_email
+    msg['Subject'] = subject
+    msg.attach(MIMEText(body, 'plain', 'utf-8'))
+    return msg.as_string()
+
+
+def load_email_config(path: str = CONFIG_FILE) -> Dict:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def print_preview(email: Email):
+    print(f"\n{'='*50}")
+    print(f"TO: {email.to_email}")
+    print(f"SUBJECT: {email.subject}")
+    print(f"{'='*50}")
+    print(email.body)
+    print(f"{'='*50}\n")
+
+
+class MailDispatcher:
+    """Rate-limited, batched delivery of rendered emails."""
+
+    def __init__(self, config: Dict,
+                 preview: Callable[[Email], None] = print_preview,
+                 pool_size: int = 2,
+                 journal: Optional[SendJournal] = None,
+                 campaign: str = ''):
+        settings = config.get('email_settings', {})
+        self.test_mode = settings.get('test_mode', True)
+        self.batch_size = max(1, int(settings.get('max_emails_per_batch', 50)))
+        rate_limit_seconds = float(settings.get('rate_limit_seconds', 2))
+        if rate_limit_seconds < 0:
+            raise ValueError(f"rate_limit_seconds must be 0 (no limit) or positive, not {rate_limit_seconds}")
+        # 0 means unthrottled
+        self.bucket = TokenBucket(1 / rate_limit_seconds) if rate_limit_seconds else None
+        self.smtp_config = config.get('smtp', {})
+        self.from_email = smtp_settings(self.smtp_config)['from_email']
+        self.preview = preview
+        self.pool_size = pool_size
+        # Completed sends are recorded here and skipped on the next run
+        self.journal = journal
+        self.campaign = campaign
+        self.stats = Counter()
+
+    def _start_rendering(self, messages: Iterable[Optional[Email]], queue: asyncio.Queue):
+        """Pull messages from the (lazy) iterable on a thread, feeding the queue."""
+        loop = asyncio.get_running_loop()
+
+        def put(item):
+            asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+        def produce():
+            try:
+                try:
+                    with span('render_emails') as stage:
+                        stage.rows = 0
+                        for email in messages:
+                            if email is None:
+                                continue
+                            stage.rows += 1
+                            if self.journal is not None and journal_key(self.campaign, email) in self.journal:
+                                self.stats['skipped'] += 1
+                                continue
+                            put(email)
+                except BaseException as e:
+                    put(e)
+                    return
+                put(None)
+            except (CancelledError, RuntimeError):
+                # The dispatcher stopped first and its loop is gone
+                pass
+
+        threading.Thread(target=produce, daemon=True).start()
+
+    async def _next_batch(self, queue: asyncio.Queue):
+        """Fill a batch; returns (batch, end) where end is None or an error once rendering stops."""
+        batch = []
+        while len(batch) < self.batch_size:
+            item = await queue.get()
+            if item is None or isinstance(item, BaseException):
+                return batch, item
+            batch.append(item)
+        return batch, False
+
+    def _send(self, pool: SMTPPool, email: Email) -> bool:
+        try:
+            pool.sendmail(self.from_email, email.to_email, email.as_string(self.from_email))
+        except Exception as e:
+            logger.error(f"❌ Failed to send email to {email.to_email}: {e}")
+            count('emails_failed')
+            return False
+        count('emails_sent')
+        if self.journal is not None:
+            self.journal.record(journal_key(self.campaign, email))
+        logger.info(f"✅ Sent email to {email.to_email}")
+        return True
+
+    async def dispatch(self, messages: Iterable[Optional[Email]]) -> Counter:
+        """Deliver (or preview) every message; None entries are skipped."""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.batch_size)
+        self._start_rendering(messages, queue)
+
+        pool = None if self.test_mode else SMTPPool(self.smtp_config, size=self.pool_size)
+        in_flight = asyncio.Semaphore(self.pool_size)
+
+        async def send(email: Email):
+            async with in_flight:
+                ok = await loop.run_in_executor(None, self._send, pool, email)
+            self.stats['sent' if ok else 'failed'] += 1
+
+        try:
+            end = False
+            while end is False:
+                # Messages rendered before a rendering error are still sent
+                batch, end = await self._next_batch(queue)
+                if not batch:
+                    continue
+
+                self.stats['batches'] += 1
+                if self.test_mode:
+                    for email in batch:
+                        self.preview(email)
+                    self.stats['previewed'] += len(batch)
+                    continue
+
+                with span('send_batch', rows=len(batch)):
+                    sends = []
+                    for email in batch:
+                        # A token per message keeps the send rate exact; a slow
+                        # server reply delays only its own send, not the schedule
+                        if self.bucket is not None:
+                            await self.bucket.acquire()
+                        sends.append(asyncio.ensure_future(send(email)))
+                    await asyncio.gather(*sends)
+                    await loop.run_in_executor(None, pool.reset)
+                    if self.journal is not None:
+                        await loop.run_in_executor(None, self.journal.sync)
+                logger.info(f"📊 Batch {self.stats['batches']}: {len(batch)} emails")
+
+            if isinstance(end, BaseException):
+                raise end
+        finally:
+            if pool is not None:
+                pool.close()
+            if self.journal is not None:
+                self.journal.sync()
+
+        return self.stats
+
+
+def dispatch_emails(messages: Iterable[Optional[Email]],
+                    config: Optional[Dict] = None,
+                    preview: Callable[[Email], None] = print_preview,
+                    campaign: Optional[str] = None) -> Counter:
+    """Synchronous entry point for the campaign scripts.
+
+    When a campaign name is given and test_mode is off, sends are journaled
+    and MEPs that already received the same message are skipped.
+    """
+    config = config or load_email_config()
+    test_mode = config.get('email_settings', {}).get('test_mode', True)
+    if campaign is None or test_mode:
+        return asyncio.run(MailDispatcher(config, preview=preview).dispatch(messages))
+
+    with SendJournal() as journal:
+        dispatcher = MailDispatcher(config, preview=preview, journal=journal, campaign=campaign)
+        return asyncio.run(dispatcher.dispatch(messages))
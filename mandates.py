@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Mandate-aware vote eligibility for every MEP.
+
+An MEP can only miss votes held while they sat in Parliament. Mandates are
+[mandate_start, mandate_end] intervals per MEP, read from the first source
+available:
+
+    data/mandates.csv    mep_id, mandate_start, mandate_end (one row per
+                         mandate; a blank end means still sitting)
+    ballot matrix        first to last recorded ballot of each MEP
+    (neither)            every MEP sits for the whole catalog
+
+Eligibility is one interval join: vote timestamps are sorted once, and
+searchsorted turns every mandate into a [first, end) range of vote positions.
+Summing the range lengths per MEP (overlaps counted once) gives votes_total_period for all MEPs
+without a per-MEP scan.
+
+    python mandates.py    # write data/mep_eligibility.csv
+"""
+
+import os
+import sys
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ballot_matrix import BALLOTS_DIR, MATRIX_FILE, NO_DATA, BallotMatrix
+from datasets import DATA_DIR, SCHEMAS, load_attendance, load_dataset, load_meps, load_votes
+from instrumentation import profile_from_argv, span
+
+ELIGIBILITY_FILE = os.path.join(DATA_DIR, 'mep_eligibility.csv')
+
+
+def read_mandates(path: Optional[str] = None) -> pd.DataFrame:
+    """mandates.csv with day-precision bounds widened to cover whole days."""
+    mandates = load_dataset('mandates', path)[['mep_id', 'mandate_start', 'mandate_end']]
+    end = mandates['mandate_end'].astype('datetime64[ns]')
+    # An end date without a time includes every vote held that day
+    whole_day = end.notna() & end.eq(end.dt.normalize())
+    mandates['mandate_end'] = end.mask(whole_day, end + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns'))
+    return mandates
+
+
+def mandates_from_matrix(matrix: BallotMatrix) -> pd.DataFrame:
+    """One mandate per MEP from their first to last recorded ballot."""
+    recorded = np.asarray(matrix.codes) != NO_DATA
+    sat = recorded.any(axis=1)
+    first_col = recorded.argmax(axis=1)
+    last_col = recorded.shape[1] - 1 - recorded[:, ::-1].argmax(axis=1)
+
+    vote_dates = matrix.votes['vote_date'].to_numpy()
+    return pd.DataFrame({
+        'mep_id': matrix.meps['mep_id'][sat].reset_index(drop=True),
+        'mandate_start': vote_dates[first_col[sat]],
+        'mandate_end': vote_dates[last_col[sat]],
+    })
+
+
+def full_term_mandates(meps_df: pd.DataFrame) -> pd.DataFrame:
+    """Open-ended mandates: every MEP eligible for every vote."""
+    return pd.DataFrame({
+        'mep_id': meps_df['mep_id'].dropna().astype('Int64').reset_index(drop=True),
+        'mandate_start': pd.NaT,
+        'mandate_end': pd.NaT,
+    })
+
+
+def load_mandates() -> Tuple[pd.DataFrame, str]:
+    """Mandates from the best source available, and the name of that source."""
+    if os.path.exists(os.path.join(DATA_DIR, SCHEMAS['mandates']['file'])):
+        return read_mandates(), SCHEMAS['mandates']['file']
+    if os.path.exists(os.path.join(BALLOTS_DIR, MATRIX_FILE)):
+        return mandates_from_matrix(BallotMatrix.load()), 'ballot matrix'
+    return full_term_mandates(load_meps()), 'whole catalog'
+
+
+def chronological(votes_df: pd.DataFrame) -> pd.DataFrame:
+    """Votes in ballot matrix column order."""
+    return votes_df.sort_values(['vote_date', 'vote_id'], kind='stable').reset_index(drop=True)
+
+
+def mandate_ranges(mandates: pd.DataFrame, vote_dates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """[first, end) positions in sorted vote_dates covered by each mandate."""
+    start = mandates['mandate_start'].to_numpy('datetime64[ns]')
+    end = mandates['mandate_end'].to_numpy('datetime64[ns]')
+    first = np.where(np.isnat(start), 0, np.searchsorted(vote_dates, start, side='left'))
+    last = np.where(np.isnat(end), len(vote_dates), np.searchsorted(vote_dates, end, side='right'))
+    return first, np.maximum(first, last)
+
+
+def eligibility(mandates: pd.DataFrame, votes_df: pd.DataFrame) -> pd.DataFrame:
+    """Per-MEP eligible vote range and votes_total_period, for all MEPs at once."""
+    votes = chronological(votes_df)
+    first, end = mandate_ranges(mandates, votes['vote_date'].to_numpy('datetime64[ns]'))
+
+    mep_ids = pd.Index(mandates['mep_id'].dropna().unique())
+    which = mep_ids.get_indexer(mandates['mep_id'])
+    held = (which >= 0) & (end > first)
+
+    # Overlapping mandates of one MEP only count the votes not already covered
+    order = np.flatnonzero(held)[np.lexsort((first[held], which[held]))]
+    reach = pd.Series(end[order]).groupby(which[order]).cummax()
+    reach = reach.groupby(which[order]).shift(fill_value=0).to_numpy()
+    new_votes = np.maximum(end[order] - np.maximum(first[order], reach), 0)
+    total = np.bincount(which[order], weights=new_votes, minlength=len(mep_ids)).astype(np.int64)
+    lo = np.full(len(mep_ids), len(votes))
+    hi = np.full(len(mep_ids), -1)
+    np.minimum.at(lo, which[held], first[held])
+    np.maximum.at(hi, which[held], end[held] - 1)
+
+    result = pd.DataFrame({
+        'mep_id': pd.array(mep_ids, dtype='Int64'),
+        'first_vote_id': pd.array([pd.NA] * len(mep_ids), dtype='Int64'),
+        'first_vote_date': pd.Series(pd.NaT, index=range(len(mep_ids)), dtype='datetime64[ns]'),
+        'last_vote_id': pd.array([pd.NA] * len(mep_ids), dtype='Int64'),
+        'last_vote_date': pd.Series(pd.NaT, index=range(len(mep_ids)), dtype='datetime64[ns]'),
+        'votes_total_period': total,
+    })
+    rows = np.flatnonzero(total > 0)
+    vote_ids, vote_dates = votes['vote_id'].to_numpy(), votes['vote_date'].to_numpy('datetime64[ns]')
+    result.loc[rows, 'first_vote_id'] = vote_ids[lo[rows]]
+    result.loc[rows, 'first_vote_date'] = vote_dates[lo[rows]]
+    result.loc[rows, 'last_vote_id'] = vote_ids[hi[rows]]
+    result.loc[rows, 'last_vote_date'] = vote_dates[hi[rows]]
+    return result
+
+
+def eligible_votes(votes_df: pd.DataFrame, mep_id, mandates: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """The votes (chronological) held while one MEP sat; all votes if the MEP has no known mandate."""
+    if mandates is None:
+        mandates, _ = load_mandates()
+    votes = chronological(votes_df)
+    if pd.isna(mep_id) or not (mandates['mep_id'] == mep_id).any():
+        return votes
+
+    first, end = mandate_ranges(mandates[mandates['mep_id'] == mep_id], votes['vote_date'].to_numpy('datetime64[ns]'))
+    # +1 at each mandate start, -1 past its end: positions with a positive sum are covered
+    edges = np.zeros(len(votes) + 1, dtype=np.int32)
+    np.add.at(edges, first, 1)
+    np.add.at(edges, end, -1)
+    return votes[np.cumsum(edges[:-1]) > 0].reset_index(drop=True)
+
+
+def main(argv: List[str]):
+    with span('load_mandates') as stage:
+        mandates, source = load_mandates()
+        stage.rows = len(mandates)
+    votes_df = load_votes()
+    with span('eligibility', rows=len(mandates)):
+        result = eligibility(mandates, votes_df)
+    result.to_csv(ELIGIBILITY_FILE, index=False)
+
+    partial = result[result['votes_total_period'] < len(votes_df)]
+    print(f"✅ Eligibility for {len(result)} MEPs from {source} ({len(votes_df)} votes in catalog)")
+    print(f"📊 {len(partial)} MEPs sat for only part of the catalog")
+    if source == 'whole catalog':
+        flagged = int(load_attendance()['partial_term'].sum())
+        if flagged:
+            print(f"⚠️  {flagged} MEPs are flagged partial_term but no mandates are known; "
+                  f"add {SCHEMAS['mandates']['file']} or build the ballot matrix")
+    print(f"💾 Saved {ELIGIBILITY_FILE}")
+
+
+if __name__ == "__main__":
+    main(profile_from_argv(sys.argv[1:]))
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Accent- and order-insensitive MEP name matcher built from data/meps.csv.
+
+Names are normalized (diacritics stripped, case folded, hyphens and
+punctuation turned into spaces, tokens sorted) so "SOREL Malika",
+"Malika Sorel" and "malika-sorel" share one key. Lookups go through:
+
+1. an exact hash index on the normalized key,
+2. a token index (every query token must appear in the MEP's name), which
+   also resolves surname-only ballots such as "SOREL",
+3. a fuzzy fallback (difflib) restricted to MEPs sharing a token.
+
+Results are memoized per raw name, so repeated ballot names resolve with a
+single dict lookup. Counters track exact/token/fuzzy matches, ambiguous
+names and unmatched names.
+
+    python mep_matcher.py "SOREL Malika"
+"""
+
+import csv
+import difflib
+import re
+import sys
+import unicodedata
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+MEPS_FILE = 'data/meps.csv'
+
+# Letters NFKD does not decompose into base letter + accent
+SPECIAL_LETTERS = str.maketrans({
+    'ß': 'ss', 'ø': 'o', 'Ø': 'o', 'ł': 'l', 'Ł': 'l', 'đ': 'd', 'Đ': 'd',
+    'æ': 'ae', 'Æ': 'ae', 'œ': 'oe', 'Œ': 'oe', 'ı': 'i', 'þ': 'th',
+})
+SEPARATORS_RE = re.compile(r"[\s\-‐‑–—'’`.,]+")
+
+FUZZY_CUTOFF = 0.85
+
+
+def normalize_tokens(name: str) -> List[str]:
+    """Lower-case ASCII tokens of a name, in their original order."""
+    text = unicodedata.normalize('NFKD', name.translate(SPECIAL_LETTERS))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).casefold()
+    return [token for token in SEPARATORS_RE.split(text) if token]
+
+
+def name_key(name: str) -> str:
+    """Order-insensitive key: sorted normalized tokens."""
+    return ' '.join(sorted(normalize_tokens(name)))
+
+
+class Match(NamedTuple):
+    row: int            # row in data/meps.csv
+    mep_id: Optional[int]
+    name: str
+    method: str         # 'exact', 'token', 'fuzzy' or 'id'
+
+
+class MEPMatcher:
+    """Resolve ballot names (or ids) to MEPs with precomputed indexes."""
+
+    def __init__(self, meps_file: str = MEPS_FILE):
+        self.names: List[str] = []
+        self.mep_ids: List[Optional[int]] = []
+        with open(meps_file, newline='', encoding='utf-8') as f:
+            for record in csv.DictReader(f):
+                self.names.append(record['name'])
+                mep_id = record['mep_id'].strip()
+                self.mep_ids.append(int(float(mep_id)) if mep_id else None)
+
+        self.by_key: Dict[str, List[int]] = {}
+        self.by_token: Dict[str, Set[int]] = {}
+        self.by_id: Dict[int, int] = {}
+        # meps.csv reuses a few ids for different MEPs; those ids resolve to nobody
+        self.duplicate_ids: Set[int] = set()
+        for row, name in enumerate(self.names):
+            tokens = normalize_tokens(name)
+            self.by_key.setdefault(' '.join(sorted(tokens)), []).append(row)
+            for token in tokens:
+                self.by_token.setdefault(token, set()).add(row)
+            if self.mep_ids[row] is not None:
+                if self.mep_ids[row] in self.by_id:
+                    self.duplicate_ids.add(self.mep_ids[row])
+                self.by_id.setdefault(self.mep_ids[row], row)
+        self.keys = {row: name_key(name) for row, name in enumerate(self.names)}
+
+        self._memo: Dict[str, Tuple[Optional[Match], str]] = {}
+        self.stats: Counter = Counter()
+
+    def _match(self, row: int, method: str) -> Match:
+        return Match(row, self.mep_ids[row], self.names[row], method)
+
+    def _resolve_uncached(self, name: str) -> Tuple[Optional[Match], str]:
+        tokens = normalize_tokens(name)
+        if not tokens:
+            return None, 'unmatched'
+
+        rows = self.by_key.get(' '.join(sorted(tokens)), [])
+        if len(rows) == 1:
+            return self._match(rows[0], 'exact'), 'exact'
+        if len(rows) > 1:
+            return None, 'ambiguous'
+
+        postings = [self.by_token.get(token) for token in tokens]
+        if all(postings):
+            candidates = set.intersection(*postings)
+            if len(candidates) == 1:
+                return self._match(candidates.pop(), 'token'), 'token'
+            if len(candidates) > 1:
+                return None, 'ambiguous'
+
+        # Fuzzy fallback only over MEPs that share at least one token
+        nearby = set().union(*(p for p in postings if p)) or set(range(len(self.names)))
+        query = ' '.join(sorted(tokens))
+        scored = sorted(
+            ((difflib.SequenceMatcher(None, query, self.keys[row]).ratio(), row) for row in nearby),
+            reverse=True,
+        )
+        if scored and scored[0][0] >= FUZZY_CUTOFF:
+            if len(scored) > 1 and scored[1][0] == scored[0][0]:
+                return None, 'ambiguous'
+            return self._match(scored[0][1], 'fuzzy'), 'fuzzy'
+        return None, 'unmatched'
+
+    def resolve(self, name: str) -> Optional[Match]:
+        """Best unambiguous match for a name, or None."""
+        try:
+            match, outcome = self._memo[name]
+        except KeyError:
+            match, outcome = self._memo[name] = self._resolve_uncached(name)
+        self.stats[outcome] += 1
+        return match
+
+    def resolve_id(self, mep_id) -> Optional[Match]:
+        if int(mep_id) in self.duplicate_ids:
+            self.stats['ambiguous'] += 1
+            return None
+        row = self.by_id.get(int(mep_id))
+        return None if row is None else self._match(row, 'id')
+
+    def id_matches(self, mep_id) -> List[Match]:
+        """Every meps.csv row with this id (more than one for a duplicated id)."""
+        return [self._match(row, 'id') for row, row_id in enumerate(self.mep_ids) if row_id == int(mep_id)]
+
+    def lookup(self, name_or_id) -> Optional[Match]:
+        """Resolve a CLI-style argument that is either a mep_id or a name."""
+        text = str(name_or_id).strip()
+        if text.isdigit():
+            return self.resolve_id(text)
+        return self.resolve(text)
+
+
+_matcher: Optional[MEPMatcher] = None
+
+
+def get_matcher() -> MEPMatcher:
+    """Shared matcher over data/meps.csv, built on first use."""
+    global _matcher
+    if _matcher is None:
+        _matcher = MEPMatcher()
+    return _matcher
+
+
+def find_mep(df, name_or_id):
+    """Return the row for a name or mep_id of an MEP DataFrame in data/meps.csv row order.
+
+    The matched meps.csv row is used directly, since mep_id is not unique.
+    """
+    match = get_matcher().lookup(name_or_id)
+    if match is None:
+        raise KeyError(f"No unambiguous MEP match for {name_or_id!r}")
+    if match.mep_id is None:
+        raise KeyError(f"{match.name} has no mep_id in {MEPS_FILE}")
+    if match.row >= len(df) or df['name'].iloc[match.row] != match.name:
+        raise KeyError(f"MEP table is not in {MEPS_FILE} row order (looking up {match.name})")
+    return df.iloc[match.row]
+
+
+def main(argv: List[str]):
+    """Resolve names given on the command line."""
+    matcher = get_matcher()
+    for name in argv:
+        match = matcher.lookup(name)
+        if match:
+            print(f"✅ {name!r} -> {match.name} (MEP ID: {match.mep_id}, {match.method})")
+        else:
+            print(f"❌ {name!r} -> no unambiguous match")
+    print(f"📊 {dict(matcher.stats)}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Batch missed-vote engine for all MEPs.
+
+Works on the ballot matrix (see ballot_matrix.py) in a single vectorized pass:
+every absent cell becomes one row of a long-form missed-votes table, and a
+per-MEP summary gives the missed count plus first/last participation dates.
+mep_missed_votes answers the same question for one MEP, falling back to the
+notable votes when no matrix has been built.
+"""
+
+import os
+import sys
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ballot_matrix import ABSENT, BALLOTS_DIR, MATRIX_FILE, NO_DATA, BallotMatrix
+from datasets import load_votes
+from instrumentation import profile_from_argv, span
+from mandates import chronological, eligible_votes
+
+MISSED_VOTES_FILE = 'data/missed_votes.csv'
+MISSED_SUMMARY_FILE = 'data/missed_votes_summary.csv'
+
+
+def missed_votes_table(matrix: BallotMatrix) -> pd.DataFrame:
+    """Long-form (mep_id, vote_id, vote_date) table of every missed vote."""
+    codes = np.asarray(matrix.codes)
+    rows, cols = np.nonzero(codes == ABSENT)
+
+    return pd.DataFrame({
+        'mep_id': matrix.meps['mep_id'].take(rows).reset_index(drop=True),
+        'vote_id': matrix.votes['vote_id'].to_numpy()[cols],
+        'vote_date': matrix.votes['vote_date'].to_numpy()[cols],
+    })
+
+
+def missed_votes_summary(matrix: BallotMatrix) -> pd.DataFrame:
+    """Per-MEP missed count, votes cast and first/last participation date."""
+    codes = np.asarray(matrix.codes)
+    present = codes > ABSENT
+    n_votes = codes.shape[1]
+
+    any_present = present.any(axis=1)
+    first_col = present.argmax(axis=1)
+    last_col = n_votes - 1 - present[:, ::-1].argmax(axis=1)
+
+    vote_dates = matrix.votes['vote_date'].to_numpy()
+    no_date = np.datetime64('NaT')
+
+    return pd.DataFrame({
+        'mep_id': matrix.meps['mep_id'],
+        'name': matrix.meps['name'],
+        'votes_recorded': (codes != NO_DATA).sum(axis=1),
+        'votes_cast': present.sum(axis=1),
+        'missed_count': (codes == ABSENT).sum(axis=1),
+        'first_participation': np.where(any_present, vote_dates[first_col], no_date),
+        'last_participation': np.where(any_present, vote_dates[last_col], no_date),
+    })
+
+
+def mep_missed_votes(votes_df: pd.DataFrame, mep_id, notable_df: pd.DataFrame) -> pd.DataFrame:
+    """Catalog rows (chronological) of the votes one MEP missed.
+
+    Read off the ballot matrix when it exists. Otherwise every vote held
+    during the mandate that is not among the MEP's notable votes is returned,
+    which over-counts: notable votes are only a sample of the ballots cast.
+    """
+    if os.path.exists(os.path.join(BALLOTS_DIR, MATRIX_FILE)):
+        with span('ballot_matrix_lookup'):
+            missed_ids = BallotMatrix.load().missed_votes(mep_id)
+        votes = chronological(votes_df)
+        return votes[votes['vote_id'].isin(missed_ids)].reset_index(drop=True)
+
+    print("No ballot matrix - comparing the catalog with the notable votes only")
+    mandate_votes = eligible_votes(votes_df, mep_id)
+    voted = notable_df.loc[notable_df['mep_id'] == mep_id, 'vote_id']
+    return mandate_votes[~mandate_votes['vote_id'].isin(voted)].reset_index(drop=True)
+
+
+def run_missed_votes(matrix: BallotMatrix) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Compute and save both the long-form table and the per-MEP summary."""
+    with span('missed_votes_table') as stage:
+        missed = missed_votes_table(matrix)
+        stage.rows = len(missed)
+    with span('missed_votes_summary', rows=matrix.shape[0]):
+        summary = missed_votes_summary(matrix)
+
+    with span('write_missed_votes', rows=len(missed)):
+        missed.to_csv(MISSED_VOTES_FILE, index=False)
+        summary.to_csv(MISSED_SUMMARY_FILE, index=False)
+
+    return missed, summary
+
+
+def main(argv: List[str]):
+    """Run the engine for every MEP, optionally printing one MEP's misses."""
+    if not os.path.exists(os.path.join(BALLOTS_DIR, MATRIX_FILE)):
+        print("❌ No ballot matrix yet; build it with: python ballot_matrix.py build <ballots.csv>")
+        return
+
+    matrix = BallotMatrix.load()
+    missed, summary = run_missed_votes(matrix)
+
+    print(f"✅ {len(missed)} missed votes across {len(summary)} MEPs")
+    print(f"   Saved {MISSED_VOTES_FILE} and {MISSED_SUMMARY_FILE}")
+
+    if argv:
+        mep_id = int(argv[0])
+        votes_df = load_votes()
+        mep_missed = missed[missed['mep_id'] == mep_id].merge(
+            votes_df[['vote_id', 'title', 'result']], on='vote_id', how='left'
+        )
+        print(f"\nMEP {mep_id} missed {len(mep_missed)} votes:")
+        for _, vote in mep_missed.iterrows():
+            print(f"  {vote['vote_date']}: Vote {vote['vote_id']} - {vote['title']} ({vote['result']})")
+
+
+if __name__ == "__main__":
+    main(profile_from_argv(sys.argv[1:]))
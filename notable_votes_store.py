@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Normalized storage for notable votes.
+
+Notable votes are stored once, as the compact fact table
+data/mep_vote_positions.csv (mep_id, vote_id, vote_position). Everything
+else about a vote lives in data/votes_catalog.csv. The wide view, which
+repeats each vote's date, title, result, totals and source_url on every
+row, is rebuilt on demand with a single vectorized join; datasets.py's
+load_notable_votes does exactly that.
+
+data/mep_notable_votes.csv is a generated copy of the wide view for tools
+that still want a CSV. It is not committed and never read back. To import a
+harvest delivered in the wide format, normalize it explicitly.
+
+    python notable_votes_store.py normalize    # wide CSV -> fact table
+    python notable_votes_store.py materialize  # fact table + catalog -> wide CSV
+"""
+
+import os
+import sys
+from typing import List
+
+import pandas as pd
+
+from ballot_matrix import write_csv_atomic
+
+POSITIONS_FILE = 'data/mep_vote_positions.csv'
+NOTABLE_FILE = 'data/mep_notable_votes.csv'
+VOTES_FILE = 'data/votes_catalog.csv'
+
+FACT_COLUMNS = ['mep_id', 'vote_id', 'vote_position']
+WIDE_COLUMNS = [
+    'mep_id', 'vote_id', 'vote_date', 'title', 'result', 'vote_position',
+    'total_for', 'total_against', 'total_abstain', 'source_url',
+]
+VOTE_COLUMNS = [c for c in WIDE_COLUMNS if c not in FACT_COLUMNS]
+
+
+def read_raw(path: str) -> pd.DataFrame:
+    """Read a CSV as untouched strings so rewriting it is byte-stable."""
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def normalize_notable_votes(notable_df: pd.DataFrame, votes_df: pd.DataFrame) -> pd.DataFrame:
+    """Split the wide notable-votes table into its fact table.
+
+    Raises ValueError if a row references a vote missing from the catalog,
+    or if its repeated vote columns disagree with the catalog, since those
+    values would be lost.
+    """
+    catalog = votes_df.set_index('vote_id')
+    positions = catalog.index.get_indexer(notable_df['vote_id'])
+    if (positions < 0).any():
+        missing = notable_df.loc[positions < 0, 'vote_id'].unique()
+        raise ValueError(f"{len(missing)} notable votes are not in the catalog: {list(missing[:5])}")
+
+    joined = catalog[VOTE_COLUMNS].take(positions).reset_index(drop=True)
+    for column in VOTE_COLUMNS:
+        differs = notable_df[column].reset_index(drop=True).astype(str) != joined[column].astype(str)
+        if differs.any():
+            raise ValueError(f"{int(differs.sum())} notable rows disagree with the catalog on {column}")
+
+    return notable_df[FACT_COLUMNS].reset_index(drop=True)
+
+
+def notable_votes_wide(facts_df: pd.DataFrame, votes_df: pd.DataFrame) -> pd.DataFrame:
+    """Rebuild the wide notable-votes view from the fact and vote tables."""
+    catalog = votes_df.set_index('vote_id')
+    positions = catalog.index.get_indexer(facts_df['vote_id'])
+    if (positions < 0).any():
+        raise ValueError("Fact table references votes missing from the catalog")
+
+    wide = catalog[VOTE_COLUMNS].take(positions).reset_index(drop=True)
+    for column in FACT_COLUMNS:
+        wide[column] = facts_df[column].reset_index(drop=True)
+    return wide[WIDE_COLUMNS]
+
+
+def normalize():
+    """Write the fact table from the current wide notable-votes CSV."""
+    facts = normalize_notable_votes(read_raw(NOTABLE_FILE), read_raw(VOTES_FILE))
+    write_csv_atomic(facts, POSITIONS_FILE)
+    return facts
+
+
+def materialize():
+    """Regenerate the wide notable-votes CSV from the fact table and catalog."""
+    wide = notable_votes_wide(read_raw(POSITIONS_FILE), read_raw(VOTES_FILE))
+    write_csv_atomic(wide, NOTABLE_FILE)
+    return wide
+
+
+def main(argv: List[str]):
+    if argv and argv[0] == 'normalize':
+        facts = normalize()
+        size = os.path.getsize(POSITIONS_FILE) / 1024
+        print(f"✅ {len(facts)} positions saved to {POSITIONS_FILE} ({size:.0f} KiB)")
+    elif argv and argv[0] == 'materialize':
+        wide = materialize()
+        print(f"✅ {len(wide)} notable votes rebuilt into {NOTABLE_FILE}")
+    else:
+        print("Usage: python notable_votes_store.py normalize|materialize")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+On-disk outbox spool for email campaigns.
+
+Stage one renders every message of a campaign to a MIME .eml file under
+outbox/<campaign>/, building the MIME text on a process pool. Each file is
+named after the MEP and a hash of the message inputs (sender, recipient,
+subject, body), so a re-run only rebuilds messages whose inputs changed and
+removes stale ones. manifest.csv records the send order.
+
+Stage two streams the spool to SMTP through the mail dispatcher, reading one
+file at a time, so rendering never waits on a slow server and vice versa.
+
+    python outbox.py render <campaign>
+    python outbox.py send <campaign>
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from ballot_matrix import replace_atomic, write_csv_atomic
+from campaign_engine import load_campaign, load_mep_data
+from instrumentation import profile_from_argv, span
+from mail_dispatcher import Email, build_mime, dispatch_emails, load_email_config
+from send_journal import hash_message
+from smtp_pool import smtp_settings
+
+OUTBOX_DIR = 'outbox'
+MANIFEST_FILE = 'manifest.csv'
+
+
+def spool_dir(campaign: str) -> str:
+    return os.path.join(OUTBOX_DIR, campaign)
+
+
+def _write_message(job: Tuple[str, str, str, str, str]) -> str:
+    """Process-pool worker: build one MIME message and write it atomically."""
+    path, from_email, to_email, subject, body = job
+
+    def write(tmp):
+        with open(tmp, 'w', encoding='utf-8', newline='') as f:
+            f.write(build_mime(from_email, to_email, subject, body))
+    replace_atomic(path, write)
+    return path
+
+
+@span('render_outbox')
+def render_outbox(campaign_name: str, from_email: str, filters: Optional[Dict] = None,
+                  workers: Optional[int] = None) -> Dict[str, int]:
+    """Render a campaign into its spool; returns rendered/reused/removed counts."""
+    campaign = load_campaign(campaign_name)
+    directory = spool_dir(campaign_name)
+    os.makedirs(directory, exist_ok=True)
+
+    emails = list(campaign.emails(campaign.select(load_mep_data(), filters)))
+    existing = {f for f in os.listdir(directory) if f.endswith('.eml')}
+
+    manifest, jobs = [], []
+    for email in emails:
+        filename = f"{email.context['mep_id']}-{hash_message(from_email, email.to_email, email.subject, email.body)}.eml"
+        manifest.append((email.context['mep_id'], email.to_email, email.subject,
+                         hash_message(email.to_email, email.subject, email.body), filename))
+        if filename not in existing:
+            jobs.append((os.path.join(directory, filename), from_email,
+                         email.to_email, email.subject, email.body))
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for _ in pool.map(_write_message, jobs, chunksize=max(1, len(jobs) // 32)):
+                pass
+
+    wanted = {row[-1] for row in manifest}
+    stale = existing - wanted
+    for filename in stale:
+        os.remove(os.path.join(directory, filename))
+
+    write_csv_atomic(pd.DataFrame(manifest, columns=['mep_id', 'to_email', 'subject', 'content_hash', 'file']),
+                     os.path.join(directory, MANIFEST_FILE))
+
+    return {'rendered': len(jobs), 'reused': len(manifest) - len(jobs), 'removed': len(stale)}
+
+
+def spooled_emails(campaign_name: str) -> Iterator[Email]:
+    """Stream a rendered spool in manifest order, one file at a time."""
+    directory = spool_dir(campaign_name)
+    manifest = pd.read_csv(os.path.join(directory, MANIFEST_FILE), dtype=str, keep_default_na=False)
+    for mep_id, to_email, subject, content_hash, filename in manifest.itertuples(index=False):
+        path = os.path.join(directory, filename)
+        with open(path, encoding='utf-8', newline='') as f:
+            raw = f.read()
+        context = {'mep_id': mep_id, 'content_hash': content_hash, 'file': path}
+        yield Email(to_email, subject, '', context, raw=raw)
+
+
+def preview_spooled(email: Email):
+    print(f"TO: {email.to_email} | SUBJECT: {email.subject} | {email.context['file']}")
+
+
+def main(argv: List[str]):
+    if len(argv) < 2 or argv[0] not in ('render', 'send'):
+        print("Usage: python outbox.py render|send <campaign>")
+        return
+
+    config = load_email_config()
+    if argv[0] == 'render':
+        from_email = smtp_settings(config['smtp'])['from_email']
+        counts = render_outbox(argv[1], from_email, config.get('filters', {}))
+        print(f"✅ {spool_dir(argv[1])}: {counts['rendered']} rendered, "
+              f"{counts['reused']} reused, {counts['removed']} stale removed")
+    elif not os.path.exists(os.path.join(spool_dir(argv[1]), MANIFEST_FILE)):
+        print(f"❌ No outbox for {argv[1]}; run: python outbox.py render {argv[1]}")
+    else:
+        stats = dispatch_emails(spooled_emails(argv[1]), config, preview=preview_spooled, campaign=argv[1])
+        print(f"📊 {dict(stats)}")
+
+
+if __name__ == "__main__":
+    main(profile_from_argv(sys.argv[1:]))
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Pivotal absences: close votes that the absent MEPs could have decided.
+
+A vote is pivotal when the MEPs recorded as absent outnumber the votes needed
+to flip it (see votes_to_flip). The margins come from the total_for and
+total_against columns of votes_catalog.csv. The absences come from the
+ballot matrix. Absences per political group and per country
+(data/meps.csv) are one matrix product for all votes at once:
+
+    absent_by_group = one_hot(group, MEP) @ absent(MEP, vote)
+
+The product runs in blocks of BLOCK_VOTES columns, so multi-term catalogs
+stay within memory. A group or country "could flip" a vote when its own
+absentees alone reach votes_to_flip.
+
+    python pivotal_absences.py [--top 20]
+"""
+
+import os
+import sys
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ballot_matrix import ABSENT, BALLOTS_DIR, MATRIX_FILE, BallotMatrix
+from datasets import load_meps, load_votes
+from instrumentation import profile_from_argv, span
+
+PIVOTAL_VOTES_FILE = 'data/pivotal_absences.csv'
+PIVOTAL_MEMBERS_FILE = 'data/pivotal_absences_by_member.csv'
+# meps.csv columns absences are broken down by
+DIMENSIONS = ('party', 'country')
+BLOCK_VOTES = 5000
+
+
+def votes_to_flip(total_for: np.ndarray, total_against: np.ndarray) -> np.ndarray:
+    """Extra ballots on the losing side that change the outcome.
+
+    A tie rejects, so an adopted text flips at `margin` extra votes against
+    and a rejected one needs `margin + 1` extra votes for.
+    """
+    margin = np.abs(total_for - total_against)
+    return np.where(total_for > total_against, margin, margin + 1)
+
+
+def one_hot(labels: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """(labels x MEPs) float32 indicator matrix and its row labels."""
+    codes, uniques = pd.factorize(labels.fillna('Unknown'), sort=True)
+    indicator = np.zeros((len(uniques), len(labels)), dtype=np.float32)
+    indicator[codes, np.arange(len(labels))] = 1
+    return indicator, pd.Index(uniques)
+
+
+def absences_by(matrix: BallotMatrix, indicators: Dict[str, np.ndarray]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Absent MEPs per vote, overall and per label of each indicator matrix."""
+    n_votes = matrix.shape[1]
+    total = np.empty(n_votes, dtype=np.int32)
+    by = {name: np.empty((len(indicator), n_votes), dtype=np.int32) for name, indicator in indicators.items()}
+    for start in range(0, n_votes, BLOCK_VOTES):
+        cols = slice(start, min(start + BLOCK_VOTES, n_votes))
+        # float32 products are exact for counts far beyond any parliament size
+        absent = (np.asarray(matrix.codes[:, cols]) == ABSENT).astype(np.float32)
+        total[cols] = absent.sum(axis=0)
+        for name, indicator in indicators.items():
+            by[name][:, cols] = indicator @ absent
+    return total, by
+
+
+def mep_labels(matrix: BallotMatrix, meps_df: pd.DataFrame) -> pd.DataFrame:
+    """Group and country of every ballot matrix row, by mep_id."""
+    meps = meps_df.dropna(subset=['mep_id']).drop_duplicates('mep_id').set_index('mep_id')
+    return pd.DataFrame({
+        dimension: matrix.meps['mep_id'].map(meps[dimension].astype(str)).to_numpy(dtype=object)
+        for dimension in DIMENSIONS
+    })
+
+
+def pivotal_absences(matrix: BallotMatrix, votes_df: pd.DataFrame,
+                     meps_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Pivotal votes, and the group/country absences on each of them."""
+    votes = votes_df.set_index('vote_id').reindex(matrix.votes['vote_id'])
+    known = votes['total_for'].notna().to_numpy()
+    total_for = votes['total_for'].fillna(0).to_numpy(dtype=np.int64)
+    total_against = votes['total_against'].fillna(0).to_numpy(dtype=np.int64)
+    to_flip = votes_to_flip(total_for, total_against)
+
+    labels = mep_labels(matrix, meps_df)
+    indicators, names = {}, {}
+    for dimension in DIMENSIONS:
+        indicators[dimension], names[dimension] = one_hot(labels[dimension])
+    absent, absent_by = absences_by(matrix, indicators)
+
+    pivotal = known & (absent >= to_flip)
+    cols = np.flatnonzero(pivotal)
+
+    members = []
+    for dimension in DIMENSIONS:
+        counts = absent_by[dimension][:, cols]
+        label_idx, which = np.nonzero(counts)
+        members.append(pd.DataFrame({
+            'vote_id': matrix.votes['vote_id'].to_numpy()[cols[which]],
+            'dimension': dimension,
+            'member': names[dimension][label_idx],
+            'absent': counts[label_idx, which],
+            'could_flip': counts[label_idx, which] >= to_flip[cols[which]],
+        }))
+    members = pd.concat(members, ignore_index=True)
+
+    flippers = members[members['could_flip']]
+    could_flip = {
+        dimension: flippers[flippers['dimension'] == dimension].groupby('vote_id')['member'].agg('; '.join)
+        for dimension in DIMENSIONS
+    }
+    pivotal_votes = pd.DataFrame({
+        'vote_id': matrix.votes['vote_id'].to_numpy()[cols],
+        'vote_date': matrix.votes['vote_date'].to_numpy()[cols],
+        'title': votes['title'].to_numpy()[cols],
+        'result': votes['result'].astype(str).to_numpy()[cols],
+        'total_for': total_for[cols],
+        'total_against': total_against[cols],
+        'votes_to_flip': to_flip[cols],
+        'absent': absent[cols],
+    })
+    for dimension in DIMENSIONS:
+        pivotal_votes[f'{dimension}_could_flip'] = pivotal_votes['vote_id'].map(could_flip[dimension]).fillna('')
+    return pivotal_votes, members
+
+
+def main(argv: List[str]):
+    top = int(argv[argv.index('--top') + 1]) if '--top' in argv else 20
+
+    if not os.path.exists(os.path.join(BALLOTS_DIR, MATRIX_FILE)):
+        print("❌ No ballot matrix yet; build it with: python ballot_matrix.py build <ballots.csv>")
+        return
+
+    matrix = BallotMatrix.load()
+    with span('pivotal_absences', rows=matrix.shape[1]):
+        pivotal_votes, members = pivotal_absences(matrix, load_votes(), load_meps())
+    with span('write_pivotal_absences', rows=len(members)):
+        pivotal_votes.to_csv(PIVOTAL_VOTES_FILE, index=False)
+        members.to_csv(PIVOTAL_MEMBERS_FILE, index=False)
+
+    print(f"✅ {len(pivotal_votes)} of {matrix.shape[1]} votes had more absentees than it took to flip them")
+    closest = pivotal_votes.sort_values(['votes_to_flip', 'vote_date'], kind='stable')
+    for _, vote in closest.head(top).iterrows():
+        print(f"  {vote['vote_date']}: Vote {vote['vote_id']} {vote['result']} "
+              f"{vote['total_for']}-{vote['total_against']}, {vote['absent']} absent "
+              f"({vote['votes_to_flip']} would flip) - {str(vote['title'])[:60]}")
+        for dimension in DIMENSIONS:
+            if vote[f'{dimension}_could_flip']:
+                print(f"    {dimension} absences alone could flip it: {vote[f'{dimension}_could_flip']}")
+
+    flippers = members[members['could_flip']]
+    for dimension in DIMENSIONS:
+        counts = flippers[flippers['dimension'] == dimension]['member'].value_counts()
+        if len(counts):
+            print(f"\n📊 Votes each {dimension} could have flipped alone:")
+            for member, count in counts.head(10).items():
+                print(f"  {member}: {count}")
+    print(f"\n💾 Saved {PIVOTAL_VOTES_FILE} and {PIVOTAL_MEMBERS_FILE}")
+
+
+if __name__ == "__main__":
+    main(profile_from_argv(sys.argv[1:]))
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Inverted presence index: vote_id -> set of MEP rows that took part.
+
+Each roll-call page (EP RCV XML, HowTheyVote JSON or an HTML page) is read
+once, and every MEP id or name on it is resolved to a row of data/meps.csv
+(the same row order as the ballot matrix). Rows are stored as one packed
+bitset per vote, so "was MEP X present for vote V" is a constant-time bit
+test and one crawl answers it for every MEP.
+
+    python presence_index.py build           # crawl all votes in the catalog
+    python presence_index.py missed <mep_id> # votes a MEP is not recorded in
+"""
+
+import asyncio
+import json
+import os
+import re
+import sys
+from typing import Dict, Iterable, List, Set
+
+import numpy as np
+import pandas as pd
+
+from ballot_matrix import BALLOTS_DIR, replace_atomic, row_lookup
+from datasets import load_meps, load_votes
+
+PRESENCE_FILE = os.path.join(BALLOTS_DIR, 'presence.npz')
+
+# PersId in EP roll-call XML, member profile links in HTML
+PERS_ID_RE = re.compile(r'PersId="(\d+)"')
+PROFILE_LINK_RE = re.compile(r'/meps/[a-z]{2}/(\d+)')
+
+# HowTheyVote marks absent members explicitly
+ABSENT_POSITIONS = {'DID_NOT_VOTE', 'ABSENT'}
+
+
+class PageParser:
+    """Pull every participating MEP row out of a vote page in a single pass."""
+
+    def __init__(self, meps_df: pd.DataFrame):
+        self.row_by_id = row_lookup(meps_df['mep_id'])
+
+        self.row_by_name: Dict[str, int] = {}
+        for row, name in enumerate(meps_df['name']):
+            self.row_by_name.setdefault(name, row)
+        # One alternation over all names, longest first so full names win
+        names = sorted(self.row_by_name, key=len, reverse=True)
+        self.names_re = re.compile('|'.join(re.escape(name) for name in names))
+
+    def _rows_from_ids(self, ids: Iterable) -> Set[int]:
+        return {self.row_by_id[int(i)] for i in ids if int(i) in self.row_by_id}
+
+    def _rows_from_json(self, data: dict) -> Set[int]:
+        ids = [
+            member_vote['member']['id']
+            for member_vote in data.get('member_votes', [])
+            if member_vote.get('position') not in ABSENT_POSITIONS
+        ]
+        return self._rows_from_ids(ids)
+
+    def parse(self, text: str) -> Set[int]:
+        """Rows of all MEPs recorded as voting on this page."""
+        stripped = text.lstrip()
+        if stripped.startswith('{'):
+            try:
+                return self._rows_from_json(json.loads(stripped))
+            except (ValueError, KeyError, TypeError):
+                pass
+
+        ids = PERS_ID_RE.findall(text) or PROFILE_LINK_RE.findall(text)
+        if ids:
+            return self._rows_from_ids(ids)
+
+        return {self.row_by_name[name] for name in self.names_re.findall(text)}
+
+
+class PresenceIndex:
+    """Packed per-vote bitsets over MEP rows."""
+
+    def __init__(self, meps_df: pd.DataFrame, vote_ids: Iterable):
+        self.mep_ids = meps_df['mep_id'].astype('Int64').reset_index(drop=True)
+        self.vote_ids = np.asarray(list(vote_ids))
+        self.vote_cols = {int(v): col for col, v in enumerate(self.vote_ids)}
+        self.row_by_id = row_lookup(self.mep_ids)
+
+        n_bytes = (len(self.mep_ids) + 7) // 8
+        self.bits = np.zeros((len(self.vote_ids), n_bytes), dtype=np.uint8)
+        # Votes whose page has been parsed; unparsed votes answer nothing
+        self.indexed = np.zeros(len(self.vote_ids), dtype=bool)
+
+    def add(self, vote_id, rows: Iterable[int]):
+        """Record the MEP rows present for one vote."""
+        col = self.vote_cols[int(vote_id)]
+        present = np.zeros(len(self.mep_ids), dtype=bool)
+        present[list(rows)] = True
+        self.bits[col] = np.packbits(present)
+        self.indexed[col] = True
+
+    def is_present(self, vote_id, mep_id) -> bool:
+        row = self.row_by_id[int(mep_id)]
+        byte = self.bits[self.vote_cols[int(vote_id)], row >> 3]
+        return bool((byte >> (7 - (row & 7))) & 1)
+
+    def present_rows(self, vote_id) -> np.ndarray:
+        col = self.vote_cols[int(vote_id)]
+        return np.flatnonzero(np.unpackbits(self.bits[col], count=len(self.mep_ids)))
+
+    def missed_votes(self, mep_id) -> List[int]:
+        """Indexed votes in which the MEP does not appear."""
+        row = self.row_by_id[int(mep_id)]
+        present = (self.bits[:, row >> 3] >> (7 - (row & 7))) & 1
+        return self.vote_ids[self.indexed & (present == 0)].tolist()
+
+    def save(self, path: str = PRESENCE_FILE):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        def write(tmp):
+            with open(tmp, 'wb') as f:
+                np.savez_compressed(f, vote_ids=self.vote_ids, bits=self.bits, indexed=self.indexed,
+                                    mep_ids=self.mep_ids.fillna(-1).to_numpy(dtype=np.int64))
+        replace_atomic(path, write)
+
+    @classmethod
+    def load(cls, meps_df: pd.DataFrame, path: str = PRESENCE_FILE) -> 'PresenceIndex':
+        data = np.load(path)
+        index = cls(meps_df, data['vote_ids'])
+        if len(data['mep_ids']) != len(index.mep_ids):
+            raise ValueError(f"{path} was built for a different meps.csv; rebuild it")
+        index.bits = data['bits']
+        index.indexed = data['indexed']
+        return index
+
+
+def crawl_presence(vote_ids: Iterable, meps_df: pd.DataFrame, **fetcher_options) -> PresenceIndex:
+    """Fetch every vote page once and index who was present."""
+    from vote_fetcher import VotePageFetcher
+
+    vote_ids = list(vote_ids)
+    parser = PageParser(meps_df)
+    index = PresenceIndex(meps_df, vote_ids)
+
+    def record(vote_id, text):
+        index.add(vote_id, parser.parse(text))
+        return False
+
+    with VotePageFetcher(**fetcher_options) as fetcher:
+        asyncio.run(fetcher.scan(vote_ids, record))
+        print(f"HTTP cache: {fetcher.http.stats()}")
+    return index
+
+
+def main(argv: List[str]):
+    """Build or query the presence index from the command line."""
+    meps_df = load_meps()
+
+    if argv and argv[0] == 'build':
+        votes_df = load_votes()
+        index = crawl_presence(votes_df['vote_id'], meps_df)
+        index.save()
+        print(f"✅ Indexed {int(index.indexed.sum())}/{len(index.vote_ids)} votes into {PRESENCE_FILE}")
+    elif len(argv) >= 2 and argv[0] == 'missed':
+        index = PresenceIndex.load(meps_df)
+        missed = index.missed_votes(int(argv[1]))
+        print(f"MEP {argv[1]} is missing from {len(missed)} indexed votes:")
+        for vote_id in missed:
+            print(f"  Vote {vote_id}")
+    else:
+        print("Usage: python presence_index.py build")
+        print("       python presence_index.py missed <mep_id>")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
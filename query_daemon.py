@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Resident query daemon that keeps the datasets hot in memory.
+
+The daemon loads meps.csv, meps_attendance.csv, votes_catalog.csv and the
+notable votes (mep_vote_positions.csv joined to the catalog) once, plus the ballot matrix if one has been built. It
+builds plain indexes by meps.csv row and vote_id and answers JSON
+queries over localhost HTTP:
+
+    GET /mep/<name or id>            attendance record
+    GET /mep/<name or id>/notable    notable votes
+    GET /mep/<name or id>/missed     missed votes (needs the ballot matrix)
+    GET /vote/<vote_id>
+    GET /stats
+
+Encoded responses are kept in an LRU cache. A watcher thread polls the files.
+When one changes, a complete new snapshot is built in the background and
+swapped in with a single assignment, and the cache is cleared. A request
+therefore always sees one consistent snapshot.
+
+    python query_daemon.py serve [--port 8765]
+    python query_daemon.py get /mep/Malika%20Sorel/notable
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+DEFAULT_PORT = 8765
+CACHE_SIZE = 4096
+POLL_SECONDS = 2.0
+
+
+def _records(df) -> List[Dict]:
+    """DataFrame rows as JSON-ready dicts (ISO dates, None for missing)."""
+    return json.loads(df.to_json(orient='records', date_format='iso'))
+
+
+class Snapshot:
+    """Immutable, id-keyed view of the datasets at one point in time."""
+
+    def __init__(self):
+        from ballot_matrix import BALLOTS_DIR, MATRIX_FILE, MATRIX_FILES, BallotMatrix
+        from datasets import DATA_DIR, SCHEMAS, load_attendance, load_notable_votes, load_votes
+        from mep_matcher import MEPMatcher
+
+        # Every matrix file is watched, even before it exists, so a later build is picked up
+        # and a poll between the writes of one save() reloads again once the indexes land
+        matrix_path = os.path.join(BALLOTS_DIR, MATRIX_FILE)
+        self.files = [os.path.join(DATA_DIR, SCHEMAS[name]['file'])
+                      for name in ('meps', 'meps_attendance', 'votes_catalog', 'mep_vote_positions')]
+        self.files.extend(os.path.join(BALLOTS_DIR, name) for name in MATRIX_FILES)
+        # Taken before loading, so a file written during the load triggers another reload
+        self.signature = file_signature(self.files)
+
+        self.matcher = MEPMatcher()
+        # By meps.csv row (same row order as meps_attendance.csv): mep_id is not unique
+        self.attendance: List[Dict] = _records(load_attendance())
+
+        self.votes: Dict[int, Dict] = {record['vote_id']: record for record in _records(load_votes())}
+
+        self.notable: Dict[int, List[Dict]] = {}
+        for record in _records(load_notable_votes()):
+            self.notable.setdefault(record['mep_id'], []).append(record)
+
+        self.matrix = BallotMatrix.load() if os.path.exists(matrix_path) else None
+        self.loaded_at = time.time()
+        self.generation = 0
+
+    def mep(self, name_or_id: str):
+        """Matched meps.csv row for a name or id, or None."""
+        return self.matcher.lookup(name_or_id)
+
+    def attendance_record(self, match) -> Optional[Dict]:
+        if match.row < len(self.attendance) and self.attendance[match.row]['name'] == match.name:
+            return self.attendance[match.row]
+        return None
+
+
+def file_signature(paths: List[str]) -> Tuple:
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+class LRUCache:
+    def __init__(self, size: int = CACHE_SIZE):
+        self.size = size
+        self.entries: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class QueryService:
+    """Answers queries against the current snapshot and reloads it on change."""
+
+    def __init__(self, cache_size: int = CACHE_SIZE):
+        self.snapshot = Snapshot()
+        self.snapshot.generation = 1
+        self.cache = LRUCache(cache_size)
+        self.reload_lock = threading.Lock()
+
+    def query(self, path: str) -> Tuple[int, bytes]:
+        """(HTTP status, JSON body) for a request path."""
+        snapshot = self.snapshot
+        key = (snapshot.generation, path)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        status, result = self._answer(snapshot, [unquote(p) for p in path.strip('/').split('/') if p])
+        response = (status, json.dumps(result, ensure_ascii=False).encode('utf-8'))
+        if status == 200 and path != '/stats':
+            self.cache.put(key, response)
+        return response
+
+    def _answer(self, snapshot: Snapshot, parts: List[str]) -> Tuple[int, object]:
+        if parts == ['stats']:
+            return 200, self.stats()
+
+        if len(parts) == 2 and parts[0] == 'vote' and parts[1].isdigit():
+            vote = snapshot.votes.get(int(parts[1]))
+            return (200, vote) if vote else (404, {'error': f"Unknown vote {parts[1]}"})
+
+        if parts and parts[0] == 'mep' and len(parts) in (2, 3):
+            match = snapshot.mep(parts[1])
+            if match is None:
+                return 404, {'error': f"No MEP matches {parts[1]!r}"}
+            if len(parts) == 2:
+                record = snapshot.attendance_record(match)
+                return (200, record) if record else (404, {'error': f"No attendance record for {match.name}"})
+            mep_id = match.mep_id
+            if mep_id is None:
+                return 404, {'error': f"{match.name} has no MEP ID, so their votes cannot be looked up"}
+            if parts[2] == 'notable':
+                return 200, snapshot.notable.get(mep_id, [])
+            if parts[2] == 'missed':
+                if snapshot.matrix is None:
+                    return 404, {'error': "No ballot matrix; build it with ballot_matrix.py"}
+                if mep_id not in snapshot.matrix.mep_rows:
+                    return 404, {'error': f"MEP {mep_id} is not in the ballot matrix"}
+                missed = snapshot.matrix.missed_votes(mep_id)
+                return 200, [snapshot.votes.get(vote_id, {'vote_id': vote_id}) for vote_id in missed]
+
+        return 404, {'error': f"Unknown query /{'/'.join(parts)}"}
+
+    def stats(self) -> Dict:
+        return {
+            'generation': self.snapshot.generation,
+            'loaded_at': self.snapshot.loaded_at,
+            'meps': len(self.snapshot.attendance),
+            'votes': len(self.snapshot.votes),
+            'ballot_matrix': self.snapshot.matrix is not None,
+            'cache_entries': len(self.cache.entries),
+            'cache_hits': self.cache.hits,
+            'cache_misses': self.cache.misses,
+        }
+
+    def reload_if_changed(self) -> bool:
+        """Build a new snapshot if any file changed, then swap it in atomically."""
+        with self.reload_lock:
+            if file_signature(self.snapshot.files) == self.snapshot.signature:
+                return False
+            try:
+                snapshot = Snapshot()
+            except Exception as e:
+                # Half-written file: keep serving the old snapshot, retry next poll
+                print(f"⚠️  Reload failed, keeping generation {self.snapshot.generation}: {e}")
+                return False
+            snapshot.generation = self.snapshot.generation + 1
+            self.snapshot = snapshot
+            self.cache.clear()
+            print(f"🔧 Reloaded datasets (generation {snapshot.generation})")
+            return True
+
+    def watch(self, interval: float = POLL_SECONDS):
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.reload_if_changed()
+        threading.Thread(target=loop, daemon=True).start()
+
+
+def make_handler(service: QueryService):
+    class QueryHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status, body = service.query(self.path.split('?')[0])
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return QueryHandler
+
+
+def serve(port: int = DEFAULT_PORT):
+    start = time.perf_counter()
+    service = QueryService()
+    print(f"✅ Loaded datasets in {(time.perf_counter() - start) * 1000:.0f} ms")
+    service.watch()
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(service))
+    print(f"📊 Serving on http://127.0.0.1:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+def get(path: str, port: int = DEFAULT_PORT) -> str:
+    """Query a running daemon (stdlib only, so it starts fast)."""
+    from urllib.error import HTTPError
+    from urllib.request import urlopen
+
+    try:
+        with urlopen(f"http://127.0.0.1:{port}{path}") as response:
+            return response.read().decode('utf-8')
+    except HTTPError as e:
+        return e.read().decode('utf-8')
+
+
+def main(argv: List[str]):
+    port = int(argv[argv.index('--port') + 1]) if '--port' in argv else DEFAULT_PORT
+    if argv and argv[0] == 'serve':
+        serve(port)
+    elif len(argv) >= 2 and argv[0] == 'get':
+        print(get(argv[1], port))
+    else:
+        print("Usage: python query_daemon.py serve [--port N]")
+        print("       python query_daemon.py get /mep/<name or id>[/notable|/missed] [--port N]")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
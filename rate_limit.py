@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Asyncio token-bucket rate limiter shared by the fetch and mail scripts.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Allow at most `rate` acquisitions per second, with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        # Waiters queue on the lock, so tokens are handed out in FIFO order
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until `tokens` are available and take them."""
+        async with self._lock:
+            self._refill()
+            while self.tokens < tokens:
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= tokens
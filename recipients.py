@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Recipient selection from the email_config.json filters.
+
+Each configured filter compiles to one boolean column over
+meps_attendance.csv. The columns are combined into a single mask, so the
+recipient set, and how many MEPs each filter excluded, are known before
+anything is rendered. Campaign files can add or tighten filters (e.g.
+positive.json sets min_attendance_threshold to 80).
+
+    python recipients.py [campaign]
+"""
+
+import sys
+from typing import Callable, Dict, List, Tuple
+
+import pandas as pd
+
+from instrumentation import profile_from_argv, span
+
+# name -> (config key, mask of rows the filter EXCLUDES given the config value)
+FILTERS: Dict[str, Tuple[str, Callable[[pd.DataFrame, object], pd.Series]]] = {
+    'missing_data': (None, lambda df, _: df['mep_id'].isna() | df['attendance_pct'].isna()),
+    'sick_leave': ('skip_sick_leave', lambda df, skip: df['sick_leave'].astype(bool) & bool(skip)),
+    'special_role': ('skip_special_roles', lambda df, skip:
+                     df['special_role'].fillna('').astype(str).str.strip().ne('') & bool(skip)),
+    'partial_term': ('skip_partial_term', lambda df, skip: df['partial_term'].astype(bool) & bool(skip)),
+    'below_min_attendance': ('min_attendance_threshold', lambda df, minimum: df['attendance_pct'] < minimum),
+    'above_max_attendance': ('max_attendance_threshold', lambda df, maximum: df['attendance_pct'] > maximum),
+}
+
+
+# How a campaign's value combines with the config's: the stricter one wins
+TIGHTEN: Dict[str, Callable[[object, object], object]] = {
+    'skip_sick_leave': lambda a, b: bool(a) or bool(b),
+    'skip_special_roles': lambda a, b: bool(a) or bool(b),
+    'skip_partial_term': lambda a, b: bool(a) or bool(b),
+    'min_attendance_threshold': max,
+    'max_attendance_threshold': min,
+}
+
+
+def _unset(value) -> bool:
+    # Not `value in (None, False)`: that also matches 0, a valid attendance threshold
+    return value is None or value is False
+
+
+def combine_filters(filters: Dict, extra: Dict) -> Dict:
+    """Config filters tightened by a campaign's; a campaign can never loosen a config value."""
+    combined = dict(filters)
+    for key, value in extra.items():
+        current = combined.get(key)
+        if _unset(current) or key not in TIGHTEN:
+            combined[key] = value
+        elif not _unset(value):
+            combined[key] = TIGHTEN[key](current, value)
+    return combined
+
+
+def compile_filters(filters: Dict) -> Dict[str, Callable[[pd.DataFrame], pd.Series]]:
+    """The exclusion masks that apply under a filters config block."""
+    compiled = {}
+    for name, (key, exclude) in FILTERS.items():
+        if key is None:
+            compiled[name] = lambda df, exclude=exclude: exclude(df, None)
+        elif not _unset(filters.get(key)):
+            compiled[name] = lambda df, exclude=exclude, value=filters[key]: exclude(df, value)
+    return compiled
+
+
+def select_recipients(df: pd.DataFrame, filters: Dict) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """Apply the filters in one mask; returns (recipients, excluded count per filter).
+
+    Counts are per filter, so an MEP excluded by two filters is counted by both.
+    """
+    with span('select_recipients', rows=len(df)):
+        excluded = pd.Series(False, index=df.index)
+        counts = {}
+        for name, exclude in compile_filters(filters).items():
+            mask = exclude(df).fillna(False).astype(bool)
+            counts[name] = int(mask.sum())
+            excluded |= mask
+        return df[~excluded].copy(), counts
+
+
+def main(argv: List[str]):
+    from campaign_engine import load_campaign, load_mep_data
+    from mail_dispatcher import load_email_config
+
+    filters = load_email_config().get('filters', {})
+    if argv:
+        filters = combine_filters(filters, load_campaign(argv[0]).filters)
+
+    meps_df = load_mep_data()
+    recipients, counts = select_recipients(meps_df, filters)
+    print(f"📊 {len(recipients)} of {len(meps_df)} MEPs selected")
+    for name, count in counts.items():
+        print(f"- excluded by {name}: {count}")
+
+
+if __name__ == "__main__":
+    main(profile_from_argv(sys.argv[1:]))
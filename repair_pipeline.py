@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Single-pass data-repair pipeline for the data/*.csv files.
+
+Each repair is a stage registered for one dataset with @repair_stage. A stage
+takes the whole DataFrame (read as raw strings, so untouched cells are
+written back byte for byte) and returns the repaired DataFrame using column
+operations, never row loops. For every dataset, all of its stages run over
+one read, and the result is written once with an atomic rename. A changed-row
+count is reported for each stage.
+
+    python repair_pipeline.py              # run every registered stage
+    python repair_pipeline.py countries    # run selected stages only
+    python repair_pipeline.py --dry-run
+"""
+
+import os
+import sys
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import pandas as pd
+
+from ballot_matrix import write_csv_atomic
+from datasets import DATA_DIR, SCHEMAS
+from instrumentation import profile_from_argv, span
+
+
+class RepairStage(NamedTuple):
+    name: str
+    dataset: str
+    func: Callable[[pd.DataFrame], pd.DataFrame]
+
+
+STAGES: List[RepairStage] = []
+
+
+def repair_stage(dataset: str, name: Optional[str] = None):
+    """Register a vectorized repair for a dataset (see datasets.SCHEMAS)."""
+    def register(func):
+        STAGES.append(RepairStage(name or func.__name__, dataset, func))
+        return func
+    return register
+
+
+def read_raw(path: str) -> pd.DataFrame:
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def line_terminator(path: str) -> str:
+    """Keep each file's line endings (meps*.csv use CRLF)."""
+    with open(path, 'rb') as f:
+        return '\r\n' if f.readline().endswith(b'\r\n') else '\n'
+
+
+def changed_rows(before: pd.DataFrame, after: pd.DataFrame) -> pd.Series:
+    return before.ne(after).any(axis=1)
+
+
+@span('repair_pipeline')
+def run_pipeline(stage_names: Optional[Iterable[str]] = None,
+                 dry_run: bool = False,
+                 verbose: bool = True,
+                 stage_options: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict[str, int]]:
+    """Run the selected stages, one read and one write per dataset.
+
+    stage_options maps a stage name to keyword arguments for its function.
+    Returns {dataset: {stage: changed_rows}}.
+    """
+    stage_options = stage_options or {}
+    selected = [s for s in STAGES if stage_names is None or s.name in set(stage_names)]
+    report: Dict[str, Dict[str, int]] = {}
+
+    for dataset in dict.fromkeys(s.dataset for s in selected):
+        path = os.path.join(DATA_DIR, SCHEMAS[dataset]['file'])
+        with span(f'read:{dataset}') as stage:
+            df = read_raw(path)
+            stage.rows = len(df)
+        original = df
+        report[dataset] = {}
+        for stage in (s for s in selected if s.dataset == dataset):
+            with span(f'stage:{stage.name}', rows=len(df)):
+                repaired = stage.func(df.copy(), **stage_options.get(stage.name, {}))
+                changed = changed_rows(df, repaired)
+            report[dataset][stage.name] = int(changed.sum())
+
+            if verbose:
+                print(f"🔧 {dataset}/{stage.name}: {int(changed.sum())} rows changed")
+                for index in changed[changed].index[:3]:
+                    columns = df.columns[df.loc[index].ne(repaired.loc[index])]
+                    for column in columns:
+                        print(f"   ✅ row {index} {column}: {df.at[index, column]} → {repaired.at[index, column]}")
+            df = repaired
+
+        if not dry_run and changed_rows(original, df).any():
+            with span(f'write:{dataset}', rows=len(df)):
+                write_csv_atomic(df, path, line_terminator(path))
+            if verbose:
+                print(f"💾 Saved {path}")
+
+    if not dry_run and report.get('votes_catalog') and any(report['votes_catalog'].values()) \
+            and os.path.exists(os.path.join(DATA_DIR, SCHEMAS['mep_notable_votes']['file'])):
+        # A generated mep_notable_votes.csv is a view over the catalog; rebuild it once
+        from notable_votes_store import materialize
+        with span('materialize_notable_votes'):
+            materialize()
+        if verbose:
+            print("💾 Rebuilt data/mep_notable_votes.csv from the catalog")
+
+    return report
+
+
+@repair_stage('meps', name='countries')
+def fix_countries(df: pd.DataFrame) -> pd.DataFrame:
+    """Map birth countries to the EU country each MEP represents."""
+    from fix_countries import COUNTRY_MAPPINGS
+
+    direct = {k: v for k, v in COUNTRY_MAPPINGS.items() if isinstance(v, str)}
+    by_name = {
+        (country, name): target
+        for country, names in COUNTRY_MAPPINGS.items() if isinstance(names, dict)
+        for name, target in names.items()
+    }
+
+    keys = pd.MultiIndex.from_arrays([df['country'], df['name']])
+    specific = pd.Series(keys.map(by_name.get), index=df.index)
+    unmapped = df['country'].isin({c for c, _ in by_name}) & specific.isna()
+    for _, row in df[unmapped].iterrows():
+        print(f"⚠️  {row['name']}: No mapping found for {row['country']}")
+
+    df['country'] = specific.fillna(df['country'].map(direct)).fillna(df['country'])
+    return df
+
+
+@repair_stage('votes_catalog', name='vote_urls')
+def fix_vote_urls(df: pd.DataFrame, default_year: Optional[int] = None) -> pd.DataFrame:
+    """Turn XML vote record URLs into web interface URLs.
+
+    default_year is used for rows without a parseable vote_date
+    (vote_urls.DEFAULT_URL_YEAR if not given).
+    """
+    from vote_urls import DEFAULT_URL_YEAR, convert_vote_urls
+
+    df['source_url'] = convert_vote_urls(df['source_url'], df['vote_date'],
+                                         default_year if default_year is not None else DEFAULT_URL_YEAR)
+    return df
+
+
+def main(argv: List[str]):
+    dry_run = '--dry-run' in argv
+    stage_names = [a for a in argv if not a.startswith('--')] or None
+    report = run_pipeline(stage_names, dry_run=dry_run)
+
+    print(f"\n📊 Summary{' (dry run)' if dry_run else ''}:")
+    for dataset, stages in report.items():
+        for stage, count in stages.items():
+            print(f"- {dataset}/{stage}: {count} rows changed")
+
+
+if __name__ == "__main__":
+    main(profile_from_argv(sys.argv[1:]))
@@ -142,23 +142,26 @@ function convertData() {
     source_url: normalizeText(vote.source_url),
   }));
   
-  // Convert notable votes
-  const notableRaw = loadCSV(path.join(dataDir, 'mep_notable_votes.csv'));
-  console.log(`📊 Loaded ${notableRaw.length} notable vote records`);
-  
-  const notableVotes = notableRaw.map(vote => ({
-    mep_id: String(vote.mep_id).replace(/\.0+$/, ''),
-    vote_id: String(vote.vote_id),
-    vote_date: normalizeText(vote.vote_date),
-    title: normalizeText(vote.title),
-    result: normalizeText(vote.result),
-    olp_stage: normalizeText(vote.olp_stage),
-    total_for: coerceNumber(vote.total_for),
-    total_against: coerceNumber(vote.total_against),
-    total_abstain: coerceNumber(vote.total_abstain),
-    source_url: normalizeText(vote.source_url),
-    vote_position: vote.vote_position,
-  }));
+  // Convert notable votes: positions are stored once and joined to the catalog
+  const positionsRaw = loadCSV(path.join(dataDir, 'mep_vote_positions.csv'));
+  console.log(`📊 Loaded ${positionsRaw.length} notable vote records`);
+  
+  const votesById = new Map(votesCatalog.map(vote => [vote.vote_id, vote]));
+  const notableVotes = positionsRaw
+    .filter(position => {
+      if (votesById.has(String(position.vote_id))) return true;
+      console.warn(`Notable vote ${position.vote_id} is not in the votes catalog`);
+      return false;
+    })
+    .map(position => {
+      const { vote_id, ...vote } = votesById.get(String(position.vote_id));
+      return {
+        mep_id: String(position.mep_id).replace(/\.0+$/, ''),
+        vote_id,
+        ...vote,
+        vote_position: position.vote_position,
+      };
+    });
   
   // Group notable votes by MEP ID
   const notableByMep = {};
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Append-only send journal, so an interrupted campaign resumes where it stopped.
+
+Every successful send appends one tab-separated line:
+
+    sent <campaign> <mep_id> <content hash> <UTC timestamp>
+
+Each line is flushed to the OS straight away, which survives a crash of the
+script. fsync is batched (every `sync_every` records and at the end of each
+dispatcher batch), so a power loss can cost at most that many resends. On
+start the journal is read into a set, so the dispatcher skips a completed
+(campaign, mep_id, content) entry with one O(1) lookup. A changed message
+has a new hash and is sent again.
+
+    python send_journal.py    # sent counts per campaign
+"""
+
+import hashlib
+import os
+import sys
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import List, NamedTuple, Set, Tuple
+
+JOURNAL_FILE = 'outbox/send_journal.tsv'
+
+JournalKey = Tuple[str, str, str]
+
+
+def hash_message(*parts: str) -> str:
+    """Short sha256 of message fields; the outbox also hashes the sender."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+
+def content_hash(email: NamedTuple) -> str:
+    """Hash of recipient, subject and body (as_string() is not stable: MIME boundaries are random).
+
+    Spooled emails carry no body, so the outbox stores the hash in their context.
+    """
+    if email.context and 'content_hash' in email.context:
+        return email.context['content_hash']
+    return hash_message(email.to_email, email.subject, email.body)
+
+
+def journal_key(campaign: str, email: NamedTuple) -> JournalKey:
+    """Key of a mail_dispatcher.Email; its context must carry the mep_id."""
+    return campaign, str(email.context['mep_id']), content_hash(email)
+
+
+class SendJournal:
+    """Set of completed sends backed by an append-only file."""
+
+    def __init__(self, path: str = JOURNAL_FILE, sync_every: int = 10):
+        self.path = path
+        self.sync_every = sync_every
+        self.completed: Set[JournalKey] = set()
+        self.pending = 0
+        self.lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    fields = line.rstrip('\n').split('\t')
+                    # A torn last line from a crash has no newline; ignore it
+                    if line.endswith('\n') and len(fields) == 5 and fields[0] == 'sent':
+                        self.completed.add((fields[1], fields[2], fields[3]))
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def __contains__(self, key: JournalKey) -> bool:
+        return key in self.completed
+
+    def __len__(self) -> int:
+        return len(self.completed)
+
+    def record(self, key: JournalKey):
+        timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        with self.lock:
+            self.file.write('\t'.join(('sent', *key, timestamp)) + '\n')
+            self.file.flush()
+            self.completed.add(key)
+            self.pending += 1
+            if self.pending >= self.sync_every:
+                self._sync()
+
+    def _sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending = 0
+
+    def sync(self):
+        with self.lock:
+            if self.pending:
+                self._sync()
+
+    def close(self):
+        self.sync()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv: List[str]):
+    if not os.path.exists(JOURNAL_FILE):
+        print(f"No journal yet at {JOURNAL_FILE}")
+        return
+    with SendJournal() as journal:
+        counts = Counter(campaign for campaign, _, _ in journal.completed)
+    for campaign, count in sorted(counts.items()):
+        if not argv or campaign in argv:
+            print(f"📊 {campaign}: {count} emails sent")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
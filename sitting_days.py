@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Sitting-day index over the ballot matrix and per-day participation counts.
+
+The ballot matrix columns are in chronological order, so every sitting day is
+one contiguous column range. SittingDays maps each day to its
+[first_col, end_col) range. Participation holds, for every MEP and sitting
+day, the ballots cast and the votes missed. They are stored as one
+(2, MEPs, days) uint16 array, so a day's column or an MEP's row is a plain
+slice:
+
+    participation.absent[row]          # votes missed per day by one MEP
+    participation.cast[:, day_index]   # ballots cast per MEP on one day
+
+Both are saved next to the ballot matrix and rebuilt when the matrix is newer.
+
+    python sitting_days.py             # (re)build and list the sitting days
+    python sitting_days.py <mep>       # the days an MEP missed votes
+"""
+
+import os
+import sys
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ballot_matrix import (ABSENT, BALLOTS_DIR, MATRIX_FILE, MEP_INDEX_FILE, BallotMatrix,
+                           row_lookup, save_npy_atomic, write_csv_atomic)
+from instrumentation import profile_from_argv, span
+
+SITTING_DAYS_FILE = 'sitting_days.csv'
+PARTICIPATION_FILE = 'participation.npy'
+# Columns per reduceat block when counting whole days at once
+BLOCK_VOTES = 5000
+
+
+class SittingDays:
+    """Sitting days of chronologically ordered votes and their column ranges."""
+
+    def __init__(self, days: np.ndarray, starts: np.ndarray, n_votes: int):
+        self.days = days
+        self.starts = starts
+        self.ends = np.append(starts[1:], n_votes).astype(starts.dtype)
+
+    @classmethod
+    def from_dates(cls, vote_dates: pd.Series) -> 'SittingDays':
+        """Sitting days of vote dates given in column order.
+
+        Raises ValueError if the dates are not chronological, since a day's
+        votes would then not be one contiguous column range.
+        """
+        days = pd.to_datetime(vote_dates).dt.normalize().to_numpy('datetime64[ns]')
+        if (np.diff(days) < np.timedelta64(0, 'ns')).any():
+            raise ValueError("vote dates must be in chronological order")
+        unique_days, starts = np.unique(days, return_index=True)
+        return cls(unique_days, starts, len(days))
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    @property
+    def votes(self) -> np.ndarray:
+        """Votes held on each sitting day."""
+        return self.ends - self.starts
+
+    def day_of_col(self) -> np.ndarray:
+        """Sitting-day index of every vote column."""
+        return np.repeat(np.arange(len(self.days)), self.votes)
+
+    def index(self, day) -> int:
+        day = np.datetime64(pd.Timestamp(day).normalize(), 'ns')
+        position = int(np.searchsorted(self.days, day))
+        if position == len(self.days) or self.days[position] != day:
+            raise KeyError(f"{day} is not a sitting day")
+        return position
+
+    def columns(self, day) -> slice:
+        """Vote columns of one sitting day."""
+        position = self.index(day)
+        return slice(int(self.starts[position]), int(self.ends[position]))
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            'day': self.days,
+            'first_col': self.starts,
+            'end_col': self.ends,
+            'votes': self.votes,
+        })
+
+
+def day_counts(codes: np.ndarray, starts: np.ndarray, end: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-MEP ballots cast and votes missed (MEPs x days, uint16) for days starting at `starts`."""
+    cast = np.empty((codes.shape[0], len(starts)), dtype=np.uint16)
+    absent = np.empty_like(cast)
+    bounds = np.append(starts, end)
+    first = 0
+    while first < len(starts):
+        # Whole days per block, so memory stays bounded on multi-term matrices
+        last = max(first + 1, int(np.searchsorted(bounds, bounds[first] + BLOCK_VOTES, side='right')) - 1)
+        last = min(last, len(starts))
+        block = np.asarray(codes[:, bounds[first]:bounds[last]])
+        offsets = starts[first:last] - bounds[first]
+        cast[:, first:last] = np.add.reduceat((block > ABSENT).astype(np.uint16), offsets, axis=1)
+        absent[:, first:last] = np.add.reduceat((block == ABSENT).astype(np.uint16), offsets, axis=1)
+        first = last
+    return cast, absent
+
+
+class Participation:
+    """Ballots cast and votes missed per MEP (rows as in the ballot matrix) and sitting day."""
+
+    def __init__(self, counts: np.ndarray, days: SittingDays, meps: pd.DataFrame):
+        self.counts = counts
+        self.days = days
+        self.meps = meps.reset_index(drop=True)
+        self.mep_rows = row_lookup(self.meps['mep_id'])
+
+    @property
+    def cast(self) -> np.ndarray:
+        return self.counts[0]
+
+    @property
+    def absent(self) -> np.ndarray:
+        return self.counts[1]
+
+    @classmethod
+    def build(cls, matrix: BallotMatrix) -> 'Participation':
+        days = SittingDays.from_dates(matrix.votes['vote_date'])
+        cast, absent = day_counts(matrix.codes, days.starts, matrix.shape[1])
+        return cls(np.stack([cast, absent]), days, matrix.meps)
+
+    def absent_days(self, mep_id: int) -> pd.DataFrame:
+        """Sitting days on which one MEP missed votes, with the day's vote count."""
+        row = self.mep_rows[int(mep_id)]
+        missed = np.flatnonzero(self.absent[row])
+        return pd.DataFrame({
+            'day': self.days.days[missed],
+            'votes': self.days.votes[missed],
+            'cast': self.cast[row, missed],
+            'absent': self.absent[row, missed],
+        })
+
+    def save(self, directory: str = BALLOTS_DIR):
+        """Replace the saved counts atomically; readers may hold them memory-mapped."""
+        save_npy_atomic(np.ascontiguousarray(self.counts), os.path.join(directory, PARTICIPATION_FILE))
+        write_csv_atomic(self.days.frame(), os.path.join(directory, SITTING_DAYS_FILE))
+
+    @classmethod
+    def load(cls, directory: str = BALLOTS_DIR, mmap: bool = True) -> 'Participation':
+        counts = np.load(os.path.join(directory, PARTICIPATION_FILE), mmap_mode='r' if mmap else None)
+        frame = pd.read_csv(os.path.join(directory, SITTING_DAYS_FILE), parse_dates=['day'])
+        days = SittingDays(frame['day'].to_numpy('datetime64[ns]'), frame['first_col'].to_numpy(),
+                           int(frame['end_col'].iloc[-1]) if len(frame) else 0)
+        meps = pd.read_csv(os.path.join(directory, MEP_INDEX_FILE), dtype={'mep_id': 'Int64'})
+        return cls(counts, days, meps)
+
+
+def load_participation(directory: str = BALLOTS_DIR, rebuild: bool = False) -> Participation:
+    """Saved participation counts, rebuilt first if the ballot matrix is newer."""
+    saved = os.path.join(directory, PARTICIPATION_FILE)
+    stale = not os.path.exists(saved) or \
+        os.path.getmtime(saved) < os.path.getmtime(os.path.join(directory, MATRIX_FILE))
+    if rebuild or stale:
+        with span('build_participation') as stage:
+            participation = Participation.build(BallotMatrix.load(directory))
+            stage.rows = participation.counts.shape[1]
+            participation.save(directory)
+        return participation
+    return Participation.load(directory)
+
+
+def main(argv: List[str]):
+    if not os.path.exists(os.path.join(BALLOTS_DIR, MATRIX_FILE)):
+        print("❌ No ballot matrix yet; build it with: python ballot_matrix.py build <ballots.csv>")
+        return
+
+    participation = load_participation(rebuild=not argv)
+    days = participation.days
+    if not argv:
+        print(f"✅ {len(days)} sitting days, {int(days.votes.sum())} votes, "
+              f"{participation.counts.shape[1]} MEPs saved to {BALLOTS_DIR}/")
+        for day, votes in zip(days.days[-10:], days.votes[-10:]):
+            print(f"  {str(day)[:10]}: {votes} votes")
+        return
+
+    from mep_matcher import get_matcher
+
+    match = get_matcher().lookup(argv[0])
+    if match is None or match.mep_id not in participation.mep_rows:
+        print(f"❌ No MEP in the ballot matrix matches {argv[0]!r}")
+        return
+    missed = participation.absent_days(match.mep_id)
+    print(f"{match.name} (MEP ID: {match.mep_id}) missed votes on {len(missed)} sitting days:")
+    for _, day in missed.iterrows():
+        print(f"  {str(day['day'])[:10]}: missed {day['absent']} of {day['votes']} votes")
+
+
+if __name__ == "__main__":
+    main(profile_from_argv(sys.argv[1:]))
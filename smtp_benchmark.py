@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark: per-message SMTP connections vs SMTPPool.
+
+Both senders deliver the same messages to a local SMTP sink. The sink is
+aiosmtpd if it is installed, otherwise a small built-in stand-in. --latency
+adds a delay to every server reply to simulate the round-trip to a real
+provider, which is where the per-message EHLO/QUIT handshake gets expensive.
+
+    python smtp_benchmark.py [--messages 200] [--latency 0.02] [--pool-size 2]
+"""
+
+import smtplib
+import socketserver
+import sys
+import threading
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Dict, List
+
+from smtp_pool import SMTPPool
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:
+    Controller = None
+
+
+class SinkHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP server that accepts and discards every message."""
+
+    def reply(self, *lines: str):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.wfile.write(''.join(line + '\r\n' for line in lines).encode())
+
+    def handle(self):
+        self.reply('220 localhost SMTP sink')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].decode(errors='replace').upper()
+            if command == 'EHLO':
+                self.reply('250-localhost', '250 8BITMIME')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                for data_line in iter(self.rfile.readline, b''):
+                    if data_line == b'.\r\n':
+                        break
+                self.server.received += 1
+                self.reply('250 OK')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+class SinkServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(('127.0.0.1', 0), SinkHandler)
+        self.latency = latency
+        self.received = 0
+
+
+def start_sink(latency: float):
+    """Start an SMTP sink; returns (port, stop)."""
+    if Controller is not None and not latency:
+        class Discard:
+            async def handle_DATA(self, server, session, envelope):
+                return '250 OK'
+
+        controller = Controller(Discard(), hostname='127.0.0.1', port=0)
+        controller.start()
+        return controller.port, controller.stop
+
+    server = SinkServer(latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1], server.shutdown
+
+
+def build_messages(count: int) -> List[str]:
+    messages = []
+    for i in range(count):
+        msg = MIMEMultipart()
+        msg['From'] = 'bench@localhost'
+        msg['To'] = f'mep-{i}@localhost'
+        msg['Subject'] = 'Your European Parliament Attendance Record'
+        msg.attach(MIMEText('Dear MEP,\n\n' + 'Attendance statistics.\n' * 40, 'plain', 'utf-8'))
+        messages.append(msg.as_string())
+    return messages
+
+
+def send_per_message(config: Dict, messages: List[str]):
+    """The current behaviour: connect, send and quit for every message."""
+    for i, text in enumerate(messages):
+        server = smtplib.SMTP(config['smtp_server'], config['smtp_port'])
+        server.ehlo()
+        server.sendmail(config['from_email'], f'mep-{i}@localhost', text)
+        server.quit()
+
+
+def send_pooled(config: Dict, messages: List[str], pool_size: int):
+    with SMTPPool(config, size=pool_size) as pool:
+        for i, text in enumerate(messages):
+            pool.sendmail(config['from_email'], f'mep-{i}@localhost', text)
+
+
+def main(argv: List[str]):
+    def option(name, default, cast):
+        return cast(argv[argv.index(name) + 1]) if name in argv else default
+
+    count = option('--messages', 200, int)
+    latency = option('--latency', 0.0, float)
+    pool_size = option('--pool-size', 2, int)
+
+    port, stop = start_sink(latency)
+    config = {'smtp_server': '127.0.0.1', 'smtp_port': port, 'from_email': 'bench@localhost'}
+    messages = build_messages(count)
+    sink = 'aiosmtpd' if Controller is not None and not latency else 'built-in sink'
+    print(f"📊 {count} messages to {sink} on port {port} ({latency * 1000:.0f} ms per reply)")
+
+    try:
+        results = {}
+        for label, run in (('per-message connect', lambda: send_per_message(config, messages)),
+                           (f'pooled (size {pool_size})', lambda: send_pooled(config, messages, pool_size))):
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            results[label] = count / elapsed
+            print(f"✅ {label}: {elapsed:.2f}s, {results[label]:.0f} messages/sec")
+    finally:
+        stop()
+
+    baseline, pooled = results.values()
+    print(f"🔧 Speedup: {pooled / baseline:.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
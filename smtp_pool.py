@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Pooled SMTP sender for the email campaign scripts.
+
+Opening a new smtplib.SMTP connection for every MEP means a TCP connect,
+EHLO, a STARTTLS handshake, AUTH and QUIT for each message. SMTPPool keeps a
+few authenticated connections open and reuses them. A connection that the
+server drops (421, a disconnect or a timeout) is replaced and the message is
+retried once. reset() sends RSET on the idle connections between batches.
+
+    with SMTPPool(smtp_config, size=2) as pool:
+        pool.sendmail(from_email, to_email, msg.as_string())
+
+The config can use either the scripts' keys (smtp_server, smtp_port) or the
+"smtp" block of email_config.json (server, port).
+"""
+
+import queue
+import smtplib
+import socket
+import threading
+import time
+from typing import Dict, List, Union
+
+from instrumentation import observe
+
+# Errors after which a connection is discarded and the send retried once
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, socket.timeout, ConnectionError)
+
+
+def smtp_settings(config: Dict) -> Dict:
+    """Normalize the two SMTP config layouts used in this repo."""
+    return {
+        'server': config.get('smtp_server', config.get('server')),
+        'port': int(config.get('smtp_port', config.get('port', 587))),
+        'username': config.get('username'),
+        'password': config.get('password'),
+        'from_email': config.get('from_email'),
+        'starttls': config.get('starttls', True),
+    }
+
+
+class SMTPPool:
+    """A small pool of authenticated SMTP connections."""
+
+    def __init__(self, config: Dict, size: int = 2, timeout: float = 30):
+        self.settings = smtp_settings(config)
+        self.size = size
+        self.timeout = timeout
+        self.idle: queue.LifoQueue = queue.LifoQueue()
+        self.lock = threading.Lock()
+        self.opened = 0
+        self.stats = {'sent': 0, 'connects': 0, 'reconnects': 0}
+
+    def _connect(self) -> smtplib.SMTP:
+        settings = self.settings
+        started = time.perf_counter()
+        server = smtplib.SMTP(settings['server'], settings['port'], timeout=self.timeout)
+        server.ehlo()
+        if settings['starttls'] and server.has_extn('starttls'):
+            server.starttls()
+            server.ehlo()
+        if settings['username'] and server.has_extn('auth'):
+            server.login(settings['username'], settings['password'])
+        self.stats['connects'] += 1
+        observe('smtp_connect', time.perf_counter() - started)
+        return server
+
+    def _acquire(self) -> smtplib.SMTP:
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            can_open = self.opened < self.size
+            if can_open:
+                self.opened += 1
+        if not can_open:
+            return self.idle.get(timeout=self.timeout)
+        try:
+            return self._connect()
+        except Exception:
+            with self.lock:
+                self.opened -= 1
+            raise
+
+    def _discard(self, server: smtplib.SMTP):
+        try:
+            server.close()
+        finally:
+            with self.lock:
+                self.opened -= 1
+
+    @staticmethod
+    def _dropped(error: Exception) -> bool:
+        """Whether the server closed the connection rather than rejecting the message."""
+        if isinstance(error, smtplib.SMTPResponseException):
+            return error.smtp_code == 421
+        return isinstance(error, RECONNECT_ERRORS)
+
+    def _release(self, server: smtplib.SMTP, error: Exception = None):
+        if error is None:
+            self.idle.put(server)
+        elif self._dropped(error):
+            self._discard(server)
+        else:
+            # Rejected message: clear the transaction and keep the connection
+            try:
+                server.rset()
+                self.idle.put(server)
+            except (smtplib.SMTPException, OSError):
+                self._discard(server)
+
+    def sendmail(self, from_addr: str, to_addrs: Union[str, List[str]], msg: str) -> dict:
+        """Send one message on a pooled connection, reconnecting once if it was dropped."""
+        for attempt in range(2):
+            server = self._acquire()
+            started = time.perf_counter()
+            try:
+                refused = server.sendmail(from_addr, to_addrs, msg)
+                observe('smtp', time.perf_counter() - started)
+            except Exception as e:
+                self._release(server, e)
+                if attempt == 0 and self._dropped(e):
+                    self.stats['reconnects'] += 1
+                    continue
+                raise
+            self._release(server)
+            self.stats['sent'] += 1
+            return refused
+
+    def reset(self):
+        """RSET every idle connection between batches; drop any that fail."""
+        servers = []
+        while True:
+            try:
+                servers.append(self.idle.get_nowait())
+            except queue.Empty:
+                break
+        for server in servers:
+            try:
+                server.rset()
+                self.idle.put(server)
+            except (smtplib.SMTPException, OSError):
+                self._discard(server)
+
+    def close(self):
+        while True:
+            try:
+                server = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                server.close()
+            with self.lock:
+                self.opened -= 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Synthetic dataset generator for benchmarking the data scripts at scale.
+
+Writes a data/ directory whose files have the same columns, formats and line
+endings as the real ones (meps.csv, meps_attendance.csv, votes_catalog.csv,
+mep_notable_votes.csv, mep_vote_positions.csv). It also writes a long-form
+ballots.csv (mep_id, vote_id, vote_position) that ballot_matrix.py can build
+from. Everything derives from one seeded ballot matrix, so the attendance
+figures, vote totals and notable positions agree with the ballots.
+
+Votes are spread over Tuesday-Thursday sittings ending on END_DATE. Every
+VOTES_PER_TERM votes start a new parliamentary term. Each MEP sits for one or
+more consecutive terms, and a few leave or join mid-term. Some meps.csv rows
+keep a birth country and some vote URLs are XML links, so the repair stages
+have work to do.
+
+    python synthetic_data.py <out_dir> [--scale term] [--votes N] [--meps N] [--seed 0]
+"""
+
+import json
+import os
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ballot_matrix import ABSENT, ABSTAIN, AGAINST, FOR, NO_DATA
+from notable_votes_store import FACT_COLUMNS, notable_votes_wide
+from vote_urls import WEB_VOTES_URL
+
+# name -> (votes, meps); 'current' matches the size of the real data
+SCALES = {
+    'current': (1170, 720),
+    'term': (20000, 720),
+    'multi_term': (100000, 2000),
+}
+
+VOTES_PER_TERM = 20000
+END_DATE = '2025-10-09'
+VOTES_PER_SITTING = 55
+FIRST_VOTE_ID = 100000
+FIRST_MEP_ID = 1000
+NOTABLE_VOTES = 9
+BLOCK_VOTES = 5000
+PARAMS_FILE = 'synthetic.json'
+
+POSITION_LABELS = {ABSENT: 'Not voting', FOR: 'For', AGAINST: 'Against', ABSTAIN: 'Abstain'}
+
+# Seats per country, as in the current parliament
+SEATS = {
+    'Germany': 96, 'France': 81, 'Italy': 76, 'Spain': 61, 'Poland': 53, 'Romania': 33,
+    'Netherlands': 31, 'Belgium': 22, 'Sweden': 21, 'Greece': 21, 'Czech Republic': 21,
+    'Portugal': 21, 'Hungary': 21, 'Austria': 20, 'Bulgaria': 17, 'Denmark': 15,
+    'Finland': 15, 'Slovakia': 15, 'Ireland': 14, 'Croatia': 12, 'Lithuania': 11,
+    'Slovenia': 9, 'Latvia': 9, 'Estonia': 7, 'Malta': 6, 'Luxembourg': 6, 'Cyprus': 6,
+}
+
+PARTIES = [
+    "European People's Party (EPP)",
+    'Progressive Alliance of Socialists and Democrats (S&D)',
+    'The Patriots for Europe (PfE)',
+    'European Conservatives and Reformists (ECR)',
+    'Renew Europe (RE)',
+    'Greens/European Free Alliance (Greens/EFA)',
+    'The Left in the European Parliament (GUE/NGL)',
+    'Europe of Sovereign Nations (ESN)',
+    'Non-attached (NI)',
+]
+PARTY_WEIGHTS = [188, 136, 84, 78, 77, 53, 46, 25, 33]
+
+FIRST_NAMES = [
+    'Anna', 'Marco', 'Sophie', 'Jan', 'Elena', 'Pierre', 'Katarzyna', 'Luis', 'Ingrid', 'Tomas',
+    'Maria', 'Johannes', 'Ewa', 'Nikos', 'Clara', 'Andrei', 'Laura', 'Mikael', 'Petra', 'Diego',
+    'Hanna', 'Paolo', 'Zuzana', 'Kristian', 'Irene', 'Mateusz', 'Ana', 'Lukas', 'Eva', 'Bernard',
+    'Daniela', 'Viktor', 'Sara', 'Jakub', 'Marta', 'Henrik', 'Lucia', 'Stefan', 'Ilona', 'Rui',
+    'Agnieszka', 'Tiago', 'Kerstin', 'Ivan', 'Chiara', 'Olivier', 'Monika', 'Juhani', 'Rasa', 'Emil',
+]
+LAST_NAMES = [
+    'Müller', 'Rossi', 'Dubois', 'Nowak', 'García', 'Jansen', 'Papadopoulos', 'Novák', 'Silva', 'Nagy',
+    'Andersson', 'Popescu', 'Horvat', 'Murphy', 'Virtanen', 'Kazlauskas', 'Bērziņš', 'Tamm', 'Borg',
+    'Schmit', 'Georgiou', 'Peeters', 'Hansen', 'Kovač', 'Ivanov', 'Fischer', 'Bianchi', 'Martin',
+    'Kowalski', 'Fernández', 'de Vries', 'Nikolaou', 'Svoboda', 'Santos', 'Tóth', 'Johansson',
+    'Ionescu', 'Babić', 'Kelly', 'Korhonen', 'Petrauskas', 'Ozols', 'Saar', 'Camilleri', 'Weber',
+    'Colombo', 'Lefebvre', 'Wiśniewski', 'López', 'Bakker', 'Dimitriou', 'Dvořák', 'Pereira',
+    'Szabó', 'Lindqvist', 'Stan', 'Jurić', 'Byrne', 'Mäkinen', 'Horváth',
+]
+
+
+def _pct(values: np.ndarray) -> List[str]:
+    """attendance_pct as written in meps_attendance.csv (96.4, 99, 0)."""
+    return [f"{value:g}" for value in np.round(values, 1)]
+
+
+def sitting_days(count: int, end: str = END_DATE) -> pd.DatetimeIndex:
+    """The last `count` Tuesday-Thursday sitting days before `end`, one session week in three."""
+    weeks = -(-count // 3)
+    mondays = pd.date_range(end=pd.Timestamp(end) - pd.Timedelta(days=3), periods=weeks, freq='3W-MON')
+    days = (mondays.values[:, None] + np.arange(1, 4) * np.timedelta64(1, 'D')).ravel()
+    return pd.DatetimeIndex(days[-count:])
+
+
+def vote_dates(n_votes: int, rng: np.random.Generator) -> pd.Series:
+    """Chronological vote timestamps, about VOTES_PER_SITTING per sitting day from noon."""
+    days = sitting_days(-(-n_votes // VOTES_PER_SITTING))
+    day = np.arange(n_votes) * len(days) // n_votes
+    order_in_day = np.arange(n_votes) - np.searchsorted(day, day)
+    seconds = 12 * 3600 + order_in_day * 40 + rng.integers(0, 30, n_votes)
+    return pd.Series(days.values[day] + seconds.astype('timedelta64[s]'))
+
+
+def mandates(n_meps: int, n_votes: int, rng: np.random.Generator):
+    """[start, end) vote columns each MEP sat for, and whether they served a partial term."""
+    terms = max(1, -(-n_votes // VOTES_PER_TERM))
+    term_starts = np.linspace(0, n_votes, terms + 1).astype(int)
+
+    first = rng.integers(0, terms, n_meps)
+    last = np.minimum(first + rng.integers(0, 2, n_meps), terms - 1)
+    start, end = term_starts[first], term_starts[last + 1]
+
+    partial = rng.random(n_meps) < 0.08
+    span = end - start
+    leaves = partial & (rng.random(n_meps) < 0.5)
+    start = np.where(partial & ~leaves, start + (span * rng.uniform(0.1, 0.9, n_meps)).astype(int), start)
+    end = np.where(leaves, start + (span * rng.uniform(0.1, 0.9, n_meps)).astype(int), end)
+    return start, end, partial
+
+
+def ballot_block(cols: slice, start: np.ndarray, end: np.ndarray, party: np.ndarray,
+                 absence: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Ballot codes for a block of votes: MEPs mostly follow their group's line."""
+    n_cols = cols.stop - cols.start
+    line = np.where(rng.random((len(PARTIES), n_cols)) < 0.55, FOR, AGAINST).astype(np.int8)
+    codes = line[party]
+
+    draw = rng.random(codes.shape, dtype=np.float32)
+    rebel = draw < 0.06
+    codes[rebel] = np.where(codes[rebel] == FOR, AGAINST, FOR)
+    codes[(draw >= 0.06) & (draw < 0.09)] = ABSTAIN
+    codes[rng.random(codes.shape, dtype=np.float32) < absence[:, None]] = ABSENT
+
+    col = np.arange(cols.start, cols.stop)
+    codes[(col < start[:, None]) | (col >= end[:, None])] = NO_DATA
+    return codes
+
+
+def generate(out_dir: str, n_votes: int, n_meps: int, seed: int = 0,
+             verbose: bool = True) -> Dict[str, int]:
+    """Write a complete synthetic data/ directory; returns row counts per file."""
+    if n_meps > len(FIRST_NAMES) * len(LAST_NAMES):
+        raise ValueError(f"At most {len(FIRST_NAMES) * len(LAST_NAMES)} distinct synthetic MEP names")
+    rng = np.random.default_rng(seed)
+    os.makedirs(out_dir, exist_ok=True)
+
+    # MEPs
+    names = rng.choice(len(FIRST_NAMES) * len(LAST_NAMES), n_meps, replace=False)
+    countries = list(SEATS)
+    seats = np.array(list(SEATS.values()))
+    country = np.array(countries)[rng.choice(len(countries), n_meps, p=seats / seats.sum())]
+    party = rng.choice(len(PARTIES), n_meps, p=np.array(PARTY_WEIGHTS) / sum(PARTY_WEIGHTS))
+    mep_ids = FIRST_MEP_ID + np.sort(rng.choice(n_meps * 50, n_meps, replace=False))
+    meps = pd.DataFrame({
+        'name': [f"{FIRST_NAMES[i // len(LAST_NAMES)]} {LAST_NAMES[i % len(LAST_NAMES)]}" for i in names],
+        'country': country,
+        'party': np.array(PARTIES)[party],
+        'national_party': [f"{c} {p.split(' (')[-1].rstrip(')')} member party" for c, p in
+                           zip(country, np.array(PARTIES)[party])],
+        'mep_id': mep_ids,
+    })
+    meps = meps.sort_values('name', kind='stable').reset_index(drop=True)
+    party = np.array([PARTIES.index(p) for p in meps['party']])
+    start, end, partial = mandates(n_meps, n_votes, rng)
+    absence = rng.beta(1.2, 20, n_meps)
+
+    # Ballots, generated and written in vote blocks
+    vote_ids = FIRST_VOTE_ID + np.arange(n_votes)
+    codes = np.empty((n_meps, n_votes), dtype=np.int8)
+    labels = np.array([POSITION_LABELS.get(code, '') for code in range(-1, 4)], dtype=object)
+    ballots_path = os.path.join(out_dir, 'ballots.csv')
+    ballots_written = 0
+    with open(ballots_path, 'w', newline='', encoding='utf-8') as f:
+        f.write('mep_id,vote_id,vote_position\n')
+        for block_start in range(0, n_votes, BLOCK_VOTES):
+            cols = slice(block_start, min(block_start + BLOCK_VOTES, n_votes))
+            block = ballot_block(cols, start, end, party, absence, rng)
+            codes[:, cols] = block
+            rows, block_cols = np.nonzero(block != NO_DATA)
+            pd.DataFrame({
+                'mep_id': meps['mep_id'].to_numpy()[rows],
+                'vote_id': vote_ids[cols][block_cols],
+                'vote_position': labels[block[rows, block_cols] + 1],
+            }).to_csv(f, index=False, header=False)
+            ballots_written += len(rows)
+
+    # Votes
+    dates = vote_dates(n_votes, rng)
+    totals = {name: (codes == code).sum(axis=0) for name, code in
+              (('total_for', FOR), ('total_against', AGAINST), ('total_abstain', ABSTAIN))}
+    xml = rng.random(n_votes) < 0.5
+    votes = pd.DataFrame({
+        'vote_id': vote_ids,
+        'vote_date': dates.dt.strftime('%Y-%m-%d %H:%M:%S'),
+        'title': [f"Synthetic vote {vote_id}" for vote_id in vote_ids],
+        'result': np.where(totals['total_for'] > totals['total_against'], 'ADOPTED', 'REJECTED'),
+        'olp_stage': np.where(rng.random(n_votes) < 0.18, 'OLP_FIRST_READING', ''),
+        **totals,
+        'source_url': np.where(xml, [f"https://www.europarl.europa.eu/plenary/en/votes/{v}.xml" for v in vote_ids],
+                               WEB_VOTES_URL),
+    })
+    votes.to_csv(os.path.join(out_dir, 'votes_catalog.csv'), index=False)
+
+    # Attendance, from the same ballots
+    recorded = (codes != NO_DATA).sum(axis=1)
+    cast = (codes > ABSENT).sum(axis=1)
+    attendance = meps.copy()
+    attendance['attendance_pct'] = _pct(np.divide(100 * cast, recorded, out=np.zeros(n_meps), where=recorded > 0))
+    attendance['votes_cast'] = cast
+    attendance['votes_total_period'] = recorded
+    attendance['special_role'] = ''
+    attendance['sick_leave'] = False
+    attendance['partial_term'] = partial
+    attendance.to_csv(os.path.join(out_dir, 'meps_attendance.csv'), index=False, lineterminator='\r\n')
+
+    # meps.csv keeps a few birth countries for the country repair stage
+    from fix_countries import COUNTRY_MAPPINGS
+    birth_countries = [c for c, target in COUNTRY_MAPPINGS.items() if isinstance(target, str)]
+    born_abroad = rng.random(n_meps) < 0.015
+    meps.loc[born_abroad, 'country'] = rng.choice(birth_countries, int(born_abroad.sum()))
+    meps['profile_url'] = 'https://www.europarl.europa.eu/meps/en/' + meps['mep_id'].astype(str)
+    meps.to_csv(os.path.join(out_dir, 'meps.csv'), index=False, lineterminator='\r\n')
+
+    # Notable votes: the closest votes of the latest term, for everyone who sat
+    margin = np.abs(totals['total_for'] - totals['total_against'])
+    recent = np.arange(max(0, n_votes - VOTES_PER_TERM), n_votes)
+    notable_cols = np.sort(recent[np.argsort(margin[recent], kind='stable')[:NOTABLE_VOTES]])[::-1]
+    rows, which = np.nonzero(codes[:, notable_cols] != NO_DATA)
+    facts = pd.DataFrame({
+        'mep_id': meps['mep_id'].to_numpy()[rows],
+        'vote_id': vote_ids[notable_cols][which],
+        'vote_position': labels[codes[rows, notable_cols[which]] + 1],
+    })[FACT_COLUMNS]
+    facts.to_csv(os.path.join(out_dir, 'mep_vote_positions.csv'), index=False)
+    notable_votes_wide(facts.astype(str), votes.astype(str)).to_csv(
+        os.path.join(out_dir, 'mep_notable_votes.csv'), index=False)
+
+    counts = {
+        'meps': n_meps,
+        'votes': n_votes,
+        'ballots': ballots_written,
+        'notable_votes': len(facts),
+    }
+    with open(os.path.join(out_dir, PARAMS_FILE), 'w') as f:
+        json.dump({'seed': seed, **counts}, f, indent=2)
+    if verbose:
+        print(f"✅ {n_meps} MEPs, {n_votes} votes, {ballots_written} ballots written to {out_dir}/")
+    return counts
+
+
+def generated_params(out_dir: str) -> Optional[Dict]:
+    """Parameters of an existing synthetic directory, or None."""
+    path = os.path.join(out_dir, PARAMS_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv: List[str]):
+    if not argv or argv[0].startswith('--'):
+        print("Usage: python synthetic_data.py <out_dir> [--scale current|term|multi_term] "
+              "[--votes N] [--meps N] [--seed S]")
+        return
+
+    def option(name: str, default):
+        return type(default)(argv[argv.index(name) + 1]) if name in argv else default
+
+    n_votes, n_meps = SCALES[option('--scale', 'current')]
+    generate(argv[0], option('--votes', n_votes), option('--meps', n_meps), option('--seed', 0))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
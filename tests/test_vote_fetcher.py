@@ -0,0 +1,102 @@
+"""VotePageFetcher against a local stand-in for the vote page API."""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from vote_fetcher import VotePageFetcher
+
+# Votes the MEP is missing from in the canned pages
+MISSED = {3, 5}
+PAGE_DELAY = 0.05
+
+
+class VotePages(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(time.monotonic())
+        vote_id = int(self.path.rsplit('/', 1)[-1])
+        time.sleep(PAGE_DELAY)
+        body = b'absent' if vote_id in MISSED else b'present'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), VotePages)
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def fetcher_for(server, cache_dir, **options) -> VotePageFetcher:
+    url = f"http://127.0.0.1:{server.server_address[1]}/votes/{{vote_id}}"
+    return VotePageFetcher(url_template=url, cache_dir=str(cache_dir), **options)
+
+
+def is_missed(vote_id, text: str) -> bool:
+    return text == 'absent'
+
+
+def test_scan_stops_after_expected_misses(server, tmp_path):
+    vote_ids = list(range(40))
+    with fetcher_for(server, tmp_path, concurrency=4, requests_per_second=1000) as fetcher:
+        missed, checked = asyncio.run(fetcher.scan(vote_ids, is_missed, stop_after=len(MISSED)))
+
+    assert sorted(missed) == sorted(MISSED)
+    assert checked < len(vote_ids)
+    assert len(server.requests) < len(vote_ids)
+
+
+def test_scan_cancels_outstanding_work(server, tmp_path):
+    vote_ids = list(range(200))
+    concurrency = 4
+    with fetcher_for(server, tmp_path, concurrency=concurrency, requests_per_second=1000) as fetcher:
+        asyncio.run(fetcher.scan(vote_ids, is_missed, stop_after=1))
+        # Only pages already handed to a thread may still reach the server
+        sent = len(server.requests)
+        time.sleep(5 * PAGE_DELAY)
+        assert len(server.requests) <= sent + concurrency
+        settled = len(server.requests)
+        time.sleep(5 * PAGE_DELAY)
+        assert len(server.requests) == settled
+    assert settled < 2 * concurrency + max(MISSED)
+
+
+def test_scan_holds_the_rate_limit(server, tmp_path):
+    rate = 20
+    vote_ids = [vote_id for vote_id in range(20) if vote_id not in MISSED][:11]
+    with fetcher_for(server, tmp_path, concurrency=8, requests_per_second=rate) as fetcher:
+        missed, checked = asyncio.run(fetcher.scan(vote_ids, is_missed))
+
+    assert missed == [] and checked == len(vote_ids)
+    sent = server.requests
+    assert len(sent) == len(vote_ids)
+    # A one-token bucket lets the first request through, then one every 1/rate seconds
+    elapsed = sent[-1] - sent[0]
+    assert elapsed >= (len(sent) - 1) / rate * 0.9
+
+
+def test_cached_pages_do_not_reach_the_server(server, tmp_path):
+    vote_ids = list(range(10))
+    with fetcher_for(server, tmp_path, concurrency=4, requests_per_second=1000) as fetcher:
+        asyncio.run(fetcher.scan(vote_ids, is_missed))
+    with fetcher_for(server, tmp_path, concurrency=4, requests_per_second=1) as fetcher:
+        started = time.monotonic()
+        missed, checked = asyncio.run(fetcher.scan(vote_ids, is_missed))
+        elapsed = time.monotonic() - started
+
+    assert sorted(missed) == sorted(MISSED) and checked == len(vote_ids)
+    assert len(server.requests) == len(vote_ids)
+    assert elapsed < 1
@@ -1,67 +1,94 @@
 #!/usr/bin/env python3
 """
-Verify which votes Malika Sorel actually missed by checking the data more carefully
+Verify which votes an MEP actually missed by checking the data more carefully
 """
 
-import pandas as pd
+import sys
+import os
+from datasets import load_attendance, load_notable_votes, load_votes
+from mandates import eligible_votes
+from mep_matcher import find_mep
+from ballot_matrix import BALLOTS_DIR, MATRIX_FILE, BallotMatrix
+from instrumentation import profile_from_argv, span
+from sitting_days import SittingDays, load_participation
 
-def verify_missed_votes():
-    """Verify which votes Malika Sorel actually missed"""
+@span('verify_missed_votes')
+def verify_missed_votes(name_or_id='Malika Sorel'):
+    """Verify which votes an MEP (name or id) actually missed"""
     
     # Load MEP data
-    meps_df = pd.read_csv('data/meps_attendance.csv')
-    malika = meps_df[meps_df['name'] == 'Malika Sorel'].iloc[0]
+    meps_df = load_attendance()
+    mep = find_mep(meps_df, name_or_id)
+    name = mep['name']
+    missed = mep['votes_total_period'] - mep['votes_cast']
     
-    print(f"Malika Sorel (MEP ID: {malika['mep_id']})")
-    print(f"Total votes: {malika['votes_total_period']}")
-    print(f"Votes cast: {malika['votes_cast']}")
-    print(f"Attendance: {malika['attendance_pct']}%")
-    print(f"Missed votes: {malika['votes_total_period'] - malika['votes_cast']}")
+    print(f"{name} (MEP ID: {mep['mep_id']})")
+    print(f"Total votes: {mep['votes_total_period']}")
+    print(f"Votes cast: {mep['votes_cast']}")
+    print(f"Attendance: {mep['attendance_pct']}%")
+    print(f"Missed votes: {mep['votes_total_period'] - mep['votes_cast']}")
     print()
     
     # Load votes catalog
-    votes_df = pd.read_csv('data/votes_catalog.csv')
+    votes_df = load_votes()
     print(f"Total votes in catalog: {len(votes_df)}")
     
-    # Load Malika's notable votes
-    notable_df = pd.read_csv('data/mep_notable_votes.csv')
-    malika_votes = notable_df[notable_df['mep_id'] == malika['mep_id']]
-    print(f"Malika's notable votes: {len(malika_votes)}")
+    # Load the MEP's notable votes
+    notable_df = load_notable_votes()
+    mep_votes = notable_df[notable_df['mep_id'] == mep['mep_id']]
+    print(f"{name}'s notable votes: {len(mep_votes)}")
+    
+    # With the full ballot matrix the missed votes can be read off directly
+    if os.path.exists(os.path.join(BALLOTS_DIR, MATRIX_FILE)):
+        with span('ballot_matrix_lookup'):
+            matrix = BallotMatrix.load()
+            missed_ids = matrix.missed_votes(mep['mep_id'])
+        print(f"\nBallot matrix found - {name} missed {len(missed_ids)} votes:")
+        for _, vote in votes_df.set_index('vote_id').loc[missed_ids].reset_index().iterrows():
+            print(f"  {vote['vote_date']}: Vote {vote['vote_id']} - {vote['title'][:60]}...")
+        
+        with span('absent_days'):
+            missed_days = load_participation().absent_days(mep['mep_id'])
+        print(f"\nMissed votes on {len(missed_days)} sitting days:")
+        for _, day in missed_days.iterrows():
+            print(f"  {str(day['day'])[:10]}: {day['absent']} of {day['votes']} votes")
+        return
     
     print("\nIMPORTANT CLARIFICATION:")
-    print("The 'notable votes' data only contains Malika's 10 most notable votes,")
-    print("NOT all the votes she participated in. She likely participated in many more votes.")
+    print(f"The 'notable votes' data only contains {name}'s 10 most notable votes,")
+    print("NOT all the votes they participated in. They likely participated in many more votes.")
     print()
     
-    # Let's look at the vote distribution
+    # Let's look at the vote distribution over their mandate
     print("Vote distribution by date:")
-    vote_dates = pd.to_datetime(votes_df['vote_date']).dt.date.value_counts().sort_index()
-    for date, count in vote_dates.items():
-        print(f"  {date}: {count} votes")
+    days = SittingDays.from_dates(eligible_votes(votes_df, mep['mep_id'])['vote_date'])
+    for day, count in zip(days.days, days.votes):
+        print(f"  {str(day)[:10]}: {count} votes")
     
-    print(f"\nMalika's notable votes by date:")
-    malika_dates = pd.to_datetime(malika_votes['vote_date']).dt.date.value_counts().sort_index()
-    for date, count in malika_dates.items():
+    print(f"\n{name}'s notable votes by date:")
+    mep_dates = mep_votes['vote_date'].dt.date.value_counts().sort_index()
+    for date, count in mep_dates.items():
         print(f"  {date}: {count} votes")
     
     # The issue is that we don't have the complete voting record
-    # We only have her "notable" votes, which are a subset
+    # We only have their "notable" votes, which are a subset
     print(f"\nPROBLEM IDENTIFIED:")
-    print(f"- Total votes in period: {malika['votes_total_period']}")
-    print(f"- Malika's notable votes: {len(malika_votes)}")
-    print(f"- This means we only have {len(malika_votes)} out of {malika['votes_cast']} votes she participated in")
-    print(f"- We're missing {malika['votes_cast'] - len(malika_votes)} votes she participated in")
-    print(f"- We cannot determine which 2 votes she missed without the complete voting record")
+    print(f"- Total votes in period: {mep['votes_total_period']}")
+    print(f"- {name}'s notable votes: {len(mep_votes)}")
+    print(f"- This means we only have {len(mep_votes)} out of {mep['votes_cast']} votes they participated in")
+    print(f"- We're missing {mep['votes_cast'] - len(mep_votes)} votes they participated in")
+    print(f"- We cannot determine which {missed} votes they missed without the complete voting record")
     
-    print(f"\nTo find the exact 2 missed votes, we would need:")
+    print(f"\nTo find the exact {missed} missed votes, we would need:")
     print(f"1. The complete voting record for all MEPs (not just notable votes)")
     print(f"2. Or access to the raw vote data from the European Parliament")
-    print(f"3. Or to manually check each of the 1,215 votes")
+    print(f"3. Or to manually check each of the {mep['votes_total_period']:,} votes")
     
     print(f"\nCURRENT LIMITATION:")
-    print(f"The data we have only shows Malika's 10 most 'notable' votes,")
-    print(f"not her complete voting record. Without the full record,")
-    print(f"we cannot accurately identify which 2 votes she missed.")
+    print(f"The data we have only shows {name}'s 10 most 'notable' votes,")
+    print(f"not the complete voting record. Without the full record,")
+    print(f"we cannot accurately identify which {missed} votes they missed.")
 
 if __name__ == "__main__":
+    profile_from_argv(sys.argv[1:])
     verify_missed_votes()
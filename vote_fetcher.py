@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Concurrent, rate-limited fetcher for per-vote pages.
+
+Requests go through one pooled keep-alive requests.Session and the shared
+on-disk cache (http_cache.py), run on a small thread pool driven by asyncio.
+Pages still fresh in the cache are served without waiting. A token bucket
+keeps the rate of requests that reach the source at the configured
+requests-per-second. A scan stops (cancelling the outstanding work) as soon
+as the expected number of misses is found.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from datasets import load_meps
+from http_cache import CACHE_DIR, CachedFetcher
+from instrumentation import span
+from presence_index import PageParser
+from rate_limit import TokenBucket
+
+VOTE_PAGE_URL = 'https://howtheyvote.eu/api/votes/{vote_id}'
+USER_AGENT = "Where's My MEP Data Harvester (+https://wheresmymep.eu)"
+
+
+class VotePageFetcher:
+    """Fetch vote pages with bounded concurrency over a shared connection pool."""
+
+    def __init__(self,
+                 url_template: str = VOTE_PAGE_URL,
+                 concurrency: int = 8,
+                 requests_per_second: float = 4.0,
+                 timeout: float = 10,
+                 cache_dir: str = CACHE_DIR):
+        self.url_template = url_template
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.bucket = TokenBucket(requests_per_second)
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.http = CachedFetcher(cache_dir=cache_dir, session=self.session, timeout=timeout)
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def url_for(self, vote_id) -> str:
+        return self.url_template.format(vote_id=vote_id)
+
+    def _get(self, url: str) -> Tuple[int, str]:
+        response = self.http.get(url)
+        return response.status_code, response.text
+
+    async def fetch(self, vote_id) -> Tuple[int, str]:
+        """Fetch one vote page; only requests that go to the network wait for a token."""
+        url = self.url_for(vote_id)
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(self.executor, self.http.cached, url)
+        if cached is not None:
+            return cached.status_code, cached.text
+        await self.bucket.acquire()
+        return await loop.run_in_executor(self.executor, self._get, url)
+
+    async def scan(self,
+                   vote_ids: Iterable,
+                   match: Callable[[object, str], bool],
+                   stop_after: Optional[int] = None) -> Tuple[List, int]:
+        """Fetch pages in order and collect vote ids for which `match` is true.
+
+        Stops early once `stop_after` matches are found. Returns the matched
+        vote ids and the number of pages checked.
+        """
+        if stop_after == 0:
+            return [], 0
+
+        queue = asyncio.Queue()
+        for vote_id in vote_ids:
+            queue.put_nowait(vote_id)
+
+        missed = []
+        checked = 0
+        done = asyncio.Event()
+
+        async def worker():
+            nonlocal checked
+            while not done.is_set():
+                try:
+                    vote_id = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    status, text = await self.fetch(vote_id)
+                except requests.RequestException as e:
+                    print(f"⚠️  Error fetching vote {vote_id}: {e}")
+                    continue
+
+                checked += 1
+                if checked % 50 == 0:
+                    print(f"Checked {checked} votes, found {len(missed)} missed votes so far...")
+
+                if status != 200:
+                    print(f"⚠️  Could not fetch vote {vote_id} (status: {status})")
+                elif match(vote_id, text):
+                    missed.append(vote_id)
+                    if stop_after is not None and len(missed) >= stop_after:
+                        done.set()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        finished = asyncio.gather(*workers)
+        stopped = asyncio.create_task(done.wait())
+        await asyncio.wait([finished, stopped], return_when=asyncio.FIRST_COMPLETED)
+
+        # Cancel whatever is still in flight once we have enough misses
+        for task in workers:
+            task.cancel()
+        stopped.cancel()
+        await asyncio.gather(finished, stopped, return_exceptions=True)
+
+        return missed, checked
+
+
+def find_missed_vote_pages(vote_ids: Iterable,
+                           mep_id: int,
+                           expected_missed: Optional[int] = None,
+                           **fetcher_options) -> Tuple[List, int]:
+    """Scan vote pages and return the votes a MEP does not appear in."""
+    meps_df = load_meps()
+    parser = PageParser(meps_df)
+    mep_row = parser.row_by_id[int(mep_id)]
+
+    with VotePageFetcher(**fetcher_options) as fetcher, span('scan_vote_pages') as stage:
+        result = asyncio.run(fetcher.scan(
+            vote_ids,
+            lambda vote_id, text: mep_row not in parser.parse(text),
+            stop_after=expected_missed,
+        ))
+        stage.rows = result[1]
+        print(f"HTTP cache: {fetcher.http.stats()}")
+        return result
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Vectorized vote-URL rewriter with a streaming mode for large CSVs.
+
+convert_vote_urls() turns XML vote record URLs
+(https://www.europarl.europa.eu/plenary/en/votes/172886.xml) into web
+interface URLs for a whole column at once: one str.extract for the vote id
+and one for the year of vote_date.
+
+rewrite_csv_streaming() applies it to any CSV with source_url/vote_date
+columns in fixed-size chunks, so ballot-level files of any size are
+rewritten in constant memory through a temp file and an atomic rename.
+
+    python vote_urls.py data/ballots.csv [--chunksize 200000]
+"""
+
+import sys
+from typing import List
+
+import pandas as pd
+
+from ballot_matrix import replace_atomic
+from instrumentation import profile_from_argv, span
+from repair_pipeline import line_terminator
+
+DEFAULT_URL_YEAR = 2025
+WEB_VOTES_URL = 'https://www.europarl.europa.eu/plenary/en/votes.html'
+DEFAULT_CHUNKSIZE = 200_000
+
+
+def convert_vote_urls(urls: pd.Series, dates: pd.Series,
+                      default_year: int = DEFAULT_URL_YEAR) -> pd.Series:
+    """Rewrite XML vote URLs in a column; other values pass through unchanged."""
+    vote_ids = urls.str.extract(r'/votes/(\d+)\.xml', expand=False)
+    years = dates.astype(str).str.extract(r'^(\d{4})-', expand=False).fillna(str(default_year))
+
+    is_xml = vote_ids.notna()
+    converted = urls.copy()
+    converted[is_xml] = WEB_VOTES_URL + '?date=' + years[is_xml] + '&vote=' + vote_ids[is_xml]
+    return converted
+
+
+@span('rewrite_csv_streaming')
+def rewrite_csv_streaming(path: str,
+                          chunksize: int = DEFAULT_CHUNKSIZE,
+                          url_column: str = 'source_url',
+                          date_column: str = 'vote_date') -> int:
+    """Rewrite vote URLs in a CSV chunk by chunk; returns the number of rows changed."""
+    terminator = line_terminator(path)
+    changed = 0
+
+    def write(tmp):
+        nonlocal changed
+        with open(tmp, 'w', newline='', encoding='utf-8') as out:
+            chunks = pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunksize)
+            for i, chunk in enumerate(chunks):
+                fixed = convert_vote_urls(chunk[url_column], chunk[date_column])
+                changed += int((fixed != chunk[url_column]).sum())
+                chunk[url_column] = fixed
+                chunk.to_csv(out, index=False, header=(i == 0), lineterminator=terminator)
+
+    replace_atomic(path, write)
+    return changed
+
+
+def main(argv: List[str]):
+    if not argv:
+        print("Usage: python vote_urls.py <file.csv> [--chunksize N]")
+        return
+
+    chunksize = DEFAULT_CHUNKSIZE
+    if '--chunksize' in argv:
+        chunksize = int(argv[argv.index('--chunksize') + 1])
+
+    changed = rewrite_csv_streaming(argv[0], chunksize=chunksize)
+    print(f"✅ {argv[0]}: {changed} URLs updated")
+
+
+if __name__ == "__main__":
+    main(profile_from_argv(sys.argv[1:]))
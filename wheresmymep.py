@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Command-line entry point for the Where's My MEP? data scripts.
+
+    python wheresmymep.py lookup "Malika Sorel"     # attendance summary
+    python wheresmymep.py missed "SOREL Malika"     # votes missed
+    python wheresmymep.py verify 197400
+    python wheresmymep.py fix-urls [--dry-run] [--file data/ballots.csv]
+    python wheresmymep.py fix-countries [--dry-run]
+    python wheresmymep.py campaign positive
+    python wheresmymep.py --timing lookup 197400
+    python wheresmymep.py --profile fix-urls --dry-run
+
+An MEP can be given by name (accent, case and order insensitive) or by id.
+Only the standard library is imported at startup. Each subcommand imports
+pandas and the module it needs when it runs, so --help and lookup (which
+reads the CSVs with the csv module) stay fast. --timing prints how long the
+command took and whether pandas was loaded. Use python -X importtime for an
+import breakdown.
+"""
+
+import argparse
+import sys
+import time
+
+STARTED = time.perf_counter()
+
+ATTENDANCE_FILE = 'data/meps_attendance.csv'
+
+
+def resolve_mep(name_or_id: str, need_id: bool = False):
+    """Resolve a name or id with the stdlib-only matcher; exits if not found."""
+    from mep_matcher import get_matcher
+
+    matcher = get_matcher()
+    match = matcher.lookup(name_or_id)
+    if match is None:
+        text = str(name_or_id).strip()
+        shared = matcher.id_matches(text) if text.isdigit() else []
+        if len(shared) > 1:
+            names = ', '.join(f"{m.name} (row {m.row})" for m in shared)
+            sys.exit(f"❌ MEP ID {text} is ambiguous: data/meps.csv gives it to {names}; look them up by name")
+        sys.exit(f"❌ No MEP matches {name_or_id!r}")
+    if need_id and match.mep_id is None:
+        sys.exit(f"❌ {match.name} has no MEP ID in data/meps.csv, so their votes cannot be looked up")
+    return match
+
+
+def cmd_lookup(args):
+    import csv
+
+    match = resolve_mep(args.mep)
+    # meps_attendance.csv has the same rows as meps.csv; ids are not unique
+    with open(ATTENDANCE_FILE, newline='', encoding='utf-8') as f:
+        records = list(csv.DictReader(f))
+    record = records[match.row] if match.row < len(records) else None
+    if record is not None and record['name'] != match.name:
+        record = None
+
+    print(f"{match.name} (MEP ID: {match.mep_id})")
+    if record is None:
+        print("⚠️  No attendance record")
+        return
+    missed = int(record['votes_total_period']) - int(record['votes_cast'])
+    print(f"Country: {record['country']}")
+    print(f"Party: {record['party']} ({record['national_party']})")
+    print(f"Attendance: {record['attendance_pct']}% ({record['votes_cast']}/{record['votes_total_period']} votes)")
+    print(f"Missed votes: {missed}")
+
+
+def cmd_missed(args):
+    match = resolve_mep(args.mep, need_id=True)
+    # Without a ballot matrix this falls back to comparing against the notable votes
+    from find_missed_votes_simple import find_missed_votes
+    find_missed_votes(match.name)
+
+
+def cmd_verify(args):
+    from verify_missed_votes import verify_missed_votes
+
+    verify_missed_votes(resolve_mep(args.mep, need_id=True).name)
+
+
+def cmd_fix_urls(args):
+    if args.file:
+        from vote_urls import rewrite_csv_streaming
+        changed = rewrite_csv_streaming(args.file)
+        print(f"✅ {args.file}: {changed} URLs updated")
+        return
+    from repair_pipeline import run_pipeline
+    run_pipeline(['vote_urls'], dry_run=args.dry_run)
+
+
+def cmd_fix_countries(args):
+    from repair_pipeline import run_pipeline
+
+    run_pipeline(['countries'], dry_run=args.dry_run)
+
+
+def cmd_campaign(args):
+    import logging
+    from campaign_engine import run_campaign
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    run_campaign(args.name)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='wheresmymep', description="Where's My MEP? data tools")
+    parser.add_argument('--timing', action='store_true', help='report command time and whether pandas was loaded')
+    parser.add_argument('--profile', action='store_true', help='write a stage trace and cProfile stats to profile/')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    for name, func, help_text in (('lookup', cmd_lookup, 'attendance summary for one MEP'),
+                                  ('missed', cmd_missed, 'votes an MEP missed (ballot matrix, else notable votes)'),
+                                  ('verify', cmd_verify, 'cross-check an MEP\'s missed votes')):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('mep', help='MEP name or id')
+        command.set_defaults(func=func)
+
+    command = commands.add_parser('fix-urls', help='rewrite XML vote URLs as web URLs')
+    command.add_argument('--dry-run', action='store_true')
+    command.add_argument('--file', help='stream-rewrite another CSV with source_url/vote_date columns')
+    command.set_defaults(func=cmd_fix_urls)
+
+    command = commands.add_parser('fix-countries', help='map birth countries to represented countries')
+    command.add_argument('--dry-run', action='store_true')
+    command.set_defaults(func=cmd_fix_countries)
+
+    command = commands.add_parser('campaign', help='render and send an email campaign (campaigns/<name>.json)')
+    command.add_argument('name')
+    command.set_defaults(func=cmd_campaign)
+    return parser
+
+
+def main(argv):
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        from instrumentation import start_profiling
+        start_profiling()
+    args.func(args)
+    if args.timing:
+        elapsed = (time.perf_counter() - STARTED) * 1000
+        pandas = 'loaded' if 'pandas' in sys.modules else 'not loaded'
+        print(f"⏱️  {args.command}: {elapsed:.1f} ms after startup (pandas {pandas})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])